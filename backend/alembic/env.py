@@ -15,7 +15,7 @@ from app.config import get_settings
 from app.database import Base
 from app.models import (
     user, book, author, review, post, group, message, 
-    interaction, shelf, audit_log
+    interaction, shelf, audit_log, feed, resource_version, recommendation, trending
 )
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,48 @@
+"""Catalog versions
+
+Revision ID: 183adfbbfcae
+Revises: a8dcbcf60e62
+Create Date: 2026-10-19 12:48:05.391270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '183adfbbfcae'
+down_revision: Union[str, Sequence[str], None] = 'a8dcbcf60e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ('books', 'authors', 'posts')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+            batch_op.add_column(sa.Column(
+                'updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True
+            ))
+
+    resource_versions = op.create_table(
+        'resource_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.bulk_insert(resource_versions, [{'name': t, 'version': 1} for t in VERSIONED_TABLES])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('resource_versions')
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
+            batch_op.drop_column('version')
@@ -0,0 +1,42 @@
+"""Book similarities
+
+Revision ID: 3b39d2dcfb40
+Revises: 183adfbbfcae
+Create Date: 2026-10-19 16:02:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b39d2dcfb40'
+down_revision: Union[str, Sequence[str], None] = '183adfbbfcae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'book_similarities',
+        sa.Column('book_id', sa.String(length=50), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('similar_book_id', sa.String(length=50), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['similar_book_id'], ['books.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('book_id', 'rank'),
+    )
+    # Recommendation seeds read a user's shelves and their newest items
+    op.create_index('ix_shelves_user_id', 'shelves', ['user_id'], unique=False)
+    op.create_index('ix_shelf_items_shelf_id_added_at', 'shelf_items', ['shelf_id', 'added_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_shelf_items_shelf_id_added_at', table_name='shelf_items')
+    op.drop_index('ix_shelves_user_id', table_name='shelves')
+    op.drop_table('book_similarities')
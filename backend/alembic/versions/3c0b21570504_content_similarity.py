@@ -0,0 +1,61 @@
+"""Content similarity
+
+Revision ID: 3c0b21570504
+Revises: 3b39d2dcfb40
+Create Date: 2026-10-19 17:21:09.604137
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c0b21570504'
+down_revision: Union[str, Sequence[str], None] = '3b39d2dcfb40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'content_terms',
+        sa.Column('term', sa.String(length=100), nullable=False),
+        sa.Column('idf', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('term'),
+    )
+
+    op.create_table(
+        'book_terms',
+        sa.Column('book_id', sa.String(length=50), nullable=False),
+        sa.Column('term', sa.String(length=100), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('book_id', 'term'),
+    )
+    op.create_index('ix_book_terms_term_weight', 'book_terms', ['term', 'weight'], unique=False)
+
+    op.create_table(
+        'book_content_similarities',
+        sa.Column('book_id', sa.String(length=50), nullable=False),
+        sa.Column('similar_book_id', sa.String(length=50), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['similar_book_id'], ['books.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('book_id', 'similar_book_id'),
+    )
+    op.create_index(
+        'ix_book_content_similarities_book_score', 'book_content_similarities',
+        ['book_id', 'score'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_book_content_similarities_book_score', table_name='book_content_similarities')
+    op.drop_table('book_content_similarities')
+    op.drop_index('ix_book_terms_term_weight', table_name='book_terms')
+    op.drop_table('book_terms')
+    op.drop_table('content_terms')
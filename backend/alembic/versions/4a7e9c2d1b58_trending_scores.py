@@ -0,0 +1,39 @@
+"""Trending scores
+
+Revision ID: 4a7e9c2d1b58
+Revises: 3c0b21570504
+Create Date: 2026-10-19 18:04:37.215946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a7e9c2d1b58'
+down_revision: Union[str, Sequence[str], None] = '3c0b21570504'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'trending_scores',
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('item_id', sa.String(length=50), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('kind', 'item_id'),
+    )
+    op.create_index(
+        'ix_trending_scores_kind_score', 'trending_scores',
+        ['kind', sa.text('score DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trending_scores_kind_score', table_name='trending_scores')
+    op.drop_table('trending_scores')
@@ -0,0 +1,35 @@
+"""Post author id
+
+Revision ID: 5e1f0b7c3a92
+Revises: 4a7e9c2d1b58
+Create Date: 2026-10-19 21:40:12.503318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1f0b7c3a92'
+down_revision: Union[str, Sequence[str], None] = '4a7e9c2d1b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('posts') as batch_op:
+        batch_op.add_column(sa.Column('author_id', sa.String(length=50), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_posts_author_id_profiles', 'profiles',
+            ['author_id'], ['id'], ondelete='SET NULL'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('posts') as batch_op:
+        batch_op.drop_constraint('fk_posts_author_id_profiles', type_='foreignkey')
+        batch_op.drop_column('author_id')
@@ -0,0 +1,41 @@
+"""Threaded comments
+
+Revision ID: a3ed3098e2e9
+Revises: 7d00268da31c
+Create Date: 2026-10-19 09:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3ed3098e2e9'
+down_revision: Union[str, Sequence[str], None] = '7d00268da31c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('comments') as batch_op:
+        batch_op.add_column(sa.Column('parent_id', sa.String(length=50), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_comments_parent_id_comments', 'comments',
+            ['parent_id'], ['id'], ondelete='CASCADE'
+        )
+        batch_op.create_index('ix_comments_parent_id', ['parent_id'], unique=False)
+        batch_op.create_index(
+            'ix_comments_post_id_created_at', ['post_id', 'created_at', 'id'], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('comments') as batch_op:
+        batch_op.drop_index('ix_comments_post_id_created_at')
+        batch_op.drop_index('ix_comments_parent_id')
+        batch_op.drop_constraint('fk_comments_parent_id_comments', type_='foreignkey')
+        batch_op.drop_column('parent_id')
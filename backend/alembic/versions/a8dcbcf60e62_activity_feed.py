@@ -0,0 +1,69 @@
+"""Activity feed
+
+Revision ID: a8dcbcf60e62
+Revises: d04513e3166d
+Create Date: 2026-10-19 11:26:53.207114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8dcbcf60e62'
+down_revision: Union[str, Sequence[str], None] = 'd04513e3166d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'activities',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('actor_id', sa.String(length=50), nullable=False),
+        sa.Column('verb', sa.String(length=50), nullable=False),
+        sa.Column('object_type', sa.String(length=50), nullable=False),
+        sa.Column('object_id', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('fanned_out', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['actor_id'], ['profiles.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_activities_id', 'activities', ['id'], unique=False)
+    op.create_index(
+        'ix_activities_actor_fanned_out_created_at', 'activities',
+        ['actor_id', 'fanned_out', 'created_at'], unique=False
+    )
+
+    op.create_table(
+        'feed_items',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('owner_id', sa.String(length=50), nullable=False),
+        sa.Column('activity_id', sa.String(length=50), nullable=False),
+        sa.Column('actor_id', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['profiles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['activity_id'], ['activities.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_feed_items_id', 'feed_items', ['id'], unique=False)
+    op.create_index(
+        'ix_feed_items_owner_created_at', 'feed_items',
+        ['owner_id', 'created_at', 'activity_id'], unique=False
+    )
+    op.create_index('ix_feed_items_owner_actor', 'feed_items', ['owner_id', 'actor_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_feed_items_owner_actor', table_name='feed_items')
+    op.drop_index('ix_feed_items_owner_created_at', table_name='feed_items')
+    op.drop_index('ix_feed_items_id', table_name='feed_items')
+    op.drop_table('feed_items')
+    op.drop_index('ix_activities_actor_fanned_out_created_at', table_name='activities')
+    op.drop_index('ix_activities_id', table_name='activities')
+    op.drop_table('activities')
@@ -0,0 +1,36 @@
+"""Posts feed indexes
+
+Revision ID: d04513e3166d
+Revises: a3ed3098e2e9
+Create Date: 2026-10-19 10:02:17.540631
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd04513e3166d'
+down_revision: Union[str, Sequence[str], None] = 'a3ed3098e2e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_posts_approved_created_at', 'posts',
+        ['is_approved', sa.text('created_at DESC')], unique=False
+    )
+    op.create_index(
+        'ix_posts_approved_type_created_at', 'posts',
+        ['is_approved', 'type', sa.text('created_at DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_approved_type_created_at', table_name='posts')
+    op.drop_index('ix_posts_approved_created_at', table_name='posts')
@@ -15,6 +15,28 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./booknook.db"
+    DB_POOL_SIZE: int = 5  # Persistent connections per process
+    DB_MAX_OVERFLOW: int = 10  # Extra connections allowed under burst load
+    DB_POOL_TIMEOUT_SECONDS: float = 10  # Wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replace connections older than this
+    DB_POOL_PRE_PING: str = "optimistic"  # 'pessimistic' pings on every checkout
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000  # Postgres statement_timeout (0 disables)
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 60_000  # Postgres idle_in_transaction_session_timeout
+    DB_PGBOUNCER: bool = False  # Transaction-mode pooler (e.g. Supabase port 6543)
+    DATABASE_READ_URLS: list[str] = []  # Optional read replicas for GET traffic
+    REPLICA_EJECT_SECONDS: float = 30  # Skip a failed replica for this long
+    REPLICA_READ_AFTER_WRITE_SECONDS: float = 2  # Read from the primary this long after a commit
+    
+    # SQLite (file databases)
+    # One writer connection plus a read-only pool. Writers queue for that
+    # connection by blocking, so only enable it for code that runs off the
+    # event loop (e.g. the bulk loaders' threads); the API's async handlers
+    # would stall the loop waiting for it
+    SQLITE_SINGLE_WRITER: bool = False
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait this long for a lock before "database is locked"
+    SQLITE_CACHE_SIZE_KB: int = 16_384  # Page cache per connection
+    SQLITE_MMAP_SIZE_BYTES: int = 256 * 1024 * 1024
+    SQLITE_FOREIGN_KEYS: bool = True
     
     # Security
     SECRET_KEY: str = "your-super-secret-key-change-in-production"
@@ -28,9 +50,65 @@ class Settings(BaseSettings):
         "http://127.0.0.1:5173",
     ]
     
+    # Caching
+    LIKE_COUNT_CACHE_TTL_SECONDS: int = 30
+    CACHE_BACKEND: str = "memory"  # 'memory' or 'redis'
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_MAX_ENTRIES: int = 10_000  # Memory backend only
+    CACHE_DEFAULT_TTL_SECONDS: int = 60
+    
+    # Response compression
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Bytes; smaller bodies are sent as-is
+    COMPRESSION_PREFERENCE: list[str] = ["br", "zstd", "gzip"]  # br/zstd need optional packages
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    
+    # Metrics
+    METRICS_EVENT_LOOP_INTERVAL_SECONDS: float = 0.5  # Event loop lag sampling period
+    SLOW_QUERY_THRESHOLD_MS: float = 200  # Statements slower than this are logged
+    SLOW_QUERY_EXPLAIN: bool = True  # Include EXPLAIN output for slow SELECTs
+    QUERY_BUDGET_PER_REQUEST: int = 25  # Default statements allowed per request
+    QUERY_BUDGET_ENFORCE: bool = False  # Raise on over-budget requests (tests/CI)
+    
+    # Health checks
+    HEALTH_DB_TIMEOUT_SECONDS: float = 1.0  # Readiness DB / cache ping timeout
+    HEALTH_POOL_SATURATION_THRESHOLD: float = 0.9  # Not ready at or above this checked-out ratio
+    HEALTH_READY_CACHE_SECONDS: float = 1.0  # Readiness result is reused for this long
+    
+    # Activity feed
+    FEED_TIMELINE_MAX_ITEMS: int = 500  # Per-user timeline cap
+    FEED_CELEBRITY_FOLLOWER_THRESHOLD: int = 1000  # Above this, fan out on read
+    FEED_BACKFILL_ITEMS: int = 50  # Copied into a timeline on follow
+    
+    # Recommendations (precomputed by python -m app.utils.recommend)
+    RECOMMENDATIONS_TOP_K: int = 50  # Neighbors stored per book
+    RECOMMENDATIONS_MIN_COOCCURRENCE: int = 2  # Readers two books must share to be neighbors
+    RECOMMENDATIONS_MAX_BOOKS_PER_USER: int = 500  # Larger histories are sampled down
+    RECOMMENDATIONS_MIN_RATING: int = 4  # Reviews below this are not a positive signal
+    RECOMMENDATIONS_SEED_BOOKS: int = 50  # Recent books a user's recommendations start from
+    CONTENT_MAX_TERMS: int = 32  # Highest-weight TF-IDF terms kept per book
+    CONTENT_MAX_POSTINGS: int = 1000  # Highest-weight books read per term when finding neighbors
+    CONTENT_MIN_DF: int = 2  # Terms in fewer books cannot match anything and are dropped
+    CONTENT_MAX_DF_RATIO: float = 0.5  # Terms in a larger share of books are too common to help
+    
+    # Trending (time-decayed scores, updated on write)
+    TRENDING_HALF_LIFE_HOURS: float = 24  # An event counts half as much after this long
+    TRENDING_COMPACT_INTERVAL_SECONDS: int = 600  # In-process compaction period; 0 disables it
+    TRENDING_MIN_SCORE: float = 0.05  # Items decayed below this are dropped on compaction
+    TRENDING_MAX_ITEMS: int = 10_000  # Items kept per kind on compaction
+    
+    # Search
+    SEARCH_SUGGEST_MAX_ENTRIES: int = 1_000_000  # Tokens held by the typeahead index (~150 bytes each)
+    SEARCH_SUGGEST_REFRESH_SECONDS: int = 300  # Full rebuild period, picking up other workers' writes; 0 disables
+    SEARCH_MAX_MATCHES: int = 5_000  # Index keys scanned per type and query; totals and facets stop there
+    SEARCH_ENTITY_TIMEOUT_SECONDS: float = 0.5  # Per-type budget before /search answers without it
+    SEARCH_MAX_WORKERS: int = 8  # Threads running /search's per-type lookups; excess lookups queue
+    
     # Admin
     DEFAULT_ADMIN_EMAIL: str = "admin@booknook.com"
     DEFAULT_ADMIN_PASSWORD: str = "admin123"
+    EXPORT_CHUNK_ROWS: int = 1000  # Rows fetched and encoded per chunk of a streaming export
     
     class Config:
         env_file = ".env"
@@ -1,47 +1,334 @@
 """
 Database configuration and session management.
 """
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, StaticPool
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.sql import Select
 from app.config import get_settings
+from app.utils import metrics, query_log
 
 settings = get_settings()
 
-# Create SQLAlchemy engine
-# Use different connection args for SQLite vs PostgreSQL
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}  # Only needed for SQLite
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=connect_args,
-    pool_pre_ping=True,  # Verify connections before using
-)
+def engine_options(url: str) -> dict:
+    """
+    Build create_engine keyword arguments for a database URL from settings.
+    
+    - Pool sizing, timeout and recycle come from DB_POOL_* settings.
+    - DB_POOL_PRE_PING="pessimistic" pings on every checkout; "optimistic"
+      skips that round-trip and relies on recycling plus SQLAlchemy
+      invalidating the pool when a disconnect error is raised.
+    - Postgres gets statement_timeout and idle_in_transaction_session_timeout
+      as startup options.
+    - DB_PGBOUNCER disables client-side pooling and prepared statements for
+      transaction-mode poolers, which also reject startup options; set the
+      timeouts on the role instead (ALTER ROLE ... SET statement_timeout).
+    """
+    db_url = make_url(url)
+    connect_args = {}
+    options = {"connect_args": connect_args}
+    
+    if db_url.get_backend_name() == "sqlite":
+        connect_args["check_same_thread"] = False  # Only needed for SQLite
+        if db_url.database in (None, "", ":memory:"):
+            # In-memory databases live in their connection, so every thread
+            # must share one (SQLAlchemy's default is one per thread)
+            options["poolclass"] = StaticPool
+            return options
+    
+    if db_url.get_backend_name() == "postgresql":
+        if settings.DB_PGBOUNCER:
+            options["poolclass"] = NullPool
+            if db_url.get_driver_name() == "psycopg":
+                connect_args["prepare_threshold"] = None
+            elif db_url.get_driver_name() == "asyncpg":
+                connect_args["statement_cache_size"] = 0
+            return options
+        startup = []
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            startup.append(f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}")
+        if settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS:
+            startup.append(f"-c idle_in_transaction_session_timeout={settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS}")
+        if startup:
+            connect_args["options"] = " ".join(startup)
+    
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING == "pessimistic",
+    )
+    return options
+
+
+def _is_sqlite_file(url: str) -> bool:
+    db_url = make_url(url)
+    return db_url.get_backend_name() == "sqlite" and db_url.database not in (None, "", ":memory:")
+
+
+def tune_sqlite(engine, read_only: bool = False, immediate: bool = False):
+    """
+    Apply the SQLite production profile to every new connection.
+    
+    WAL lets readers run alongside the writer, synchronous=NORMAL is safe
+    under WAL, and busy_timeout makes a locked database wait instead of
+    failing with "database is locked". `immediate` takes the write lock at
+    BEGIN, so a transaction never has to upgrade a read lock (which fails
+    immediately instead of waiting). `read_only` sets query_only.
+    """
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        # Let SQLAlchemy's "begin" event emit BEGIN instead of pysqlite
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_BYTES}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute(f"PRAGMA foreign_keys={'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+    
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE" if immediate else "BEGIN")
+
+
+# Statements that only delimit transactions (e.g. the explicit BEGIN sent by
+# tune_sqlite); they are not counted as queries
+TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "END", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+def instrument_engine(engine, name: str):
+    """Attach query timing, slow-query logging and pool metrics to an engine."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        if statement.lstrip()[:9].upper().startswith(TRANSACTION_CONTROL):
+            return
+        query_log.record_statement(cursor, conn.dialect.name, statement, parameters, executemany, elapsed)
+    
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.DB_POOL_EVENTS.inc(event="connect", pool=name)
+    
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.DB_POOL_EVENTS.inc(event="invalidate", pool=name)
+    
+    @event.listens_for(engine, "close")
+    def _on_close(dbapi_connection, connection_record):
+        metrics.DB_POOL_EVENTS.inc(event="close", pool=name)
+    
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.DB_POOL_EVENTS.inc(event="checkout", pool=name)
+        connection_record.info["checked_out_at"] = time.perf_counter()
+    
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.DB_POOL_CHECKOUT_DURATION.observe(time.perf_counter() - checked_out_at, pool=name)
+    
+    def _collect_pool_metrics():
+        """Refresh pool gauges at scrape time (only QueuePool exposes these)."""
+        pool = engine.pool
+        if not hasattr(pool, "checkedout"):
+            return
+        metrics.DB_POOL_CONNECTIONS.set(pool.size(), state="size", pool=name)
+        metrics.DB_POOL_CONNECTIONS.set(pool.checkedout(), state="checked_out", pool=name)
+        metrics.DB_POOL_CONNECTIONS.set(pool.checkedin(), state="idle", pool=name)
+        # overflow() is negative while the pool is below its base size
+        metrics.DB_POOL_CONNECTIONS.set(max(pool.overflow(), 0), state="overflow", pool=name)
+    
+    metrics.registry.add_collector(_collect_pool_metrics)
+
+
+# Create SQLAlchemy engines. `engine` takes every write; `read_engine`
+# serves plain reads and is the same engine unless SQLite is split below.
+if _is_sqlite_file(settings.DATABASE_URL) and settings.SQLITE_SINGLE_WRITER:
+    # One writer connection: concurrent writers queue on the pool (up to
+    # DB_POOL_TIMEOUT_SECONDS) instead of racing for the file lock. The wait
+    # blocks the calling thread, so this is off by default (see config)
+    engine = create_engine(
+        settings.DATABASE_URL,
+        **{**engine_options(settings.DATABASE_URL), "pool_size": 1, "max_overflow": 0},
+    )
+    tune_sqlite(engine, immediate=True)
+    read_engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+    tune_sqlite(read_engine, read_only=True)
+    instrument_engine(read_engine, "read")
+elif _is_sqlite_file(settings.DATABASE_URL):
+    engine = read_engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+    tune_sqlite(engine)
+else:
+    engine = read_engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+instrument_engine(engine, "primary")
+
+
+class ReplicaSet:
+    """
+    Read replicas chosen round-robin, skipping any that recently failed.
+    
+    A replica whose connection drops or cannot be opened is ejected for
+    REPLICA_EJECT_SECONDS, then tried again. For REPLICA_READ_AFTER_WRITE_SECONDS
+    after a commit on the primary, this process reads from the primary so
+    cache refills and follow-up GETs do not see replication lag.
+    """
+    
+    def __init__(self, engines: list):
+        self.engines = engines
+        self._next = 0
+        self._ejected_until: dict = {}
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+        for replica in engines:
+            event.listen(replica, "handle_error", self._on_error)
+    
+    def choose(self):
+        """Next healthy replica, or None to read from the primary."""
+        if not self.engines:
+            return None
+        now = time.monotonic()
+        if now - self._last_write < settings.REPLICA_READ_AFTER_WRITE_SECONDS:
+            return None
+        with self._lock:
+            for _ in range(len(self.engines)):
+                replica = self.engines[self._next % len(self.engines)]
+                self._next += 1
+                if self._ejected_until.get(replica, 0.0) <= now:
+                    return replica
+        return None
+    
+    def eject(self, replica):
+        with self._lock:
+            self._ejected_until[replica] = time.monotonic() + settings.REPLICA_EJECT_SECONDS
+        metrics.DB_POOL_EVENTS.inc(event="eject", pool=self._name(replica))
+        print(f"⚠️ Read replica {self._name(replica)} ejected for {settings.REPLICA_EJECT_SECONDS}s")
+    
+    def note_write(self):
+        self._last_write = time.monotonic()
+    
+    def status(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {"name": self._name(replica), "ejected": self._ejected_until.get(replica, 0.0) > now}
+            for replica in self.engines
+        ]
+    
+    def _name(self, replica) -> str:
+        return f"replica-{self.engines.index(replica)}"
+    
+    def _on_error(self, context):
+        # Connection failures (no connection yet) and dropped connections
+        if context.is_disconnect or context.connection is None:
+            self.eject(context.engine)
+
+
+replicas = ReplicaSet([
+    create_engine(url, **engine_options(url)) for url in settings.DATABASE_READ_URLS
+])
+for _index, _replica in enumerate(replicas.engines):
+    instrument_engine(_replica, f"replica-{_index}")
 
 # Log which database we're connected to
 db_type = "PostgreSQL (Supabase)" if "postgresql" in settings.DATABASE_URL else "SQLite"
 print(f"🔌 Database: {db_type}")
 
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to `read_engine` (or a replica) and writes to `engine`.
+    
+    Flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE and raw SQL go to
+    the writer. Once a session has written, it stays on the writer for the
+    rest of its life, so read-after-write (e.g. db.refresh after commit)
+    always sees its own changes. Sessions marked `info["read_only"]` read
+    from one replica, picked on first use and kept for the whole session.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get("wrote") or self._is_write(clause):
+            self.info["wrote"] = True
+            return engine
+        if self.info.get("read_only") and replicas.engines:
+            replica = self.info.get("replica") or replicas.choose()
+            if replica is not None:
+                self.info["replica"] = replica
+                return replica
+        return read_engine
+    
+    def _is_write(self, clause) -> bool:
+        if self._flushing or clause is None:
+            return True
+        if isinstance(clause, Select):
+            return clause._for_update_arg is not None
+        # DML, text() and anything else we can't classify
+        return True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session):
+    if session.info.get("wrote"):
+        replicas.note_write()
+
+
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency to get database session."""
+def read_only(func):
+    """Mark a non-GET endpoint (e.g. a batch lookup via POST) as read-only for `get_db`."""
+    func.read_only = True
+    return func
+
+
+def get_db(request: Request = None):
+    """
+    Dependency to get database session.
+    
+    GET and HEAD requests, and endpoints marked @read_only, get a read-only
+    session that may read from a replica (see RoutingSession); writes still
+    go to the primary. FastAPI caches dependencies per request, so the
+    handler and auth dependencies share this one session.
+    """
     db = SessionLocal()
+    if request is not None and (
+        request.method in ("GET", "HEAD")
+        or getattr(request.scope.get("endpoint"), "read_only", False)
+    ):
+        db.info["read_only"] = True
     try:
         yield db
+    except PoolTimeoutError:
+        metrics.DB_POOL_EVENTS.inc(event="timeout")
+        raise
     finally:
         db.close()
 
 
 def init_db():
     """Initialize database tables."""
-    from app.models import user, book, author, review, post, group, message
+    from app.models import user, book, author, review, post, group, message, feed, resource_version, recommendation, trending
     
     # Skip table creation for Supabase - tables are managed via Supabase Dashboard
     if "postgresql" in settings.DATABASE_URL or "supabase" in settings.DATABASE_URL:
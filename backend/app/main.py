@@ -4,11 +4,16 @@ BookNook API - FastAPI Application Entry Point
 A modern API backend for the BookNook book lovers' social platform.
 """
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from app.config import get_settings
+from app.middleware import CompressionMiddleware, ConditionalGetMiddleware, MetricsMiddleware
 from app.database import init_db, SessionLocal
-from app.routers import auth, users, books, authors, reviews, posts, groups, messages, admin, interactions, shelves
+from app.services.suggest import start_suggest_index
+from app.services.trending import start_compactor
+from app.utils import metrics
+from app.routers import auth, users, books, authors, reviews, posts, groups, messages, admin, interactions, shelves, feed, health, search
 
 settings = get_settings()
 
@@ -23,6 +28,20 @@ app = FastAPI(
 
 FRONTEND_URL = os.getenv("FRONTEND_URL", "")
 
+# Answer If-None-Match / If-Modified-Since for versioned catalog endpoints.
+# Added before CORS so CORS stays outermost and also decorates 304s.
+app.add_middleware(
+    ConditionalGetMiddleware,
+    routers=[books.router, authors.router, posts.router],
+)
+
+# Negotiate gzip / brotli / zstd. Wraps ConditionalGet so 304s skip it and
+# encoded responses get per-encoding ETags.
+app.add_middleware(CompressionMiddleware)
+
+# Per-route request counts, latency and queries per request for /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -35,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "X-Next-Cursor"],
 )
 
 # Include routers
@@ -49,12 +69,18 @@ app.include_router(messages.router)
 app.include_router(admin.router)
 app.include_router(interactions.router)
 app.include_router(shelves.router)
+app.include_router(feed.router)
+app.include_router(health.router)
+app.include_router(search.router)
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup."""
     init_db()
+    metrics.start_event_loop_monitor()
+    start_compactor()
+    start_suggest_index()
     
     # Skip admin user creation and seeding for Supabase - managed externally
     if "postgresql" in settings.DATABASE_URL or "supabase" in settings.DATABASE_URL:
@@ -123,6 +149,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus metrics for this process."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/admin/seed")
 async def manual_seed():
     """
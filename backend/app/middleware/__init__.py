@@ -0,0 +1,10 @@
+# Middleware package
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.conditional_get import ConditionalGetMiddleware
+from app.middleware.metrics import MetricsMiddleware
+
+__all__ = [
+    "CompressionMiddleware",
+    "ConditionalGetMiddleware",
+    "MetricsMiddleware",
+]
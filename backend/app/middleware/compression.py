@@ -0,0 +1,134 @@
+"""
+Response compression middleware (gzip / brotli / zstd).
+
+The encoding is negotiated from Accept-Encoding and published through
+`negotiated_encoding` so the response cache can serve precompressed
+entries. Responses that already carry a Content-Encoding (such as cache
+hits) pass through untouched. Single-message bodies below
+COMPRESSION_MINIMUM_SIZE are sent as-is. Streamed bodies are compressed
+chunk by chunk.
+"""
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.utils.compression import (
+    StreamingCompressor,
+    compress,
+    encoded_etag,
+    is_compressible,
+    negotiate,
+    negotiated_encoding,
+)
+
+settings = get_settings()
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing responses with the negotiated encoding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = negotiated_encoding.set(encoding)
+        try:
+            responder = _CompressionResponder(self.app, encoding, self.minimum_size)
+            await responder(scope, receive, send)
+        finally:
+            negotiated_encoding.reset(token)
+
+
+class _CompressionResponder:
+    """Per-request state: holds back the response start until the first body chunk."""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.initial_message: Message = None
+        self.started = False
+        self.passthrough = False
+        self.compressor: StreamingCompressor = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.initial_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            await self._start(body, more_body)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        data = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _start(self, body: bytes, more_body: bool) -> None:
+        headers = MutableHeaders(scope=self.initial_message)
+        status = self.initial_message["status"]
+
+        if "content-encoding" in headers:
+            # Already encoded upstream (e.g. a precompressed cache entry)
+            self.passthrough = True
+            self._tag_etag(headers, headers["content-encoding"])
+            await self._send_start_and(body, more_body)
+            return
+
+        if (
+            status < 200 or status in (204, 304)
+            or not is_compressible(headers.get("content-type", ""))
+            or (not more_body and len(body) < self.minimum_size)
+        ):
+            self.passthrough = True
+            await self._send_start_and(body, more_body)
+            return
+
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        self._tag_etag(headers, self.encoding)
+
+        if more_body:
+            # Streamed body: length unknown, compress incrementally
+            del headers["content-length"]
+            self.compressor = StreamingCompressor(self.encoding)
+            data = self.compressor.compress(body)
+        else:
+            data = compress(body, self.encoding)
+            headers["content-length"] = str(len(data))
+
+        await self._send_start_and(data, more_body)
+
+    async def _send_start_and(self, body: bytes, more_body: bool) -> None:
+        await self.send(self.initial_message)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    @staticmethod
+    def _tag_etag(headers: MutableHeaders, encoding: str) -> None:
+        if "etag" in headers:
+            headers["etag"] = encoded_etag(headers["etag"], encoding)
@@ -0,0 +1,135 @@
+"""
+Conditional GET middleware (ETag / Last-Modified).
+
+For endpoints decorated with `@versioned(...)`, the middleware looks up the
+resource version before the endpoint runs. Requests whose If-None-Match (or
+If-Modified-Since) still matches get a 304 straight away, without loading
+or serializing the resource. Other responses are tagged with a strong ETag
+and Last-Modified.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional
+
+from fastapi import APIRouter
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import SessionLocal
+from app.services.versions import resolved_version
+from app.utils.compression import strip_etag_encoding
+
+
+class ConditionalGetMiddleware:
+    """Pure ASGI middleware answering conditional GETs from version lookups."""
+
+    def __init__(self, app: ASGIApp, routers: Iterable[APIRouter] = ()):
+        self.app = app
+        # Every route, in dispatch order: a literal path such as /books/trending
+        # must win over /books/{book_id} here just as it does in the router
+        self.routes = [route for router in routers for route in router.routes]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        route, path_params = self._match_route(scope)
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+        # A blocking query, run off the event loop like sync endpoints
+        info = await run_in_threadpool(self._lookup, route.endpoint.resource_version, path_params)
+        if info is None:
+            # Unknown resource: let the endpoint produce its 404
+            await self.app(scope, receive, send)
+            return
+
+        tag, last_modified = info
+        etag = self._make_etag(route.path, tag, scope.get("query_string", b""))
+        validators = {"etag": etag, "cache-control": "no-cache"}
+        if last_modified is not None:
+            validators["last-modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+        matched = self._not_modified(Headers(scope=scope), etag, last_modified)
+        if matched is not None:
+            # Echo the representation the client holds, e.g. "<etag>-gzip"
+            validators["etag"] = matched
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in validators.items()],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_validators(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                for key, value in validators.items():
+                    headers[key] = value
+            await send(message)
+
+        token = resolved_version.set(tag)
+        try:
+            await self.app(scope, receive, send_with_validators)
+        finally:
+            resolved_version.reset(token)
+
+    def _match_route(self, scope: Scope):
+        """The @versioned route the request will be dispatched to, if any."""
+        for route in self.routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                if getattr(getattr(route, "endpoint", None), "resource_version", None):
+                    return route, child_scope.get("path_params", {})
+                break
+        return None, {}
+
+    @staticmethod
+    def _lookup(lookup, path_params: dict):
+        db = SessionLocal()
+        # Same source as the GET handler's session, so the ETag matches the body
+        db.info["read_only"] = True
+        try:
+            return lookup(db, path_params)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _make_etag(path: str, tag: str, query_string: bytes) -> str:
+        digest = hashlib.sha1(path.encode() + b"\0" + tag.encode() + b"\0" + query_string)
+        return f'"{digest.hexdigest()[:20]}"'
+
+    @staticmethod
+    def _not_modified(headers: Headers, etag: str, last_modified: Optional[datetime]) -> Optional[str]:
+        """The ETag to send with a 304, or None when the client's copy is stale."""
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            for candidate in (c.strip() for c in if_none_match.split(",")):
+                if candidate == "*":
+                    return etag
+                # Encoded representations carry "<etag>-gzip" etc. (see CompressionMiddleware)
+                if strip_etag_encoding(candidate) == etag:
+                    return candidate
+            return None
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since and last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return None
+            if _as_utc(last_modified).replace(microsecond=0) <= since:
+                return etag
+        return None
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes (SQLite) as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,60 @@
+"""
+Request metrics middleware.
+
+Records per-route request counts, latency, in-flight requests and SQL
+statements per request (see app.utils.metrics). Routes are labelled by
+their path template (`/books/{book_id}`) so label cardinality stays bounded.
+Requests that match no route share the label "unmatched".
+
+Responses carry a Server-Timing header with the request's DB time and
+statement count, and requests over their query budget are flagged (see
+app.utils.query_log).
+"""
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils import metrics, query_log
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware feeding the HTTP metrics."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats = metrics.RequestMetrics()
+        token = metrics.current_request.set(stats)
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                budget = query_log.budget_for(scope.get("route"))
+                timing = query_log.server_timing(stats, time.perf_counter() - start, budget)
+                MutableHeaders(scope=message).append("Server-Timing", timing)
+            await send(message)
+
+        metrics.HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.HTTP_IN_FLIGHT.dec()
+            metrics.current_request.reset(token)
+
+            route = scope.get("route")
+            labels = {"method": scope["method"], "route": getattr(route, "path", "unmatched")}
+            metrics.HTTP_REQUESTS.inc(status=status_code, **labels)
+            metrics.HTTP_REQUEST_DURATION.observe(elapsed, **labels)
+            metrics.HTTP_QUERIES_PER_REQUEST.observe(stats.queries, **labels)
+
+        query_log.check_budget(labels["method"], labels["route"], stats, query_log.budget_for(route))
@@ -7,6 +7,10 @@ from app.models.post import Post
 from app.models.group import Group, GroupPost
 from app.models.message import Message
 from app.models.audit_log import AuditLog
+from app.models.feed import Activity, FeedItem
+from app.models.resource_version import ResourceVersion
+from app.models.recommendation import BookSimilarity, ContentTerm, BookTerm, BookContentSimilarity
+from app.models.trending import TrendingScore
 
 __all__ = [
     "User",
@@ -19,4 +23,12 @@ __all__ = [
     "GroupPost",
     "Message",
     "AuditLog",
+    "Activity",
+    "FeedItem",
+    "ResourceVersion",
+    "BookSimilarity",
+    "ContentTerm",
+    "BookTerm",
+    "BookContentSimilarity",
+    "TrendingScore",
 ]
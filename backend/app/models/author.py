@@ -1,7 +1,8 @@
 """
 Author model.
 """
-from sqlalchemy import Column, String, Text, JSON
+from sqlalchemy import Column, String, Text, JSON, Integer, DateTime
+from sqlalchemy.sql import func
 from app.database import Base
 
 
@@ -18,5 +19,9 @@ class Author(Base):
     died = Column(String(50), nullable=True)
     top_book_ids = Column(JSON, default=list)  # Array of book IDs
     
+    # Bumped on every change; used for ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
     def __repr__(self):
         return f"<Author {self.name}>"
@@ -1,8 +1,9 @@
 """
 Book and PriceOption models.
 """
-from sqlalchemy import Column, String, Integer, Text, JSON, ForeignKey, Float, Boolean
+from sqlalchemy import Column, String, Integer, Text, JSON, ForeignKey, Float, Boolean, DateTime
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.database import Base
 
 
@@ -36,6 +37,10 @@ class Book(Base):
     published_year = Column(Integer, nullable=True)
     genres = Column(JSON, default=list)  # Array of genre strings
     
+    # Bumped on every change; used for ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
     # Relationships
     price_options = relationship("PriceOption", back_populates="book", cascade="all, delete-orphan")
     
@@ -0,0 +1,52 @@
+"""
+Activity feed models (Activity, FeedItem).
+"""
+from sqlalchemy import Column, String, Boolean, JSON, ForeignKey, DateTime, Index
+from app.database import Base
+
+
+class Activity(Base):
+    """Something a user did that shows up in their followers' feeds."""
+
+    __tablename__ = "activities"
+
+    id = Column(String(50), primary_key=True, index=True)
+    actor_id = Column(String(50), ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False)
+    verb = Column(String(50), nullable=False)  # 'review', 'post', 'shelf_add', 'group_post'
+    object_type = Column(String(50), nullable=False)  # 'review', 'post', 'book', 'group_post'
+    object_id = Column(String(50), nullable=False)
+    payload = Column(JSON, default=dict)  # Denormalized display data
+
+    # False when the actor had too many followers to fan out on write;
+    # such activities are merged into timelines at read time instead.
+    fanned_out = Column(Boolean, default=True, nullable=False)
+
+    # Set explicitly so feed items can copy the exact same sort key
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_activities_actor_fanned_out_created_at", "actor_id", "fanned_out", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<Activity {self.verb} by {self.actor_id}>"
+
+
+class FeedItem(Base):
+    """An activity delivered to one user's timeline."""
+
+    __tablename__ = "feed_items"
+
+    id = Column(String(50), primary_key=True, index=True)
+    owner_id = Column(String(50), ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False)
+    activity_id = Column(String(50), ForeignKey("activities.id", ondelete="CASCADE"), nullable=False)
+    actor_id = Column(String(50), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_feed_items_owner_created_at", "owner_id", "created_at", "activity_id"),
+        Index("ix_feed_items_owner_actor", "owner_id", "actor_id"),
+    )
+
+    def __repr__(self):
+        return f"<FeedItem {self.activity_id} for {self.owner_id}>"
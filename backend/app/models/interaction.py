@@ -1,7 +1,7 @@
 """
 Interaction models (Comments, Likes).
 """
-from sqlalchemy import Column, String, ForeignKey, Text, DateTime, Integer
+from sqlalchemy import Column, String, ForeignKey, Text, DateTime, Integer, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -15,6 +15,7 @@ class Comment(Base):
     id = Column(String(50), primary_key=True, index=True)
     user_id = Column(String(50), ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False)
     post_id = Column(String(50), ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
+    parent_id = Column(String(50), ForeignKey("comments.id", ondelete="CASCADE"), nullable=True, index=True)
     content = Column(Text, nullable=False)
     
     # Timestamps
@@ -25,6 +26,11 @@ class Comment(Base):
     user = relationship("User", backref="comments")
     post = relationship("Post", backref="comments")
     
+    __table_args__ = (
+        # Keyset pagination of a post's thread: WHERE post_id = ? ORDER BY created_at, id
+        Index("ix_comments_post_id_created_at", "post_id", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<Comment {self.id} on Post {self.post_id}>"
 
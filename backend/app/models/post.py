@@ -1,7 +1,7 @@
 """
 Post model for blog posts, news, and spotlights.
 """
-from sqlalchemy import Column, String, Text, JSON, Integer, DateTime
+from sqlalchemy import Column, String, Text, JSON, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -17,6 +17,9 @@ class Post(Base):
     excerpt = Column(Text, nullable=True)
     content = Column(Text, nullable=True)
     author = Column(String(255), nullable=False)
+    # Profile that wrote the post; feed activities are published as this user
+    # once the post is approved. Null for posts predating the column.
+    author_id = Column(String(50), ForeignKey("profiles.id", ondelete="SET NULL"), nullable=True)
     date = Column(String(100), nullable=True)
     image_url = Column(String(500), nullable=True)
     tags = Column(JSON, default=list)  # Array of tag strings
@@ -24,8 +27,18 @@ class Post(Base):
     # Moderation
     is_approved = Column(Integer, default=1)  # 1=approved, 0=pending, -1=rejected
     
+    # Bumped on every change; used for ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Feed queries: WHERE is_approved = 1 [AND type = ?] ORDER BY created_at DESC
+        Index("ix_posts_approved_created_at", is_approved, created_at.desc()),
+        Index("ix_posts_approved_type_created_at", is_approved, type, created_at.desc()),
+    )
     
     def __repr__(self):
         return f"<Post {self.title}>"
@@ -0,0 +1,74 @@
+"""
+Precomputed book recommendation models (BookSimilarity, ContentTerm,
+BookTerm, BookContentSimilarity).
+"""
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Index
+from app.database import Base
+
+
+class BookSimilarity(Base):
+    """
+    One of a book's top-K most similar books, written by the offline job
+    in app.utils.recommend. Rows for a book are read by primary key prefix.
+    """
+
+    __tablename__ = "book_similarities"
+
+    book_id = Column(String(50), ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 0 = most similar
+    similar_book_id = Column(String(50), ForeignKey("books.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)  # Cosine similarity of the books' reader sets
+
+    def __repr__(self):
+        return f"<BookSimilarity {self.book_id} #{self.rank} {self.similar_book_id}>"
+
+
+class ContentTerm(Base):
+    """A term of the content-similarity vocabulary, with its IDF from the last full build."""
+
+    __tablename__ = "content_terms"
+
+    term = Column(String(100), primary_key=True)
+    idf = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<ContentTerm {self.term} idf={self.idf:.2f}>"
+
+
+class BookTerm(Base):
+    """One term of a book's L2-normalized TF-IDF vector (a posting of the inverted index)."""
+
+    __tablename__ = "book_terms"
+
+    book_id = Column(String(50), ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
+    term = Column(String(100), primary_key=True)
+    weight = Column(Float, nullable=False)
+
+    __table_args__ = (
+        # A term's highest-weight postings first, for candidate lookups
+        Index("ix_book_terms_term_weight", "term", "weight"),
+    )
+
+    def __repr__(self):
+        return f"<BookTerm {self.book_id} {self.term}={self.weight:.3f}>"
+
+
+class BookContentSimilarity(Base):
+    """
+    One of a book's top-K most similar books by description, genres, author
+    and publisher. Rebuilt by app.utils.content_index and kept current for
+    created and edited books by app.services.content_similarity.
+    """
+
+    __tablename__ = "book_content_similarities"
+
+    book_id = Column(String(50), ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
+    similar_book_id = Column(String(50), ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False)  # Cosine similarity of the TF-IDF vectors
+
+    __table_args__ = (
+        Index("ix_book_content_similarities_book_score", "book_id", "score"),
+    )
+
+    def __repr__(self):
+        return f"<BookContentSimilarity {self.book_id} {self.similar_book_id} {self.score:.3f}>"
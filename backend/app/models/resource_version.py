@@ -0,0 +1,18 @@
+"""
+Collection version model used for conditional GETs on list endpoints.
+"""
+from sqlalchemy import Column, String, Integer, DateTime
+from app.database import Base
+
+
+class ResourceVersion(Base):
+    """Monotonic change counter for a whole collection (e.g. 'books')."""
+    
+    __tablename__ = "resource_versions"
+    
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<ResourceVersion {self.name}={self.version}>"
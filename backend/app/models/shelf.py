@@ -1,7 +1,7 @@
 """
 Book Shelf models.
 """
-from sqlalchemy import Column, String, ForeignKey, Boolean, Enum, DateTime
+from sqlalchemy import Column, String, ForeignKey, Boolean, Enum, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -21,7 +21,7 @@ class Shelf(Base):
     __tablename__ = "shelves"
     
     id = Column(String(50), primary_key=True, index=True)
-    user_id = Column(String(50), ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(String(50), ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     type = Column(String(50), default=ShelfType.CUSTOM)
     is_public = Column(Boolean, default=True)
@@ -53,5 +53,10 @@ class ShelfItem(Base):
     # but good to have access to book details
     book = relationship("Book") 
     
+    __table_args__ = (
+        # A shelf's items, newest first (shelf pages, recommendation seeds)
+        Index("ix_shelf_items_shelf_id_added_at", "shelf_id", "added_at"),
+    )
+    
     def __repr__(self):
         return f"<ShelfItem Book {self.book_id} in Shelf {self.shelf_id}>"
@@ -0,0 +1,29 @@
+"""
+Trending score model.
+"""
+from sqlalchemy import Column, String, Float, Index
+from app.database import Base
+
+
+class TrendingScore(Base):
+    """
+    Time-decayed activity score of one book or post.
+
+    Scores are stored in forward-decay form relative to a landmark time (see
+    app.services.trending), so every write is a plain `score = score + x`
+    and ranking needs no decay at read time.
+    """
+
+    __tablename__ = "trending_scores"
+
+    kind = Column(String(20), primary_key=True)  # 'book' or 'post'
+    item_id = Column(String(50), primary_key=True)
+    score = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        # Top N: WHERE kind = ? ORDER BY score DESC LIMIT N
+        Index("ix_trending_scores_kind_score", kind, score.desc()),
+    )
+
+    def __repr__(self):
+        return f"<TrendingScore {self.kind}:{self.item_id}={self.score:.3f}>"
@@ -1,7 +1,7 @@
 """
 User model for authentication and profiles.
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, TypeDecorator
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, JSON, TypeDecorator
 from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.sql import func
 from uuid import UUID as PyUUID
@@ -13,6 +13,12 @@ class StringUUID(TypeDecorator):
     impl = PG_UUID(as_uuid=False)
     cache_ok = True
     
+    def load_dialect_impl(self, dialect):
+        """Store canonical 36-char strings outside Postgres so foreign keys match."""
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(PG_UUID(as_uuid=False))
+        return dialect.type_descriptor(String(36))
+    
     def process_result_value(self, value, dialect):
         """Convert UUID to string when reading from database."""
         if value is None:
@@ -30,6 +36,22 @@ class StringUUID(TypeDecorator):
         return str(value) if value else None
 
 
+class UUIDArray(TypeDecorator):
+    """A uuid[] column on Postgres, a JSON list of strings elsewhere (e.g. SQLite)."""
+    impl = ARRAY(StringUUID())
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(ARRAY(StringUUID()))
+        return dialect.type_descriptor(JSON())
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return [str(item) for item in value]
+
+
 class User(Base):
     """User account model - maps to Supabase 'profiles' table."""
     
@@ -53,8 +75,8 @@ class User(Base):
     
     # Social features - ARRAY of UUIDs to match Supabase uuid[] schema
     # Using StringUUID type to match the database column type and get string output
-    following = Column(ARRAY(StringUUID()), default=[])
-    followers = Column(ARRAY(StringUUID()), default=[])
+    following = Column(UUIDArray(), default=[])
+    followers = Column(UUIDArray(), default=[])
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
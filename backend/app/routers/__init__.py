@@ -1,5 +1,5 @@
 # Routers package
-from app.routers import auth, users, books, authors, reviews, posts, groups, messages, admin
+from app.routers import auth, users, books, authors, reviews, posts, groups, messages, admin, feed, health, search
 
 __all__ = [
     "auth",
@@ -11,4 +11,7 @@ __all__ = [
     "groups",
     "messages",
     "admin",
+    "feed",
+    "health",
+    "search",
 ]
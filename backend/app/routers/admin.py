@@ -4,8 +4,9 @@ Admin router for private administrative endpoints.
 import uuid
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, or_
 from typing import List, Optional
 from pydantic import BaseModel
 
@@ -22,6 +23,12 @@ from app.schemas.user import UserResponse, UserUpdate
 from app.schemas.review import ReviewResponse
 from app.schemas.post import PostResponse
 from app.services.auth import get_current_admin_from_token
+from app.services.versions import bump_version, touch
+from app.services.cache import invalidate_tags, get_cache_stats
+from app.services.feed import publish_approved, retract_activities
+from app.services.suggest import index_post, index_user, suggest_index
+from app.utils.serialization import json_list_response
+from app.utils.export import EXPORT_TABLES, FORMATS, available_formats, export_table, next_cursor
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -155,7 +162,7 @@ async def get_all_users_admin(
         query = query.filter(User.is_active == is_active)
     
     users = query.offset(skip).limit(limit).all()
-    return [UserResponse.model_validate(u) for u in users]
+    return json_list_response(UserResponse, users)
 
 
 @router.patch("/users/{user_id}", response_model=UserResponse)
@@ -188,6 +195,8 @@ async def update_user_admin(
     
     db.commit()
     db.refresh(user)
+    if update_dict.keys() & {"nickname", "is_active"}:
+        index_user(user)
     
     # Log the action
     log_admin_action(
@@ -222,6 +231,7 @@ async def delete_user_admin(
     user_email = user.email
     db.delete(user)
     db.commit()
+    suggest_index.remove("user", user_id)
     
     # Log the action
     log_admin_action(
@@ -290,6 +300,7 @@ async def toggle_user_active_status(
     user.is_active = not user.is_active
     db.commit()
     db.refresh(user)
+    index_user(user)
     
     # Log the action
     log_admin_action(
@@ -364,7 +375,15 @@ async def approve_content(
         )
     
     content.is_approved = 1
+    if content_type == "post":
+        touch(content)
+        bump_version(db, "posts")
     db.commit()
+    if content_type == "post":
+        invalidate_tags(f"post:{content_id}", "posts:list")
+        index_post(content)
+    
+    publish_approved(db, content_type, content)
     
     # Log the action
     log_admin_action(
@@ -400,7 +419,14 @@ async def reject_content(
         )
     
     content.is_approved = -1
+    if content_type == "post":
+        touch(content)
+        bump_version(db, "posts")
     db.commit()
+    if content_type == "post":
+        invalidate_tags(f"post:{content_id}", "posts:list")
+        index_post(content)
+    retract_activities(db, content_type, content_id)
     
     # Log the action
     log_admin_action(
@@ -431,4 +457,126 @@ async def get_audit_logs(
         query = query.filter(AuditLog.resource_type == resource_type)
     
     logs = query.order_by(AuditLog.created_at.desc()).offset(skip).limit(limit).all()
-    return [AuditLogResponse.model_validate(log) for log in logs]
+    return json_list_response(AuditLogResponse, logs)
+
+
+# Cache
+@router.get("/cache/stats")
+async def get_response_cache_stats(
+    current_user: User = Depends(get_current_admin_from_token)
+):
+    """Get per-route response cache hit/miss counts."""
+    from app.services import cache
+    return {"backend": cache.backend.name, "routes": get_cache_stats()}
+
+
+# Data export
+EXPORT_SEARCH_COLUMNS = {
+    "users": (User.name, User.email),
+    "books": (Book.title, Book.author),
+    "authors": (Author.name,),
+    "posts": (Post.title,),
+    "groups": (Group.name,),
+}
+
+
+def _export_conditions(
+    table: str,
+    search: Optional[str],
+    is_admin: Optional[bool],
+    is_active: Optional[bool],
+    is_approved: Optional[int],
+    action: Optional[str],
+    resource_type: Optional[str],
+) -> list:
+    """Translate the admin list filters into WHERE conditions for one table."""
+    conditions, unsupported = [], []
+    
+    if search:
+        if table in EXPORT_SEARCH_COLUMNS:
+            search_term = f"%{search}%"
+            conditions.append(or_(*(column.ilike(search_term) for column in EXPORT_SEARCH_COLUMNS[table])))
+        else:
+            unsupported.append("search")
+    
+    model = EXPORT_TABLES[table]
+    for name, value, tables in (
+        ("is_admin", is_admin, ("users",)),
+        ("is_active", is_active, ("users",)),
+        ("is_approved", is_approved, ("reviews", "posts")),
+        ("action", action, ("audit_logs",)),
+        ("resource_type", resource_type, ("audit_logs",)),
+    ):
+        if value is None:
+            continue
+        if table in tables:
+            conditions.append(getattr(model, name) == value)
+        else:
+            unsupported.append(name)
+    
+    if unsupported:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Filters not supported for {table}: {', '.join(unsupported)}"
+        )
+    return conditions
+
+
+@router.get("/export/{table}")
+async def export_table_admin(
+    table: str,
+    format: str = "csv",
+    cursor: Optional[str] = Query(None, description="Resume after this id (the last row received)"),
+    limit: Optional[int] = Query(None, ge=1, description="Rows in this page; X-Next-Cursor points at the next one"),
+    search: Optional[str] = None,
+    is_admin: Optional[bool] = None,
+    is_active: Optional[bool] = None,
+    is_approved: Optional[int] = None,
+    action: Optional[str] = None,
+    resource_type: Optional[str] = None,
+    current_user: User = Depends(get_current_admin_from_token),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream a whole table as CSV, NDJSON or Parquet in id order.
+    
+    Rows are read with a server-side cursor and encoded chunk by chunk, so
+    memory stays flat however large the table is. Filters match the admin
+    list endpoints. To resume an interrupted download, pass the id of the
+    last row received as `cursor`.
+    """
+    if table not in EXPORT_TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown table. Exportable tables: {', '.join(EXPORT_TABLES)}"
+        )
+    if format not in available_formats():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format. Available formats: {', '.join(available_formats())}"
+        )
+    
+    model = EXPORT_TABLES[table]
+    conditions = _export_conditions(table, search, is_admin, is_active, is_approved, action, resource_type)
+    media_type, extension = FORMATS[format]
+    headers = {
+        "Content-Disposition": f'attachment; filename="{table}.{extension}"',
+        "Cache-Control": "no-store",
+    }
+    if limit:
+        next_page = next_cursor(model, conditions, cursor, limit)
+        if next_page is not None:
+            headers["X-Next-Cursor"] = next_page
+    
+    # Log the action
+    log_admin_action(
+        db, current_user, "export",
+        resource_type=table,
+        details={"format": format, "cursor": cursor, "limit": limit}
+    )
+    
+    return StreamingResponse(
+        export_table(model, format, conditions, after=cursor, limit=limit),
+        media_type=media_type,
+        headers=headers,
+    )
@@ -10,12 +10,18 @@ from app.database import get_db
 from app.models.author import Author
 from app.schemas.author import AuthorCreate, AuthorUpdate, AuthorResponse
 from app.services.auth import get_current_admin_user
+from app.services.versions import versioned, row_version, collection_version, bump_version, touch
+from app.services.cache import cached, invalidate_tags
+from app.services.suggest import suggest_index
+from app.utils.serialization import json_list_response
 from app.models.user import User
 
 router = APIRouter(prefix="/authors", tags=["Authors"])
 
 
 @router.get("", response_model=List[AuthorResponse])
+@versioned(collection_version("authors"))
+@cached(ttl=300, tags=["authors:list"])
 async def get_all_authors(
     skip: int = 0,
     limit: int = 100,
@@ -23,10 +29,11 @@ async def get_all_authors(
 ):
     """Get all authors."""
     authors = db.query(Author).offset(skip).limit(limit).all()
-    return [AuthorResponse.model_validate(a) for a in authors]
+    return json_list_response(AuthorResponse, authors)
 
 
 @router.get("/{author_id}", response_model=AuthorResponse)
+@versioned(row_version(Author, "author_id"))
 async def get_author(author_id: str, db: Session = Depends(get_db)):
     """Get a single author by ID."""
     author = db.query(Author).filter(Author.id == author_id).first()
@@ -58,8 +65,11 @@ async def create_author(
     )
     
     db.add(new_author)
+    bump_version(db, "authors")
     db.commit()
+    invalidate_tags("authors:list")
     db.refresh(new_author)
+    suggest_index.put("author", new_author.id, new_author.name)
     
     return AuthorResponse.model_validate(new_author)
 
@@ -83,8 +93,13 @@ async def update_author(
     for key, value in update_dict.items():
         setattr(author, key, value)
     
+    touch(author)
+    bump_version(db, "authors")
     db.commit()
+    invalidate_tags(f"author:{author_id}", "authors:list")
     db.refresh(author)
+    if "name" in update_dict:
+        suggest_index.put("author", author.id, author.name)
     
     return AuthorResponse.model_validate(author)
 
@@ -104,6 +119,9 @@ async def delete_author(
         )
     
     db.delete(author)
+    bump_version(db, "authors")
     db.commit()
+    invalidate_tags(f"author:{author_id}", "authors:list")
+    suggest_index.remove("author", author_id)
     
     return {"message": "Author deleted successfully"}
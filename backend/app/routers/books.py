@@ -3,19 +3,28 @@ Books router for CRUD operations.
 """
 import uuid
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 
 from app.database import get_db
 from app.models.book import Book, PriceOption
-from app.schemas.book import BookCreate, BookUpdate, BookResponse
+from app.schemas.book import BookCreate, BookUpdate, BookResponse, SimilarBookResponse, TrendingBookResponse
 from app.services.auth import get_current_user_required, get_current_admin_user
+from app.services.versions import versioned, row_version, collection_version, collection_versions, bump_version, touch
+from app.services.cache import cached, invalidate_tags
+from app.services.content_similarity import index_book
+from app.services.recommendations import SOURCES, similar_books
+from app.services.suggest import book_facets, suggest_index
+from app.services.trending import trending_books
+from app.utils.serialization import json_list_response
 from app.models.user import User
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
 
 @router.get("", response_model=List[BookResponse])
+@versioned(collection_version("books"))
+@cached(ttl=60, tags=["books:list"])
 async def get_all_books(
     skip: int = 0,
     limit: int = 100,
@@ -37,11 +46,28 @@ async def get_all_books(
         # Filter books that contain the genre in their genres array
         query = query.filter(Book.genres.contains([genre]))
     
-    books = query.offset(skip).limit(limit).all()
-    return [BookResponse.model_validate(b) for b in books]
+    books = query.options(selectinload(Book.price_options)).offset(skip).limit(limit).all()
+    return json_list_response(BookResponse, books)
+
+
+@router.get("/trending", response_model=List[TrendingBookResponse])
+@cached(ttl=30, tags=["trending"])
+async def get_trending_books(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the books with the most recent reviews and shelf adds, hottest first.
+    
+    Scores are time-decayed: activity counts half as much after
+    TRENDING_HALF_LIFE_HOURS.
+    """
+    return json_list_response(TrendingBookResponse, trending_books(db, limit))
 
 
 @router.get("/{book_id}", response_model=BookResponse)
+@versioned(row_version(Book, "book_id"))
+@cached(ttl=300, tags=lambda p: [f"book:{p['book_id']}"])
 async def get_book(book_id: str, db: Session = Depends(get_db)):
     """Get a single book by ID."""
     book = db.query(Book).filter(Book.id == book_id).first()
@@ -53,6 +79,33 @@ async def get_book(book_id: str, db: Session = Depends(get_db)):
     return BookResponse.model_validate(book)
 
 
+@router.get("/{book_id}/similar", response_model=List[SimilarBookResponse])
+@versioned(collection_versions("books", "recommendations"))
+# Every book write invalidates books:list; the response embeds book data
+@cached(ttl=300, tags=["recommendations", "books:list"])
+async def get_similar_books(
+    book_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    source: str = Query("auto", pattern=f"^({'|'.join(SOURCES)})$"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get similar books with their scores, best match first.
+    
+    source=readers: books most often shelved or liked by this book's readers.
+    source=content: books with the closest description, genres, author and
+    publisher. source=auto (default): readers, or content for books without
+    reader signal yet.
+    """
+    books = similar_books(db, book_id, limit, source)
+    if books is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Book not found"
+        )
+    return json_list_response(SimilarBookResponse, books)
+
+
 @router.post("", response_model=BookResponse)
 async def create_book(
     book_data: BookCreate,
@@ -88,8 +141,12 @@ async def create_book(
         )
         db.add(price_option)
     
+    bump_version(db, "books")
     db.commit()
+    invalidate_tags("books:list")
     db.refresh(new_book)
+    suggest_index.put("book", new_book.id, new_book.title, book_facets(new_book.genres, new_book.published_year))
+    index_book(db, new_book)
     
     return BookResponse.model_validate(new_book)
 
@@ -130,8 +187,15 @@ async def update_book(
             )
             db.add(price_option)
     
+    touch(book)
+    bump_version(db, "books")
     db.commit()
+    invalidate_tags(f"book:{book_id}", "books:list")
     db.refresh(book)
+    if update_dict.keys() & {"title", "genres", "published_year"}:
+        suggest_index.put("book", book.id, book.title, book_facets(book.genres, book.published_year))
+    if update_dict.keys() & {"description", "genres", "author", "publisher"}:
+        index_book(db, book)
     
     return BookResponse.model_validate(book)
 
@@ -151,6 +215,9 @@ async def delete_book(
         )
     
     db.delete(book)
+    bump_version(db, "books")
     db.commit()
+    invalidate_tags(f"book:{book_id}", "books:list")
+    suggest_index.remove("book", book_id)
     
     return {"message": "Book deleted successfully"}
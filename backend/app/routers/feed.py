@@ -0,0 +1,29 @@
+"""
+Feed router for the personalized home timeline.
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.database import get_db
+from app.models.user import User
+from app.schemas.feed import FeedItemResponse, FeedPage
+from app.services.auth import get_current_user_required
+from app.services.feed import read_timeline
+
+router = APIRouter(prefix="/feed", tags=["Feed"])
+
+
+@router.get("", response_model=FeedPage)
+async def get_feed(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user_required),
+    db: Session = Depends(get_db)
+):
+    """Get the current user's feed of activity from the people they follow."""
+    activities, next_cursor = read_timeline(db, current_user, cursor, limit)
+    return FeedPage(
+        items=[FeedItemResponse.model_validate(a) for a in activities],
+        next_cursor=next_cursor,
+    )
@@ -14,12 +14,17 @@ from app.schemas.group import (
     GroupPostCreate, GroupPostResponse
 )
 from app.services.auth import get_current_user_required
+from app.services.feed import publish_activity
+from app.services.cache import cached, invalidate_tags
+from app.services.suggest import group_facets, suggest_index
+from app.utils.serialization import json_list_response
 from app.models.user import User
 
 router = APIRouter(prefix="/groups", tags=["Groups"])
 
 
 @router.get("", response_model=List[GroupResponse])
+@cached(ttl=60, tags=["groups:list"])
 async def get_all_groups(
     skip: int = 0,
     limit: int = 50,
@@ -27,7 +32,7 @@ async def get_all_groups(
 ):
     """Get all groups."""
     groups = db.query(Group).offset(skip).limit(limit).all()
-    return [GroupResponse.model_validate(g) for g in groups]
+    return json_list_response(GroupResponse, groups)
 
 
 @router.get("/{group_id}", response_model=GroupResponse)
@@ -64,7 +69,9 @@ async def create_group(
     
     db.add(new_group)
     db.commit()
+    invalidate_tags("groups:list")
     db.refresh(new_group)
+    suggest_index.put("group", new_group.id, new_group.name, group_facets(new_group.tags))
     
     return GroupResponse.model_validate(new_group)
 
@@ -101,6 +108,7 @@ async def join_group(
     pending.append(current_user.id)
     group.pending_members = pending
     db.commit()
+    invalidate_tags(f"group:{group_id}", "groups:list")
     
     return {"message": "Join request submitted"}
 
@@ -140,6 +148,7 @@ async def accept_member(
     group.pending_members = pending
     group.members = members
     db.commit()
+    invalidate_tags(f"group:{group_id}", "groups:list")
     
     return {"message": "Member accepted"}
 
@@ -176,6 +185,7 @@ async def reject_member(
     pending.remove(user_id)
     group.pending_members = pending
     db.commit()
+    invalidate_tags(f"group:{group_id}", "groups:list")
     
     return {"message": "Member rejected"}
 
@@ -187,7 +197,7 @@ async def get_group_posts(group_id: str, db: Session = Depends(get_db)):
     posts = db.query(GroupPost).filter(
         GroupPost.group_id == group_id
     ).order_by(GroupPost.created_at.desc()).all()
-    return [GroupPostResponse.model_validate(p) for p in posts]
+    return json_list_response(GroupPostResponse, posts)
 
 
 @router.post("/{group_id}/posts", response_model=GroupPostResponse)
@@ -228,5 +238,15 @@ async def create_group_post(
     db.add(new_post)
     db.commit()
     db.refresh(new_post)
+    response = GroupPostResponse.model_validate(new_post)
+    
+    publish_activity(
+        db, current_user, "group_post", "group_post", post_id,
+        payload={
+            "group_id": group.id,
+            "group_name": group.name,
+            "content": (new_post.content or "")[:280],
+        },
+    )
     
-    return GroupPostResponse.model_validate(new_post)
+    return response
@@ -0,0 +1,26 @@
+"""
+Health router for liveness and readiness probes.
+"""
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from app.services.health import check_readiness
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live")
+async def liveness():
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness():
+    """Readiness probe: 503 when the database is unreachable or the pool is saturated."""
+    ready, checks = await check_readiness()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if ready else "unavailable", "checks": checks},
+        headers={"Cache-Control": "no-store"},
+    )
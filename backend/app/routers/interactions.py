@@ -1,16 +1,23 @@
 """
 Interactions router for Comments and Likes.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import func
+from typing import List, Optional
 
-from app.database import get_db
+from app.database import get_db, read_only
 from app.models.user import User
 from app.models.interaction import Comment, Like
 from app.models.post import Post
-from app.schemas.interaction import CommentCreate, CommentResponse, LikeResponse
-from app.services.auth import get_current_user_required
+from app.schemas.interaction import (
+    CommentCreate, CommentResponse, LikeResponse, BatchLikeRequest, PostLikeInfo
+)
+from app.services.auth import get_current_user_required, get_current_user
+from app.services.like_counts import like_count_cache
+from app.services.trending import POST, LIKE_WEIGHT, bump_trending
+from app.utils.pagination import encode_cursor, after_cursor
+from app.utils.serialization import json_list_response
 import uuid
 
 router = APIRouter(prefix="/posts", tags=["Interactions"])
@@ -18,20 +25,102 @@ router = APIRouter(prefix="/posts", tags=["Interactions"])
 
 # --- Comments ---
 
+# Upper bound on the number of parent IDs placed in a single IN (...) clause
+# while walking reply threads.
+REPLY_BATCH_SIZE = 200
+
+# Defaults applied once a caller opts into pagination with `limit` or `cursor`
+COMMENT_PAGE_SIZE = 50
+DEFAULT_MAX_REPLIES = 500
+
+
+def _comment_rows(db: Session):
+    """Comment projection joined with the author's display fields."""
+    return db.query(
+        Comment.id,
+        Comment.user_id,
+        Comment.post_id,
+        Comment.parent_id,
+        Comment.content,
+        Comment.created_at,
+        Comment.updated_at,
+        User.name.label("user_name"),
+        User.avatar_url.label("user_avatar"),
+    ).outerjoin(User, User.id == Comment.user_id)
+
+
+def _comment_data(row) -> dict:
+    """Build CommentResponse data from a projected row."""
+    data = dict(row._mapping)
+    data["user_name"] = data["user_name"] or "Unknown"
+    return data
+
+
 @router.get("/{post_id}/comments", response_model=List[CommentResponse])
-async def get_comments(post_id: str, db: Session = Depends(get_db)):
-    """Get all comments for a post."""
-    comments = db.query(Comment).filter(Comment.post_id == post_id).order_by(Comment.created_at.asc()).all()
+async def get_comments(
+    post_id: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    max_replies: Optional[int] = Query(None, ge=0, le=2000),
+    db: Session = Depends(get_db)
+):
+    """
+    Get comments for a post, oldest first.
     
-    # Enrich with user details (could be done via join, but this is simple)
-    response_comments = []
-    for comment in comments:
-        c_resp = CommentResponse.model_validate(comment)
-        c_resp.user_name = comment.user.name if comment.user else "Unknown"
-        c_resp.user_avatar = comment.user.avatar_url if comment.user else None
-        response_comments.append(c_resp)
-        
-    return response_comments
+    Without `limit` or `cursor` every comment is returned. Otherwise top-level
+    comments are paginated (COMMENT_PAGE_SIZE by default) and the cursor for
+    the next page is returned in the `X-Next-Cursor` header. Replies to the
+    returned comments are fetched breadth-first, at most `max_replies` in
+    total (DEFAULT_MAX_REPLIES when paginating), and returned in the same
+    flat list (use `parent_id` to thread them).
+    """
+    headers = {}
+    paginate = limit is not None or cursor is not None
+    query = _comment_rows(db).filter(
+        Comment.post_id == post_id,
+        Comment.parent_id.is_(None),
+    )
+    if cursor:
+        query = query.filter(after_cursor(Comment.created_at, Comment.id, cursor))
+    query = query.order_by(Comment.created_at.asc(), Comment.id.asc())
+    
+    if paginate:
+        limit = limit or COMMENT_PAGE_SIZE
+        if max_replies is None:
+            max_replies = DEFAULT_MAX_REPLIES
+        # Fetch one extra row to know whether another page exists
+        rows = query.limit(limit + 1).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    else:
+        rows = query.all()
+    
+    response_comments = [_comment_data(row) for row in rows]
+    
+    # Walk the reply tree one level at a time, in bounded IN (...) batches
+    frontier = [row.id for row in rows]
+    remaining = max_replies  # None means no cap
+    while frontier and remaining != 0:
+        next_frontier = []
+        for start in range(0, len(frontier), REPLY_BATCH_SIZE):
+            if remaining == 0:
+                break
+            batch = frontier[start:start + REPLY_BATCH_SIZE]
+            replies = (
+                _comment_rows(db)
+                .filter(Comment.parent_id.in_(batch))
+                .order_by(Comment.created_at.asc(), Comment.id.asc())
+                .limit(remaining)
+                .all()
+            )
+            if remaining is not None:
+                remaining -= len(replies)
+            response_comments.extend(_comment_data(row) for row in replies)
+            next_frontier.extend(row.id for row in replies)
+        frontier = next_frontier
+    
+    return json_list_response(CommentResponse, response_comments, headers=headers)
 
 
 @router.post("/{post_id}/comments", response_model=CommentResponse)
@@ -45,11 +134,17 @@ async def create_comment(
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
+    
+    if comment_data.parent_id:
+        parent = db.query(Comment.post_id).filter(Comment.id == comment_data.parent_id).first()
+        if not parent or parent.post_id != post_id:
+            raise HTTPException(status_code=404, detail="Parent comment not found")
         
     new_comment = Comment(
         id=str(uuid.uuid4()),
         user_id=current_user.id,
         post_id=post_id,
+        parent_id=comment_data.parent_id,
         content=comment_data.content
     )
     db.add(new_comment)
@@ -101,8 +196,11 @@ async def toggle_like(
     
     if existing_like:
         # Unlike
+        liked_at = existing_like.created_at
         db.delete(existing_like)
         db.commit()
+        like_count_cache.invalidate(post_id)
+        bump_trending(db, POST, post_id, -LIKE_WEIGHT, at=liked_at)
         return LikeResponse(id="", user_id=current_user.id, post_id=post_id, created_at=None) # Special response for unliked? Or handle in FE
     else:
         # Like
@@ -113,62 +211,70 @@ async def toggle_like(
         )
         db.add(new_like)
         db.commit()
+        like_count_cache.invalidate(post_id)
         db.refresh(new_like)
-        return LikeResponse.model_validate(new_like)
+        response = LikeResponse.model_validate(new_like)
+        bump_trending(db, POST, post_id, LIKE_WEIGHT)
+        return response
 
 @router.get("/{post_id}/likes", response_model=List[LikeResponse])
 async def get_likes(post_id: str, db: Session = Depends(get_db)):
     """Get all likes for a post."""
     likes = db.query(Like).filter(Like.post_id == post_id).all()
-    return [LikeResponse.model_validate(like) for like in likes]
-
+    return json_list_response(LikeResponse, likes)
 
-from app.schemas.interaction import BatchLikeRequest, PostLikeInfo
-from sqlalchemy import func
 
 @router.post("/batch/likes", response_model=List[PostLikeInfo])
+@read_only
 async def get_posts_likes_batch(
     request: BatchLikeRequest,
-    current_user: User = Depends(get_current_user_required),
+    current_user: Optional[User] = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get like counts and user like status for multiple posts in one request.
-    Optimized to reduce database queries.
+    Get like counts, and the caller's like status, for multiple posts in one request.
+    
+    Counts are served from a short-TTL cache; only cache misses and the
+    per-user liked set touch the database. Anonymous callers get counts only.
     """
-    post_ids = request.post_ids
+    post_ids = list(dict.fromkeys(request.post_ids))
     if not post_ids:
         return []
 
-    # 1. Get like counts for all requested posts
-    # SELECT post_id, COUNT(*) FROM likes WHERE post_id IN (...) GROUP BY post_id
-    counts_query = (
-        db.query(Like.post_id, func.count(Like.id).label("count"))
-        .filter(Like.post_id.in_(post_ids))
-        .group_by(Like.post_id)
-        .all()
-    )
-    # Convert to dict for fast lookup: {post_id: count}
-    counts_map = {post_id: count for post_id, count in counts_query}
+    # 1. Like counts, from cache where possible
+    counts_map, missing_ids = like_count_cache.get_many(post_ids)
+    if missing_ids:
+        fill_token = like_count_cache.begin_fill()
+        # SELECT post_id, COUNT(*) FROM likes WHERE post_id IN (...) GROUP BY post_id
+        counts_query = (
+            db.query(Like.post_id, func.count(Like.id).label("count"))
+            .filter(Like.post_id.in_(missing_ids))
+            .group_by(Like.post_id)
+            .all()
+        )
+        fetched = {post_id: 0 for post_id in missing_ids}
+        fetched.update({post_id: count for post_id, count in counts_query})
+        like_count_cache.set_many(fetched, fill_token)
+        counts_map.update(fetched)
 
-    # 2. Get posts liked by the current user
+    # 2. Posts liked by the current user (skipped for anonymous callers)
     # SELECT post_id FROM likes WHERE user_id = ... AND post_id IN (...)
-    user_likes_query = (
-        db.query(Like.post_id)
-        .filter(Like.user_id == current_user.id)
-        .filter(Like.post_id.in_(post_ids))
-        .all()
-    )
-    # Convert to set for fast lookup
-    user_liked_posts = {post_id for (post_id,) in user_likes_query}
+    user_liked_posts = set()
+    if current_user is not None:
+        user_likes_query = (
+            db.query(Like.post_id)
+            .filter(Like.user_id == current_user.id)
+            .filter(Like.post_id.in_(post_ids))
+            .all()
+        )
+        user_liked_posts = {post_id for (post_id,) in user_likes_query}
 
     # 3. Construct response
-    results = []
-    for pid in post_ids:
-        results.append(PostLikeInfo(
+    return [
+        PostLikeInfo(
             post_id=pid,
             likes_count=counts_map.get(pid, 0),
             is_liked_by_user=pid in user_liked_posts
-        ))
-    
-    return results
+        )
+        for pid in request.post_ids
+    ]
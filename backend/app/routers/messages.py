@@ -13,6 +13,7 @@ from app.models.message import Message
 from app.models.user import User
 from app.schemas.message import MessageCreate, MessageResponse
 from app.services.auth import get_current_user_required
+from app.utils.serialization import json_list_response
 
 router = APIRouter(prefix="/messages", tags=["Messages"])
 
@@ -29,7 +30,7 @@ async def get_my_messages(
             Message.receiver_id == current_user.id
         )
     ).order_by(Message.created_at.desc()).all()
-    return [MessageResponse.model_validate(m) for m in messages]
+    return json_list_response(MessageResponse, messages)
 
 
 @router.get("/conversation/{user_id}", response_model=List[MessageResponse])
@@ -45,7 +46,7 @@ async def get_conversation(
             and_(Message.sender_id == user_id, Message.receiver_id == current_user.id)
         )
     ).order_by(Message.created_at.asc()).all()
-    return [MessageResponse.model_validate(m) for m in messages]
+    return json_list_response(MessageResponse, messages)
 
 
 @router.post("", response_model=MessageResponse)
@@ -3,37 +3,77 @@ Posts router for blog/news/spotlight content.
 """
 import uuid
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.database import get_db
 from app.models.post import Post
-from app.schemas.post import PostCreate, PostUpdate, PostResponse
+from app.schemas.post import PostCreate, PostUpdate, PostResponse, TrendingPostResponse
 from app.services.auth import get_current_user_required, get_current_admin_user
+from app.services.feed import publish_approved, publish_post, retract_activities
+from app.services.suggest import index_post, suggest_index
+from app.services.trending import trending_posts
+from app.services.versions import versioned, row_version, collection_version, bump_version, touch
+from app.services.cache import cached, invalidate_tags
+from app.utils.serialization import json_list_response
 from app.models.user import User
 
 router = APIRouter(prefix="/posts", tags=["Posts"])
 
 
-@router.get("", response_model=List[PostResponse])
+# Columns returned by list endpoints; `content` is opt-in via ?include=content
+POST_LIST_COLUMNS = (
+    Post.id, Post.type, Post.title, Post.excerpt, Post.author, Post.date,
+    Post.image_url, Post.tags, Post.is_approved, Post.created_at,
+)
+
+
+@router.get("", response_model=List[PostResponse], response_model_exclude_unset=True)
+@versioned(collection_version("posts"))
+@cached(ttl=30, tags=["posts:list"])
 async def get_all_posts(
     skip: int = 0,
     limit: int = 50,
     post_type: Optional[str] = None,
+    include: Optional[str] = Query(None, description="Comma-separated extra fields, e.g. 'content'"),
     db: Session = Depends(get_db)
 ):
-    """Get all approved posts with optional filtering."""
-    query = db.query(Post).filter(Post.is_approved == 1)
+    """
+    Get all approved posts with optional filtering.
+    
+    Post bodies are omitted from the list unless `include=content` is given.
+    """
+    include_fields = {f.strip() for f in include.split(",")} if include else set()
+    columns = POST_LIST_COLUMNS + ((Post.content,) if "content" in include_fields else ())
+    
+    query = db.query(*columns).filter(Post.is_approved == 1)
     
     if post_type:
         query = query.filter(Post.type == post_type)
     
-    posts = query.order_by(Post.created_at.desc()).offset(skip).limit(limit).all()
-    return [PostResponse.model_validate(p) for p in posts]
+    rows = query.order_by(Post.created_at.desc()).offset(skip).limit(limit).all()
+    return json_list_response(PostResponse, rows, exclude_unset=True)
+
+
+@router.get("/trending", response_model=List[TrendingPostResponse], response_model_exclude_unset=True)
+@cached(ttl=30, tags=["trending"])
+async def get_trending_posts(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the approved posts with the most recent likes, hottest first.
+    
+    Bodies are omitted as in the post list. Scores are time-decayed: a like
+    counts half as much after TRENDING_HALF_LIFE_HOURS.
+    """
+    rows = trending_posts(db, limit, POST_LIST_COLUMNS)
+    return json_list_response(TrendingPostResponse, rows, exclude_unset=True)
 
 
 @router.get("/{post_id}", response_model=PostResponse)
+@versioned(row_version(Post, "post_id"))
 async def get_post(post_id: str, db: Session = Depends(get_db)):
     """Get a single post by ID."""
     post = db.query(Post).filter(Post.id == post_id).first()
@@ -61,6 +101,7 @@ async def create_post(
         excerpt=post_data.excerpt,
         content=post_data.content,
         author=current_user.name,
+        author_id=current_user.id,
         date=datetime.now().strftime("%b %d, %Y"),
         image_url=post_data.image_url,
         tags=post_data.tags,
@@ -68,10 +109,18 @@ async def create_post(
     )
     
     db.add(new_post)
+    bump_version(db, "posts")
     db.commit()
+    invalidate_tags("posts:list")
     db.refresh(new_post)
+    index_post(new_post)
+    response = PostResponse.model_validate(new_post)
     
-    return PostResponse.model_validate(new_post)
+    # Pending posts are published when approved (see admin.approve_content)
+    if new_post.is_approved == 1:
+        publish_post(db, current_user, new_post)
+    
+    return response
 
 
 @router.patch("/{post_id}", response_model=PostResponse)
@@ -102,13 +151,26 @@ async def update_post(
     if "is_approved" in update_dict and not current_user.is_admin:
         del update_dict["is_approved"]
     
+    was_approved = post.is_approved == 1
     for key, value in update_dict.items():
         setattr(post, key, value)
     
+    touch(post)
+    bump_version(db, "posts")
     db.commit()
+    invalidate_tags(f"post:{post_id}", "posts:list")
     db.refresh(post)
+    if update_dict.keys() & {"title", "type", "tags", "is_approved"}:
+        index_post(post)
     
-    return PostResponse.model_validate(post)
+    # Approving or unapproving here reaches feeds as in admin moderation
+    response = PostResponse.model_validate(post)
+    if post.is_approved == 1 and not was_approved:
+        publish_approved(db, "post", post)
+    elif was_approved and post.is_approved != 1:
+        retract_activities(db, "post", post_id)
+    
+    return response
 
 
 @router.delete("/{post_id}")
@@ -126,6 +188,10 @@ async def delete_post(
         )
     
     db.delete(post)
+    bump_version(db, "posts")
     db.commit()
+    invalidate_tags(f"post:{post_id}", "posts:list")
+    suggest_index.remove("post", post_id)
+    retract_activities(db, "post", post_id)
     
     return {"message": "Post deleted successfully"}
@@ -12,6 +12,9 @@ from app.models.review import Review
 from app.models.book import Book
 from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse
 from app.services.auth import get_current_user_required
+from app.services.feed import publish_review, retract_activities
+from app.services.trending import BOOK, REVIEW_WEIGHT, bump_trending
+from app.utils.serialization import json_list_response
 from app.models.user import User
 
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
@@ -34,7 +37,7 @@ async def get_all_reviews(
         query = query.filter(Review.user_id == user_id)
     
     reviews = query.order_by(Review.created_at.desc()).offset(skip).limit(limit).all()
-    return [ReviewResponse.model_validate(r) for r in reviews]
+    return json_list_response(ReviewResponse, reviews)
 
 
 @router.get("/book/{book_id}", response_model=List[ReviewResponse])
@@ -44,7 +47,7 @@ async def get_book_reviews(book_id: str, db: Session = Depends(get_db)):
         Review.book_id == book_id,
         Review.is_approved == 1
     ).order_by(Review.created_at.desc()).all()
-    return [ReviewResponse.model_validate(r) for r in reviews]
+    return json_list_response(ReviewResponse, reviews)
 
 
 @router.get("/user/{user_id}", response_model=List[ReviewResponse])
@@ -54,7 +57,7 @@ async def get_user_reviews(user_id: str, db: Session = Depends(get_db)):
         Review.user_id == user_id,
         Review.is_approved == 1
     ).order_by(Review.created_at.desc()).all()
-    return [ReviewResponse.model_validate(r) for r in reviews]
+    return json_list_response(ReviewResponse, reviews)
 
 
 @router.post("", response_model=ReviewResponse)
@@ -99,8 +102,12 @@ async def create_review(
     db.add(new_review)
     db.commit()
     db.refresh(new_review)
+    response = ReviewResponse.model_validate(new_review)
     
-    return ReviewResponse.model_validate(new_review)
+    publish_review(db, current_user, new_review, book)
+    bump_trending(db, BOOK, book.id, REVIEW_WEIGHT)
+    
+    return response
 
 
 @router.patch("/{review_id}", response_model=ReviewResponse)
@@ -161,5 +168,6 @@ async def delete_review(
     
     db.delete(review)
     db.commit()
+    retract_activities(db, "review", review_id)
     
     return {"message": "Review deleted successfully"}
@@ -0,0 +1,69 @@
+"""
+Search router for cross-entity search and typeahead suggestions.
+"""
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import List, Optional
+
+from app.schemas.search import SearchResponse, SuggestionResponse
+from app.services.search import search_all
+from app.services.suggest import KINDS, SUGGEST_KINDS, suggest_index
+from app.utils.serialization import json_list_response
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+def _kinds(types: Optional[str], allowed: tuple) -> Optional[set[str]]:
+    """The requested kinds, or None for all; 400 if none of them is known."""
+    if not types:
+        return None
+    kinds = {t.strip() for t in types.split(",")} & set(allowed)
+    if not kinds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"types must name at least one of: {', '.join(allowed)}"
+        )
+    return kinds
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    types: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(KINDS)}"),
+    genre: Optional[str] = None,
+    decade: Optional[str] = Query(None, description="e.g. '1990s'"),
+    post_type: Optional[str] = None,
+    tag: Optional[str] = None,
+):
+    """
+    Search books, authors, users, groups and posts at once.
+    
+    Every word of `q` must start a word of the item's title or name. Hits
+    of all types are merged by relevance; `facets` count genre, decade,
+    post_type and tag values over all matches, and the matching filters
+    narrow the results to items carrying that value. Each type has its own
+    time budget: a slow one is listed in `timed_out` and returns what it
+    has so far.
+    """
+    filters = [
+        (facet, value)
+        for facet, value in (("genre", genre), ("decade", decade), ("post_type", post_type), ("tag", tag))
+        if value
+    ]
+    return await search_all(q, limit, _kinds(types, KINDS), filters)
+
+
+@router.get("/suggest", response_model=List[SuggestionResponse])
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+    types: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(SUGGEST_KINDS)}"),
+):
+    """
+    Suggest books, authors, users and groups whose names start with `q`.
+    
+    Served from an in-memory prefix index; the last word of `q` is matched as
+    a prefix and earlier words must match too. Empty until the index has
+    finished building after startup.
+    """
+    return json_list_response(SuggestionResponse, suggest_index.suggest(q, limit, _kinds(types, SUGGEST_KINDS)))
@@ -2,7 +2,7 @@
 Shelves router for book collections.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 
 from app.database import get_db
@@ -11,6 +11,9 @@ from app.models.shelf import Shelf, ShelfItem, ShelfType
 from app.models.book import Book
 from app.schemas.shelf import ShelfCreate, ShelfResponse, ShelfUpdate, ShelfItemCreate, ShelfItemResponse
 from app.services.auth import get_current_user_required, get_current_user
+from app.services.feed import publish_activity
+from app.services.trending import BOOK, SHELF_WEIGHT, bump_trending
+from app.utils.serialization import json_list_response
 import uuid
 
 router = APIRouter(prefix="/shelves", tags=["Shelves"])
@@ -19,9 +22,18 @@ router = APIRouter(prefix="/shelves", tags=["Shelves"])
 @router.get("/user/{user_id}", response_model=List[ShelfResponse])
 async def get_user_shelves(user_id: str, db: Session = Depends(get_db)):
     """Get shelves for a user."""
-    shelves = db.query(Shelf).filter(Shelf.user_id == user_id).all()
-    # Pydantic will handle the items relationship
-    return [ShelfResponse.model_validate(s) for s in shelves]
+    shelves = (
+        db.query(Shelf)
+        .filter(Shelf.user_id == user_id)
+        # Load items, their books and price options in three queries, not per row
+        .options(
+            selectinload(Shelf.items)
+            .selectinload(ShelfItem.book)
+            .selectinload(Book.price_options)
+        )
+        .all()
+    )
+    return json_list_response(ShelfResponse, shelves)
 
 
 @router.post("", response_model=ShelfResponse)
@@ -81,7 +93,21 @@ async def add_book_to_shelf(
     db.add(new_item)
     db.commit()
     db.refresh(new_item)
-    return ShelfItemResponse.model_validate(new_item)
+    response = ShelfItemResponse.model_validate(new_item)
+    
+    if shelf.is_public:
+        publish_activity(
+            db, current_user, "shelf_add", "book", book.id,
+            payload={
+                "shelf_id": shelf.id,
+                "shelf_name": shelf.name,
+                "book_title": book.title,
+                "cover_url": book.cover_url,
+            },
+        )
+    bump_trending(db, BOOK, book.id, SHELF_WEIGHT)
+    
+    return response
 
 
 @router.delete("/{shelf_id}/books/{book_id}")
@@ -1,14 +1,19 @@
 """
 Users router for user profile and social features.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.database import get_db
 from app.models.user import User
+from app.schemas.book import RecommendedBookResponse
 from app.schemas.user import UserResponse, UserUpdate
 from app.services.auth import get_current_user_required, get_current_user
+from app.services.feed import backfill_timeline, remove_actor_from_timeline
+from app.services.recommendations import recommend_for_user
+from app.services.suggest import index_user
+from app.utils.serialization import json_list_response
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -29,7 +34,7 @@ async def get_all_users(
 ):
     """Get all users (public profiles)."""
     users = db.query(User).filter(User.is_active == True).offset(skip).limit(limit).all()
-    return [UserResponse.model_validate(u) for u in users]
+    return json_list_response(UserResponse, users)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -62,10 +67,28 @@ async def update_my_profile(
     
     db.commit()
     db.refresh(current_user)
+    if update_dict.keys() & {"nickname", "is_active"}:
+        index_user(current_user)
     
     return UserResponse.model_validate(current_user)
 
 
+@router.get("/me/recommendations", response_model=List[RecommendedBookResponse])
+async def get_my_recommendations(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user_required),
+    db: Session = Depends(get_db)
+):
+    """
+    Get books recommended from the current user's recent shelves and reviews.
+    
+    Empty until the user has shelved or rated a book that has precomputed
+    neighbors (python -m app.utils.recommend).
+    """
+    books = recommend_for_user(db, current_user.id, limit)
+    return json_list_response(RecommendedBookResponse, books)
+
+
 @router.post("/{user_id}/follow", response_model=UserResponse)
 async def follow_user(
     user_id: str,
@@ -99,6 +122,7 @@ async def follow_user(
             target_user.followers = followers
         
         db.commit()
+        backfill_timeline(db, current_user.id, user_id)
         db.refresh(current_user)
     
     return UserResponse.model_validate(current_user)
@@ -130,6 +154,7 @@ async def unfollow_user(
             followers.remove(current_user.id)
             target_user.followers = followers
         
+        remove_actor_from_timeline(db, current_user.id, user_id)
         db.commit()
         db.refresh(current_user)
     
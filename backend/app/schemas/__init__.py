@@ -13,6 +13,7 @@ from app.schemas.group import (
     GroupPostCreate, GroupPostResponse
 )
 from app.schemas.message import MessageCreate, MessageResponse
+from app.schemas.feed import FeedItemResponse, FeedPage
 
 __all__ = [
     "UserCreate", "UserLogin", "UserResponse", "UserUpdate", "Token", "TokenData",
@@ -22,4 +23,5 @@ __all__ = [
     "PostCreate", "PostUpdate", "PostResponse",
     "GroupCreate", "GroupUpdate", "GroupResponse", "GroupPostCreate", "GroupPostResponse",
     "MessageCreate", "MessageResponse",
+    "FeedItemResponse", "FeedPage",
 ]
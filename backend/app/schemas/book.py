@@ -63,3 +63,19 @@ class BookResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class SimilarBookResponse(BookResponse):
+    """A book with its similarity (0-1) to the requested book."""
+    score: float
+
+
+class TrendingBookResponse(BookResponse):
+    """A book with its time-decayed activity score."""
+    score: float
+
+
+class RecommendedBookResponse(BookResponse):
+    """A book recommended to the current user."""
+    score: float
+    because: list[str] = []  # IDs of the user's books that led to it
@@ -0,0 +1,26 @@
+"""
+Feed schemas for response validation.
+"""
+from pydantic import BaseModel
+from typing import Optional, Any
+from datetime import datetime
+
+
+class FeedItemResponse(BaseModel):
+    """Schema for a single activity in a user's feed."""
+    id: str
+    actor_id: str
+    verb: str
+    object_type: str
+    object_id: str
+    payload: dict[str, Any] = {}
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class FeedPage(BaseModel):
+    """A page of feed items plus the cursor for the next page."""
+    items: list[FeedItemResponse]
+    next_cursor: Optional[str] = None
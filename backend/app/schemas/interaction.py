@@ -6,6 +6,7 @@ from typing import Optional
 class CommentBase(BaseModel):
     content: str
     post_id: str
+    parent_id: Optional[str] = None  # Set for replies; None for top-level comments
 
 class CommentCreate(CommentBase):
     pass
@@ -21,7 +22,7 @@ class CommentResponse(CommentBase):
     user_avatar: Optional[str] = None
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 # Like Schemas
 class LikeBase(BaseModel):
@@ -34,10 +35,10 @@ class LikeCreate(LikeBase):
 class LikeResponse(LikeBase):
     id: str
     user_id: str
-    created_at: datetime
+    created_at: Optional[datetime] = None  # None in the response to an unlike
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 
 # Batch Schemas
@@ -28,7 +28,12 @@ class PostUpdate(BaseModel):
 
 
 class PostResponse(BaseModel):
-    """Schema for post response."""
+    """
+    Schema for post response.
+    
+    List endpoints build this from a projection without `content`; the field
+    is then left unset and dropped from the payload.
+    """
     id: str
     type: str
     title: str
@@ -43,3 +48,8 @@ class PostResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class TrendingPostResponse(PostResponse):
+    """A post with its time-decayed like score."""
+    score: float
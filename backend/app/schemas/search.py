@@ -0,0 +1,37 @@
+"""
+Search schemas for response validation.
+"""
+from pydantic import BaseModel
+from typing import Any, Optional
+
+
+class SuggestionResponse(BaseModel):
+    """One typeahead suggestion."""
+    type: str  # 'book', 'author', 'user' or 'group'
+    id: str
+    text: str
+
+
+class SearchHit(BaseModel):
+    """One search result; `item` is the full record, or null if it could not be loaded in time."""
+    type: str  # 'book', 'author', 'user', 'group' or 'post'
+    id: str
+    text: str
+    score: float  # Relevance, 0-1, comparable across types
+    item: Optional[dict[str, Any]] = None
+
+
+class FacetCount(BaseModel):
+    """How many matches carry one facet value."""
+    value: str
+    count: int
+
+
+class SearchResponse(BaseModel):
+    """Merged results of a multi-entity search."""
+    query: str
+    hits: list[SearchHit]
+    totals: dict[str, int]  # Matches per type
+    facets: dict[str, list[FacetCount]]  # genre, decade, post_type, tag
+    timed_out: list[str] = []  # Types whose results are missing or incomplete
+    approximate: bool = False  # Some type had too many matches; totals and facets are lower bounds
@@ -13,6 +13,7 @@ from app.config import get_settings
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import TokenData
+from app.services.suggest import index_user
 
 settings = get_settings()
 
@@ -109,6 +110,7 @@ async def get_current_user(
             db.add(new_user)
             db.commit()
             db.refresh(new_user)
+            index_user(new_user)
             print(f"✅ User auto-created: {new_user.email} ({new_user.id})")
             return new_user
         except Exception as e:
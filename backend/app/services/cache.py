@@ -0,0 +1,335 @@
+"""
+Response cache with tag-based invalidation.
+
+Read endpoints opt in with `@cached(ttl=..., tags=...)`. The encoded JSON
+body is stored under a key built from the endpoint name and its scalar
+parameters, and indexed by tags such as `book:{id}` or `books:list`. Write
+handlers call `invalidate_tags(...)` to drop exactly the affected entries.
+On `@versioned` endpoints the key also carries the resource version, so a
+version bump made where this process's invalidation cannot reach (another
+worker, a CLI) still misses the cache instead of serving the old body
+under the new ETag.
+
+When CompressionMiddleware has negotiated a Content-Encoding, the encoded
+body is stored next to the identity body (key suffix `#gzip`, `#br`, ...)
+with the same tags, so hits are served precompressed and never recompressed.
+
+Two backends are available, selected by CACHE_BACKEND:
+
+- "memory": an in-process LRU (default). Invalidation is local to the
+  process, so other workers may serve stale entries until their TTL runs out.
+- "redis": a Redis 7+ (or compatible) server at CACHE_REDIS_URL, shared by all
+  workers. Requires the optional `redis` package.
+"""
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Iterable, Optional, Union
+from urllib.parse import urlencode
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from app.config import get_settings
+from app.services.versions import resolved_version
+from app.utils import metrics
+from app.utils.compression import compress, negotiated_encoding
+
+settings = get_settings()
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+class CacheBackend:
+    """Interface for cache storage backends."""
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        raise NotImplementedError
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Delete every entry carrying any of the tags; return how many were dropped."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def ping(self) -> bool:
+        return True
+
+
+class MemoryBackend(CacheBackend):
+    """Thread-safe in-process LRU cache with per-entry TTLs."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[bytes, float, tuple[str, ...]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, tags)
+            for tag in tags:
+                self._tags[tag].add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        dropped = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.pop(tag, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        dropped += 1
+        return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisBackend(CacheBackend):
+    """Cache stored in a Redis-protocol server, shared across workers."""
+
+    name = "redis"
+
+    def __init__(self, url: str = None, client=None, prefix: str = "booknook:cache:"):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "CACHE_BACKEND=redis requires the 'redis' package (pip install redis)"
+                ) from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}k:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}t:{tag}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self._key(key))
+
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        pipe = self.client.pipeline()
+        pipe.set(self._key(key), value, ex=ttl)
+        for tag in tags:
+            pipe.sadd(self._tag(tag), self._key(key))
+            # Tag sets only need to outlive the entries they index. Entries of
+            # different TTLs share tags, so only ever extend the expiry: NX
+            # sets it on a new set, GT lengthens it (Redis 7+)
+            pipe.expire(self._tag(tag), ttl * 2, nx=True)
+            pipe.expire(self._tag(tag), ttl * 2, gt=True)
+        pipe.execute()
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        dropped = 0
+        for tag in tags:
+            tag_key = self._tag(tag)
+            keys = list(self.client.smembers(tag_key))
+            if keys:
+                dropped += self.client.delete(*keys)
+            self.client.delete(tag_key)
+        return dropped
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def ping(self) -> bool:
+        try:
+            return bool(self.client.ping())
+        except Exception:
+            return False
+
+
+def create_backend() -> CacheBackend:
+    """Build the backend selected by CACHE_BACKEND."""
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(settings.CACHE_REDIS_URL)
+    return MemoryBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+backend: CacheBackend = create_backend()
+
+
+# Per-route hit/miss counters: {route: {"hits": n, "misses": n}}
+_stats: dict[str, dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+_stats_lock = threading.Lock()
+
+
+def _record(route: str, outcome: str) -> None:
+    with _stats_lock:
+        _stats[route][outcome] += 1
+    metrics.CACHE_REQUESTS.inc(route=route, outcome=outcome)
+
+
+def get_cache_stats() -> dict[str, dict]:
+    """Return per-route hit/miss counts and hit rates."""
+    with _stats_lock:
+        stats = {route: dict(counts) for route, counts in _stats.items()}
+    for counts in stats.values():
+        total = counts["hits"] + counts["misses"]
+        counts["hit_rate"] = round(counts["hits"] / total, 4) if total else 0.0
+    return stats
+
+
+def _collect_hit_ratios() -> None:
+    for route, counts in get_cache_stats().items():
+        metrics.CACHE_HIT_RATIO.set(counts["hit_rate"], route=route)
+
+
+metrics.registry.add_collector(_collect_hit_ratios)
+
+
+def set_backend(new_backend: CacheBackend) -> None:
+    """Swap the active backend (e.g. for a Redis fake in tests)."""
+    global backend
+    backend = new_backend
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Drop every cached response carrying any of the tags."""
+    try:
+        backend.invalidate_tags(tags)
+    except Exception as e:
+        # A failed invalidation must not fail the write; entries still expire
+        print(f"⚠️ Cache invalidation failed for {tags}: {e}")
+
+
+def _is_key_param(value) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _encoded_response(key: str, body: bytes, ttl: int, tags: Iterable[str]) -> Response:
+    """Return `body` in the negotiated encoding, compressing at most once per entry."""
+    encoding = negotiated_encoding.get()
+    if encoding is None or len(body) < settings.COMPRESSION_MINIMUM_SIZE:
+        return Response(content=body, media_type=JSON_MEDIA_TYPE)
+
+    variant_key = f"{key}#{encoding}"
+    try:
+        encoded = backend.get(variant_key)
+    except Exception as e:
+        print(f"⚠️ Cache read failed for {variant_key}: {e}")
+        encoded = None
+    if encoded is None:
+        encoded = compress(body, encoding)
+        try:
+            backend.set(variant_key, encoded, ttl, tags)
+        except Exception as e:
+            print(f"⚠️ Cache write failed for {variant_key}: {e}")
+    return Response(
+        content=encoded,
+        media_type=JSON_MEDIA_TYPE,
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+    )
+
+
+def cached(
+    ttl: int = None,
+    tags: Union[Iterable[str], Callable[[dict], Iterable[str]]] = (),
+    exclude_unset: bool = False,
+):
+    """
+    Cache an endpoint's JSON response.
+
+    The key is built from the endpoint name and its scalar arguments (path
+    and query parameters); dependencies like the DB session are ignored.
+    Under `@versioned` it also includes the version ConditionalGetMiddleware
+    resolved for the request.
+    `tags` is a list of tags or a callable receiving the arguments.
+    Responses are returned pre-encoded, so hits skip the handler and
+    response-model serialization entirely. Exceptions are never cached.
+    Bodies are returned in the request's negotiated Content-Encoding.
+    """
+    ttl = ttl or settings.CACHE_DEFAULT_TTL_SECONDS
+
+    def decorator(func):
+        route = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            params = sorted(
+                (name, "" if value is None else str(value))
+                for name, value in bound.items()
+                if _is_key_param(value)
+            )
+            version = resolved_version.get()
+            if version is not None:
+                # "@" cannot start a parameter name, so this never collides
+                params.append(("@version", version))
+            key = f"{route}?{urlencode(params)}"
+            entry_tags = tuple(tags(bound) if callable(tags) else tags)
+
+            try:
+                body = backend.get(key)
+            except Exception as e:
+                print(f"⚠️ Cache read failed for {key}: {e}")
+                body = None
+            if body is not None:
+                _record(route, "hits")
+                return _encoded_response(key, body, ttl, entry_tags)
+
+            _record(route, "misses")
+            result = await func(*args, **kwargs)
+            if isinstance(result, Response):
+                # Already encoded (see app.utils.serialization)
+                body = result.body
+            else:
+                body = json.dumps(
+                    jsonable_encoder(result, exclude_unset=exclude_unset),
+                    separators=(",", ":"),
+                ).encode("utf-8")
+            try:
+                backend.set(key, body, ttl, entry_tags)
+            except Exception as e:
+                print(f"⚠️ Cache write failed for {key}: {e}")
+            return _encoded_response(key, body, ttl, entry_tags)
+
+        return wrapper
+
+    return decorator
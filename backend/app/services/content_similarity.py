@@ -0,0 +1,184 @@
+"""
+Content-based book similarity.
+
+Books are TF-IDF vectors over description words plus one term each for
+their genres, author and publisher (weighted up, since sharing an author
+or genre says more than sharing a word). Vectors keep their
+CONTENT_MAX_TERMS heaviest terms and are L2-normalized, so the dot product
+of two books is their cosine similarity.
+
+app.utils.content_index rebuilds everything offline. `index_book` keeps a
+created or edited book current between rebuilds, using the vocabulary and
+IDFs of the last build; terms first seen since then are ignored until the
+next one.
+
+Neighbors are found through the inverted index (`book_terms`), reading only
+the CONTENT_MAX_POSTINGS highest-weight books of each term. Scores are
+therefore exact for the pairs found, but a pair sharing only common,
+low-weight terms can be missed.
+"""
+import heapq
+import re
+from collections import Counter
+from math import log, sqrt
+from operator import itemgetter
+from typing import Iterable, Mapping, Optional
+
+from sqlalchemy import delete, func, insert, or_, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.book import Book
+from app.models.recommendation import BookContentSimilarity, BookTerm, ContentTerm
+from app.services.cache import invalidate_tags
+from app.services.versions import bump_version
+
+settings = get_settings()
+
+GENRE_WEIGHT = 3.0
+AUTHOR_WEIGHT = 2.0
+PUBLISHER_WEIGHT = 1.0
+MAX_TERM_LENGTH = 100  # ContentTerm.term / BookTerm.term column size
+TRIM_BATCH_SIZE = 500  # Books per neighbor-list trim statement
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset("""
+    about after again all also among and any are because been before being between both but
+    can could did does doing down during each few for from further had has have having her
+    here hers him his how into its just more most much must nor not now off once only other
+    our out over own same she should some such than that the their them then there these
+    they this those through too under until very was were what when where which while who
+    whom why will with would you your
+""".split())
+
+
+def _label(prefix: str, value: str) -> str:
+    return f"{prefix}:{' '.join(_WORD.findall(value.lower()))}"[:MAX_TERM_LENGTH]
+
+
+def term_frequencies(
+    description: Optional[str],
+    genres: Optional[Iterable[str]],
+    author: Optional[str],
+    publisher: Optional[str],
+) -> dict[str, float]:
+    """Field-weighted, sublinear term frequencies of one book."""
+    words = Counter(
+        word for word in _WORD.findall((description or "").lower())
+        if len(word) > 2 and word not in STOP_WORDS
+    )
+    frequencies = {word[:MAX_TERM_LENGTH]: 1 + log(count) for word, count in words.items()}
+    for genre in genres or []:
+        frequencies[_label("genre", genre)] = GENRE_WEIGHT
+    if author:
+        frequencies[_label("author", author)] = AUTHOR_WEIGHT
+    if publisher:
+        frequencies[_label("publisher", publisher)] = PUBLISHER_WEIGHT
+    return frequencies
+
+
+def book_frequencies(book) -> dict[str, float]:
+    return term_frequencies(book.description, book.genres, book.author, book.publisher)
+
+
+def idf(document_frequency: int, documents: int) -> float:
+    """Smoothed inverse document frequency."""
+    return log((1 + documents) / (1 + document_frequency)) + 1
+
+
+def tfidf_vector(frequencies: Mapping[str, float], idfs: Mapping[str, float], max_terms: int) -> list[tuple[str, float]]:
+    """The heaviest `max_terms` TF-IDF weights, L2-normalized; terms without an IDF are dropped."""
+    weighted = [(term, tf * idfs[term]) for term, tf in frequencies.items() if term in idfs]
+    weighted = heapq.nlargest(max_terms, weighted, key=itemgetter(1))
+    norm = sqrt(sum(weight * weight for _, weight in weighted))
+    return [(term, weight / norm) for term, weight in weighted] if norm else []
+
+
+def trim_neighbors(db: Session, book_ids: list[str], top_k: int) -> None:
+    """Delete neighbors beyond the best `top_k` of each given book."""
+    for start in range(0, len(book_ids), TRIM_BATCH_SIZE):
+        batch = book_ids[start:start + TRIM_BATCH_SIZE]
+        ranked = (
+            select(
+                BookContentSimilarity.book_id,
+                BookContentSimilarity.similar_book_id,
+                func.row_number().over(
+                    partition_by=BookContentSimilarity.book_id,
+                    order_by=(BookContentSimilarity.score.desc(), BookContentSimilarity.similar_book_id),
+                ).label("rn"),
+            )
+            .where(BookContentSimilarity.book_id.in_(batch))
+            .subquery()
+        )
+        db.execute(
+            delete(BookContentSimilarity).where(
+                tuple_(BookContentSimilarity.book_id, BookContentSimilarity.similar_book_id).in_(
+                    select(ranked.c.book_id, ranked.c.similar_book_id).where(ranked.c.rn > top_k)
+                )
+            )
+        )
+
+
+def nearest_books(db: Session, book_id: str, vector: list[tuple[str, float]], top_k: int) -> list[tuple[str, float]]:
+    """Best (book id, score) matches for a vector, from each term's top postings."""
+    postings = union_all(*(
+        select(
+            select(BookTerm.book_id, (BookTerm.weight * weight).label("score"))
+            .where(BookTerm.term == term)
+            .order_by(BookTerm.weight.desc())
+            .limit(settings.CONTENT_MAX_POSTINGS)
+            .subquery()
+        )
+        for term, weight in vector
+    ))
+    scores = {}
+    for other, score in db.execute(postings):
+        if other != book_id:
+            scores[other] = scores.get(other, 0.0) + score
+    return heapq.nlargest(top_k, scores.items(), key=itemgetter(1))
+
+
+def index_book(db: Session, book: Book) -> None:
+    """
+    Re-index a created or edited book and update its neighbors both ways.
+
+    Called after the book's write has committed. Like feed delivery this is
+    best effort: failures are logged and rolled back, and the next full
+    rebuild catches up.
+    """
+    top_k = settings.RECOMMENDATIONS_TOP_K
+    try:
+        frequencies = book_frequencies(book)
+        idfs = dict(db.execute(
+            select(ContentTerm.term, ContentTerm.idf).where(ContentTerm.term.in_(list(frequencies)))
+        ).all()) if frequencies else {}
+        vector = tfidf_vector(frequencies, idfs, settings.CONTENT_MAX_TERMS)
+
+        db.execute(delete(BookTerm).where(BookTerm.book_id == book.id))
+        # Lists this book appeared in lose it until they are refilled here or by a rebuild
+        db.execute(delete(BookContentSimilarity).where(or_(
+            BookContentSimilarity.book_id == book.id,
+            BookContentSimilarity.similar_book_id == book.id,
+        )))
+        if vector:
+            db.execute(insert(BookTerm), [
+                {"book_id": book.id, "term": term, "weight": weight} for term, weight in vector
+            ])
+            neighbors = nearest_books(db, book.id, vector, top_k)
+            if neighbors:
+                db.execute(insert(BookContentSimilarity), [
+                    row
+                    for other, score in neighbors
+                    for row in (
+                        {"book_id": book.id, "similar_book_id": other, "score": score},
+                        {"book_id": other, "similar_book_id": book.id, "score": score},
+                    )
+                ])
+                trim_neighbors(db, [other for other, _ in neighbors], top_k)
+        bump_version(db, "recommendations")
+        db.commit()
+        invalidate_tags("recommendations")
+    except Exception as e:
+        print(f"❌ Failed to update content neighbors for {book.id}: {e}")
+        db.rollback()
@@ -0,0 +1,261 @@
+"""
+Activity feed service.
+
+Activities are fanned out on write into each follower's capped timeline
+(`feed_items`). Actors with more than FEED_CELEBRITY_FOLLOWER_THRESHOLD
+followers are not fanned out; their activities are pulled from the
+`activities` table and merged into timelines at read time.
+
+Content published while pending moderation is delivered once approved;
+deleted or rejected content is retracted from the log and every timeline.
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import func, insert, select, delete
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.book import Book
+from app.models.feed import Activity, FeedItem
+from app.models.post import Post
+from app.models.review import Review
+from app.models.user import User
+from app.utils.pagination import after_cursor, encode_cursor
+
+settings = get_settings()
+
+# Owners per trim statement
+TRIM_BATCH_SIZE = 500
+
+
+def _feed_item_rows(activity: Activity, owner_ids: Iterable[str]) -> list[dict]:
+    return [
+        {
+            "id": f"fi-{uuid.uuid4().hex[:16]}",
+            "owner_id": owner_id,
+            "activity_id": activity.id,
+            "actor_id": activity.actor_id,
+            "created_at": activity.created_at,
+        }
+        for owner_id in owner_ids
+    ]
+
+
+def trim_timelines(db: Session, owner_ids: list[str]) -> None:
+    """Delete timeline entries beyond FEED_TIMELINE_MAX_ITEMS for the given owners."""
+    for start in range(0, len(owner_ids), TRIM_BATCH_SIZE):
+        batch = owner_ids[start:start + TRIM_BATCH_SIZE]
+        ranked = (
+            select(
+                FeedItem.id,
+                func.row_number().over(
+                    partition_by=FeedItem.owner_id,
+                    order_by=(FeedItem.created_at.desc(), FeedItem.activity_id.desc()),
+                ).label("rn"),
+            )
+            .where(FeedItem.owner_id.in_(batch))
+            .subquery()
+        )
+        db.execute(
+            delete(FeedItem).where(
+                FeedItem.id.in_(
+                    select(ranked.c.id).where(ranked.c.rn > settings.FEED_TIMELINE_MAX_ITEMS)
+                )
+            )
+        )
+
+
+def publish_activity(
+    db: Session,
+    actor: User,
+    verb: str,
+    object_type: str,
+    object_id: str,
+    payload: Optional[dict] = None,
+) -> Optional[Activity]:
+    """
+    Record an activity and deliver it to the actor's and followers' timelines.
+
+    Called after the triggering write has committed. Feed delivery is best
+    effort: failures are logged and rolled back without affecting the caller.
+    """
+    followers = [str(f) for f in (actor.followers or [])]
+    fan_out = len(followers) <= settings.FEED_CELEBRITY_FOLLOWER_THRESHOLD
+
+    activity = Activity(
+        id=f"act-{uuid.uuid4().hex[:16]}",
+        actor_id=actor.id,
+        verb=verb,
+        object_type=object_type,
+        object_id=object_id,
+        payload={"actor_name": actor.name, "actor_avatar": actor.avatar_url, **(payload or {})},
+        fanned_out=fan_out,
+        created_at=datetime.now(timezone.utc),
+    )
+
+    try:
+        db.add(activity)
+        db.flush()
+        if fan_out:
+            owners = list(dict.fromkeys([actor.id, *followers]))
+            db.execute(insert(FeedItem), _feed_item_rows(activity, owners))
+            trim_timelines(db, owners)
+        db.commit()
+        return activity
+    except Exception as e:
+        print(f"❌ Failed to publish {verb} activity for {actor.id}: {e}")
+        db.rollback()
+        return None
+
+
+def publish_post(db: Session, actor: User, post: Post) -> Optional[Activity]:
+    """Publish an approved post to its author's followers."""
+    return publish_activity(
+        db, actor, "post", "post", post.id,
+        payload={
+            "type": post.type,
+            "title": post.title,
+            "excerpt": post.excerpt,
+            "image_url": post.image_url,
+        },
+    )
+
+
+def publish_review(db: Session, actor: User, review: Review, book: Book) -> Optional[Activity]:
+    """Publish a review to its author's followers."""
+    return publish_activity(
+        db, actor, "review", "review", review.id,
+        payload={
+            "book_id": book.id,
+            "book_title": book.title,
+            "cover_url": book.cover_url,
+            "rating": review.rating,
+            "content": (review.content or "")[:280],
+        },
+    )
+
+
+def has_activity(db: Session, object_type: str, object_id: str) -> bool:
+    """Whether an activity about this object has been published."""
+    return db.query(
+        select(Activity.id)
+        .where(Activity.object_type == object_type, Activity.object_id == object_id)
+        .exists()
+    ).scalar()
+
+
+def publish_approved(db: Session, object_type: str, content) -> None:
+    """Deliver newly approved post or review to its author's followers, unless it already was."""
+    author_id = content.author_id if object_type == "post" else content.user_id
+    author = db.query(User).filter(User.id == author_id).first() if author_id else None
+    if author is None or has_activity(db, object_type, content.id):
+        return
+    if object_type == "post":
+        publish_post(db, author, content)
+    else:
+        book = db.query(Book).filter(Book.id == content.book_id).first()
+        if book:
+            publish_review(db, author, content, book)
+
+
+def retract_activities(db: Session, object_type: str, object_id: str) -> None:
+    """
+    Remove the activities about a deleted or rejected object, and their
+    timeline entries.
+
+    Called after the triggering write has committed; best effort like
+    `publish_activity`.
+    """
+    try:
+        activity_ids = select(Activity.id).where(
+            Activity.object_type == object_type, Activity.object_id == object_id
+        )
+        db.execute(delete(FeedItem).where(FeedItem.activity_id.in_(activity_ids)))
+        db.execute(delete(Activity).where(
+            Activity.object_type == object_type, Activity.object_id == object_id
+        ))
+        db.commit()
+    except Exception as e:
+        print(f"❌ Failed to retract {object_type} {object_id} activities: {e}")
+        db.rollback()
+
+
+def backfill_timeline(db: Session, owner_id: str, actor_id: str) -> None:
+    """
+    Copy an actor's recent fanned-out activities into a new follower's timeline.
+
+    Called after the follow has committed; best effort like `publish_activity`.
+    """
+    try:
+        recent = (
+            db.query(Activity)
+            .filter(Activity.actor_id == actor_id, Activity.fanned_out.is_(True))
+            .order_by(Activity.created_at.desc())
+            .limit(settings.FEED_BACKFILL_ITEMS)
+            .all()
+        )
+        if not recent:
+            return
+        # Drop anything already delivered so the backfill stays idempotent
+        db.query(FeedItem).filter(
+            FeedItem.owner_id == owner_id, FeedItem.actor_id == actor_id
+        ).delete(synchronize_session=False)
+        rows = [row for activity in recent for row in _feed_item_rows(activity, [owner_id])]
+        db.execute(insert(FeedItem), rows)
+        trim_timelines(db, [owner_id])
+        db.commit()
+    except Exception as e:
+        print(f"❌ Failed to backfill {owner_id}'s timeline with {actor_id}: {e}")
+        db.rollback()
+
+
+def remove_actor_from_timeline(db: Session, owner_id: str, actor_id: str) -> None:
+    """Remove an actor's activities from a user's timeline after an unfollow."""
+    db.query(FeedItem).filter(
+        FeedItem.owner_id == owner_id, FeedItem.actor_id == actor_id
+    ).delete(synchronize_session=False)
+
+
+def read_timeline(db: Session, user: User, cursor: Optional[str], limit: int):
+    """
+    Read one page of a user's feed, newest first.
+
+    Returns (activities, next_cursor). Fanned-out items come from the user's
+    timeline; activities by followed high-follower accounts are pulled from
+    the activity log and merged in.
+    """
+    timeline = (
+        db.query(Activity)
+        .join(FeedItem, FeedItem.activity_id == Activity.id)
+        .filter(FeedItem.owner_id == user.id)
+    )
+    if cursor:
+        timeline = timeline.filter(
+            after_cursor(FeedItem.created_at, FeedItem.activity_id, cursor, descending=True)
+        )
+    items = (
+        timeline.order_by(FeedItem.created_at.desc(), FeedItem.activity_id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    followees = [str(f) for f in (user.following or [])] + [user.id]
+    pulled = db.query(Activity).filter(
+        Activity.actor_id.in_(followees), Activity.fanned_out.is_(False)
+    )
+    if cursor:
+        pulled = pulled.filter(after_cursor(Activity.created_at, Activity.id, cursor, descending=True))
+    items += (
+        pulled.order_by(Activity.created_at.desc(), Activity.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    items.sort(key=lambda a: (a.created_at, a.id), reverse=True)
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return items, next_cursor
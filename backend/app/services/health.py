@@ -0,0 +1,90 @@
+"""
+Readiness checks for the load balancer.
+
+`check_readiness` pings the database with a timeout, measures connection
+pool saturation and pings the cache backend. The result is memoized for
+HEALTH_READY_CACHE_SECONDS, and concurrent probes share one in-flight
+check, so probing never adds load to a struggling instance.
+
+The cache is reported but is not required: every cache operation already
+falls back to the database when the backend is unavailable.
+"""
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.database import read_engine, replicas
+from app.services import cache
+
+settings = get_settings()
+
+_cached_result: Optional[tuple[bool, dict]] = None
+_cached_until = 0.0
+_lock = asyncio.Lock()
+
+
+def _ping_database() -> None:
+    with read_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def _check_database() -> dict:
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(asyncio.to_thread(_ping_database), settings.HEALTH_DB_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": f"timed out after {settings.HEALTH_DB_TIMEOUT_SECONDS}s"}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+def _check_pool() -> dict:
+    # The read pool serves nearly all traffic; a busy SQLite writer is expected to queue
+    pool = read_engine.pool
+    if not hasattr(pool, "checkedout"):
+        # NullPool / StaticPool: nothing to saturate
+        return {"ok": True, "type": type(pool).__name__}
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = pool.checkedout()
+    saturation = checked_out / capacity if capacity else 0.0
+    return {
+        "ok": saturation < settings.HEALTH_POOL_SATURATION_THRESHOLD,
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(saturation, 3),
+    }
+
+
+async def _check_cache() -> dict:
+    try:
+        ok = await asyncio.wait_for(asyncio.to_thread(cache.backend.ping), settings.HEALTH_DB_TIMEOUT_SECONDS)
+    except Exception:
+        ok = False
+    return {"ok": ok, "backend": cache.backend.name}
+
+
+async def _run_checks() -> tuple[bool, dict]:
+    database, cache_status = await asyncio.gather(_check_database(), _check_cache())
+    checks = {"database": database, "pool": _check_pool(), "cache": cache_status}
+    if replicas.engines:
+        # Informational: ejected replicas are bypassed, reads fall back to the primary
+        checks["replicas"] = replicas.status()
+    ready = checks["database"]["ok"] and checks["pool"]["ok"]
+    return ready, checks
+
+
+async def check_readiness() -> tuple[bool, dict]:
+    """Return (ready, checks), reusing a result younger than HEALTH_READY_CACHE_SECONDS."""
+    global _cached_result, _cached_until
+    if _cached_result is not None and time.monotonic() < _cached_until:
+        return _cached_result
+    async with _lock:
+        # Another probe may have refreshed the result while we waited
+        if _cached_result is None or time.monotonic() >= _cached_until:
+            _cached_result = await _run_checks()
+            _cached_until = time.monotonic() + settings.HEALTH_READY_CACHE_SECONDS
+    return _cached_result
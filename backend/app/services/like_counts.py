@@ -0,0 +1,102 @@
+"""
+In-process cache of per-post like counts.
+
+Feed renders ask for the like counts of every visible post. Counts change
+far less often than they are read, so they are kept here for a short TTL
+and invalidated whenever a like is toggled.
+
+A reader that missed the cache takes a token from `begin_fill` before
+counting in the database and passes it to `set_many`. Counts for posts
+invalidated since then are not stored: they may predate the toggle, and
+would otherwise be served for a whole TTL.
+"""
+import threading
+import time
+from typing import Dict, Iterable, Tuple
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Fills that take longer than this are dropped, which bounds how long
+# invalidations must be remembered
+MAX_FILL_SECONDS = 30.0
+
+
+class LikeCountCache:
+    """Thread-safe TTL cache mapping post IDs to like counts."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 50_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[int, float]] = {}
+        self._invalidated: Dict[str, float] = {}  # post ID -> when it was last invalidated
+        self._lock = threading.Lock()
+
+    def get_many(self, post_ids: Iterable[str]) -> Tuple[Dict[str, int], list[str]]:
+        """Return (cached counts, IDs that missed or expired)."""
+        now = time.monotonic()
+        hits: Dict[str, int] = {}
+        misses: list[str] = []
+        with self._lock:
+            for post_id in post_ids:
+                entry = self._entries.get(post_id)
+                if entry is not None and entry[1] > now:
+                    hits[post_id] = entry[0]
+                else:
+                    misses.append(post_id)
+        return hits, misses
+
+    def begin_fill(self) -> float:
+        """Token to take before reading counts that will be passed to `set_many`."""
+        return time.monotonic()
+
+    def set_many(self, counts: Dict[str, int], fill_token: float) -> None:
+        """
+        Store counts read after `begin_fill`, including zeros so unliked
+        posts are cached too. Posts invalidated since the token are skipped.
+        """
+        now = time.monotonic()
+        if now - fill_token > MAX_FILL_SECONDS:
+            return
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            counts = {
+                post_id: count
+                for post_id, count in counts.items()
+                if self._invalidated.get(post_id, fill_token - 1) < fill_token
+            }
+            if len(self._entries) + len(counts) > self.max_entries:
+                self._evict_expired()
+            if len(self._entries) + len(counts) > self.max_entries:
+                self._entries.clear()
+            for post_id, count in counts.items():
+                self._entries[post_id] = (count, expires_at)
+
+    def invalidate(self, post_id: str) -> None:
+        """Drop a post's cached count after its likes change."""
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(post_id, None)
+            if len(self._invalidated) >= self.max_entries:
+                self._forget_invalidations(now)
+            self._invalidated[post_id] = now
+
+    def clear(self) -> None:
+        """Drop every cached count."""
+        with self._lock:
+            self._entries.clear()
+            self._invalidated.clear()
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for post_id in [k for k, (_, exp) in self._entries.items() if exp <= now]:
+            del self._entries[post_id]
+
+    def _forget_invalidations(self, now: float) -> None:
+        # Fills that started before these are dropped by age anyway
+        for post_id in [k for k, at in self._invalidated.items() if at < now - MAX_FILL_SECONDS]:
+            del self._invalidated[post_id]
+
+
+like_count_cache = LikeCountCache(ttl_seconds=settings.LIKE_COUNT_CACHE_TTL_SECONDS)
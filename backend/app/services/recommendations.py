@@ -0,0 +1,157 @@
+"""
+Book recommendation service.
+
+Reads precomputed neighbors: by shared readers (app.utils.recommend) or by
+content (app.services.content_similarity). Similar books are an index range
+read of either table. A user's recommendations sum the reader-based
+neighbor scores of their most recently shelved or well-reviewed books,
+leaving out books they already have.
+"""
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import get_settings
+from app.models.book import Book
+from app.models.recommendation import BookContentSimilarity, BookSimilarity
+from app.models.review import Review
+from app.models.shelf import Shelf, ShelfItem
+
+settings = get_settings()
+
+MAX_BECAUSE = 3  # Seed books listed per recommendation
+
+SOURCES = ("auto", "readers", "content")
+
+
+class ScoredBook:
+    """A book with its score, readable by `from_attributes` response schemas."""
+
+    def __init__(self, book: Book, score: float, because: Optional[list[str]] = None):
+        self.book = book
+        self.score = round(score, 4)
+        self.because = because or []
+
+    def __getattr__(self, name):
+        return getattr(self.book, name)
+
+
+def _load_books(db: Session, book_ids: list[str]) -> dict[str, Book]:
+    books = db.query(Book).options(selectinload(Book.price_options)).filter(Book.id.in_(book_ids))
+    return {book.id: book for book in books}
+
+
+def _reader_neighbors(db: Session, book_id: str, limit: int) -> list:
+    return db.execute(
+        select(BookSimilarity.similar_book_id, BookSimilarity.score)
+        .where(BookSimilarity.book_id == book_id)
+        .order_by(BookSimilarity.rank)
+        .limit(limit)
+    ).all()
+
+
+def _content_neighbors(db: Session, book_id: str, limit: int) -> list:
+    return db.execute(
+        select(BookContentSimilarity.similar_book_id, BookContentSimilarity.score)
+        .where(BookContentSimilarity.book_id == book_id)
+        .order_by(BookContentSimilarity.score.desc(), BookContentSimilarity.similar_book_id)
+        .limit(limit)
+    ).all()
+
+
+def similar_books(db: Session, book_id: str, limit: int, source: str = "auto") -> Optional[list[ScoredBook]]:
+    """
+    Best neighbors of a book, or None if the book does not exist.
+
+    `source` is 'readers', 'content', or 'auto': readers, falling back to
+    content for books nobody has shelved or rated yet.
+    """
+    rows = _reader_neighbors(db, book_id, limit) if source != "content" else []
+    if not rows and source != "readers":
+        rows = _content_neighbors(db, book_id, limit)
+    if not rows:
+        # Only look the book up when it has no neighbors
+        return None if db.get(Book, book_id) is None else []
+    books = _load_books(db, [row.similar_book_id for row in rows])
+    return [ScoredBook(books[other], score) for other, score in rows if other in books]
+
+
+def _user_book_ids(db: Session, user_id: str, book_ids: list[str]) -> set[str]:
+    """Which of `book_ids` the user has shelved or reviewed."""
+    shelved = db.scalars(
+        select(ShelfItem.book_id)
+        .join(Shelf, Shelf.id == ShelfItem.shelf_id)
+        .where(Shelf.user_id == user_id, ShelfItem.book_id.in_(book_ids))
+    )
+    reviewed = db.scalars(
+        select(Review.book_id).where(Review.user_id == user_id, Review.book_id.in_(book_ids))
+    )
+    return set(shelved) | set(reviewed)
+
+
+def seed_books(db: Session, user_id: str, limit: int) -> list[str]:
+    """The user's most recently shelved and well-reviewed books, newest first."""
+    shelved = db.execute(
+        select(ShelfItem.book_id, ShelfItem.added_at)
+        .join(Shelf, Shelf.id == ShelfItem.shelf_id)
+        .where(Shelf.user_id == user_id)
+        .order_by(ShelfItem.added_at.desc())
+        .limit(limit)
+    ).all()
+    reviewed = db.execute(
+        select(Review.book_id, Review.created_at)
+        .where(
+            Review.user_id == user_id,
+            Review.is_approved == 1,
+            Review.rating >= settings.RECOMMENDATIONS_MIN_RATING,
+        )
+        .order_by(Review.created_at.desc())
+        .limit(limit)
+    ).all()
+    recent = sorted(
+        shelved + reviewed,
+        key=lambda row: row[1].timestamp() if row[1] else 0.0,
+        reverse=True,
+    )
+    return list(dict.fromkeys(book_id for book_id, _ in recent))[:limit]
+
+
+def recommend_for_user(db: Session, user_id: str, limit: int) -> list[ScoredBook]:
+    """Books the user's recent books point to most strongly, best first."""
+    seeds = seed_books(db, user_id, settings.RECOMMENDATIONS_SEED_BOOKS)
+    if not seeds:
+        return []
+
+    scores = defaultdict(float)
+    sources = defaultdict(list)  # candidate -> [(score, seed)]
+    neighbors = db.execute(
+        select(BookSimilarity.book_id, BookSimilarity.similar_book_id, BookSimilarity.score)
+        .where(BookSimilarity.book_id.in_(seeds))
+    )
+    seed_set = set(seeds)
+    for seed, candidate, score in neighbors:
+        if candidate not in seed_set:
+            scores[candidate] += score
+            sources[candidate].append((score, seed))
+
+    if not scores:
+        return []
+    # At most SEED_BOOKS * TOP_K candidates; heavy readers already own many of them
+    owned = _user_book_ids(db, user_id, list(scores))
+    ranked = sorted(
+        (candidate for candidate in scores if candidate not in owned),
+        key=lambda candidate: (-scores[candidate], candidate),
+    )[:limit]
+
+    books = _load_books(db, ranked)
+    return [
+        ScoredBook(
+            books[candidate],
+            scores[candidate],
+            because=[seed for _, seed in sorted(sources[candidate], reverse=True)[:MAX_BECAUSE]],
+        )
+        for candidate in ranked
+        if candidate in books
+    ]
@@ -0,0 +1,179 @@
+"""
+Unified search across books, authors, users, groups and posts.
+
+Each kind is searched concurrently on a dedicated pool of
+SEARCH_MAX_WORKERS threads: matches, relevance and facet counts come from
+the in-memory index (app.services.suggest), then the best hits are loaded
+by primary key. Every kind gets SEARCH_ENTITY_TIMEOUT_SECONDS, including
+time spent queued for a thread. A kind that runs out of time is listed in
+`timed_out`; if its index search had finished, its hits and facets are
+still returned, without the loaded `item`. One that fails outright is left
+out and listed the same way.
+
+Threads cannot be interrupted, so a timed-out lookup that has not started
+is cancelled, and one that is running skips its database load if it has
+not begun it yet. A load already running finishes (bounded by the
+database's statement timeout) while holding one of the pool's threads,
+never the default executor's.
+"""
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.author import Author
+from app.models.book import Book
+from app.models.group import Group
+from app.models.post import Post
+from app.models.user import User
+from app.schemas.author import AuthorResponse
+from app.schemas.book import BookResponse
+from app.schemas.group import GroupResponse
+from app.schemas.post import PostResponse
+from app.services.suggest import KINDS, suggest_index
+
+settings = get_settings()
+
+MAX_FACET_VALUES = 10  # Values returned per facet, most frequent first
+
+_executor = ThreadPoolExecutor(max_workers=settings.SEARCH_MAX_WORKERS, thread_name_prefix="search")
+
+
+def _load_books(db: Session, ids: list[str]) -> dict[str, dict]:
+    books = db.query(Book).options(selectinload(Book.price_options)).filter(Book.id.in_(ids))
+    return {book.id: BookResponse.model_validate(book).model_dump(mode="json") for book in books}
+
+
+def _load_authors(db: Session, ids: list[str]) -> dict[str, dict]:
+    authors = db.query(Author).filter(Author.id.in_(ids))
+    return {author.id: AuthorResponse.model_validate(author).model_dump(mode="json") for author in authors}
+
+
+def _load_users(db: Session, ids: list[str]) -> dict[str, dict]:
+    # Public profile fields only
+    users = db.query(User.id, User.nickname, User.avatar_url, User.bio).filter(User.id.in_(ids))
+    return {str(user.id): {**user._mapping, "id": str(user.id)} for user in users}
+
+
+def _load_groups(db: Session, ids: list[str]) -> dict[str, dict]:
+    groups = db.query(Group).filter(Group.id.in_(ids))
+    return {
+        group.id: GroupResponse.model_validate(group).model_dump(
+            mode="json", exclude={"members", "pending_members"}
+        )
+        for group in groups
+    }
+
+
+def _load_posts(db: Session, ids: list[str]) -> dict[str, dict]:
+    posts = db.query(Post).filter(Post.id.in_(ids), Post.is_approved == 1)
+    return {post.id: PostResponse.model_validate(post).model_dump(mode="json", exclude={"content"}) for post in posts}
+
+
+LOADERS: dict[str, Callable[[Session, list[str]], dict[str, dict]]] = {
+    "book": _load_books,
+    "author": _load_authors,
+    "user": _load_users,
+    "group": _load_groups,
+    "post": _load_posts,
+}
+
+
+class KindResult:
+    """One kind's hits, filled in by its worker thread as it goes."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.hits: list[tuple[str, str, float]] = []
+        self.total: Optional[int] = None  # Set once the index search is done
+        self.facets = Counter()
+        self.capped = False
+        self.items: Optional[dict[str, dict]] = None
+        self.abandoned = False  # Set once the request stops waiting for it
+
+
+def _search_kind(result: KindResult, query: str, limit: int, filters: list[tuple[str, str]]) -> None:
+    hits, total, result.facets, result.capped = suggest_index.search(result.kind, query, limit, filters)
+    result.hits, result.total = hits, total
+    if not result.hits:
+        result.items = {}
+        return
+    if result.abandoned:
+        return
+    db = SessionLocal()
+    db.info["read_only"] = True
+    try:
+        result.items = LOADERS[result.kind](db, [item_id for item_id, _, _ in result.hits])
+    finally:
+        db.close()
+
+
+async def search_all(
+    query: str,
+    limit: int,
+    kinds: Optional[Iterable[str]] = None,
+    filters: Iterable[tuple[str, str]] = (),
+    timeout: float = None,
+) -> dict:
+    """Search every kind concurrently and merge the hits by relevance."""
+    kinds = [kind for kind in KINDS if not kinds or kind in kinds]
+    filters = list(filters)
+    timeout = timeout or settings.SEARCH_ENTITY_TIMEOUT_SECONDS
+    results = [KindResult(kind) for kind in kinds]
+    loop = asyncio.get_running_loop()
+    outcomes = await asyncio.gather(
+        *(
+            asyncio.wait_for(
+                loop.run_in_executor(_executor, _search_kind, result, query, limit, filters), timeout
+            )
+            for result in results
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        result.abandoned = True
+
+    hits, totals, facets, timed_out = [], {}, {}, []
+    approximate = False
+    for result, outcome in zip(results, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            timed_out.append(result.kind)
+        elif isinstance(outcome, Exception):
+            print(f"❌ Search failed for {result.kind}: {outcome}")
+            timed_out.append(result.kind)
+            continue
+        if result.total is None:
+            continue
+        items = result.items or {}
+        for item_id, label, relevance in result.hits:
+            # Rows deleted since they were indexed are dropped once loaded
+            if result.items is not None and item_id not in items:
+                continue
+            hits.append({
+                "type": result.kind,
+                "id": item_id,
+                "text": label,
+                "score": round(relevance, 4),
+                "item": items.get(item_id),
+            })
+        totals[result.kind] = result.total
+        approximate = approximate or result.capped
+        for (facet, value), count in result.facets.items():
+            facets.setdefault(facet, Counter())[value] += count
+
+    hits.sort(key=lambda hit: (-hit["score"], len(hit["text"])))
+    return {
+        "query": query,
+        "hits": hits[:limit],
+        "totals": totals,
+        "facets": {
+            facet: [{"value": value, "count": count} for value, count in counts.most_common(MAX_FACET_VALUES)]
+            for facet, counts in sorted(facets.items())
+        },
+        "timed_out": timed_out,
+        "approximate": approximate,
+    }
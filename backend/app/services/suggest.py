@@ -0,0 +1,414 @@
+"""
+In-memory prefix index for search-as-you-type suggestions and /search.
+
+Book titles, author names, user nicknames, group names and approved post
+titles are split into normalized (case- and accent-folded) tokens. Each
+token is kept as a `token<US>id` key in a sorted list per kind, so a prefix
+lookup is a binary search plus a short scan per kind, and never touches the
+database. The lists are chunked (see `SortedKeys`), so a write moves one
+chunk of keys rather than up to SEARCH_SUGGEST_MAX_ENTRIES of them while
+holding the lock lookups need. Items also carry their facet values (book genres and decade, post
+type, post and group tags), so /search counts facets without reading rows.
+
+The index is built in the background at startup and rebuilt every
+SEARCH_SUGGEST_REFRESH_SECONDS. Write handlers update it in between, but
+only in the process that handled the write; other workers catch up at
+their next rebuild. Memory is bounded by SEARCH_SUGGEST_MAX_ENTRIES keys:
+items that would go past it are left out and counted in `dropped`.
+"""
+import asyncio
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.author import Author
+from app.models.book import Book
+from app.models.group import Group
+from app.models.post import Post
+from app.models.user import User
+
+settings = get_settings()
+
+KINDS = ("book", "author", "user", "group", "post")
+SUGGEST_KINDS = ("book", "author", "user", "group")
+
+SEP = "\x1f"  # Sorts before every token character
+END = "\U0010ffff"  # Sorts after every token character
+MAX_TOKENS_PER_ITEM = 8
+MAX_TOKEN_LENGTH = 32
+MAX_SCAN = 250  # Keys examined per kind and lookup; a short prefix only sees its alphabetically first completions
+CHUNK_SIZE = 1_000  # Keys per SortedKeys chunk; chunks split at twice this
+READ_CHUNK_ROWS = 5_000
+
+_WORD = re.compile(r"[^\W_]+")
+
+# (facet, value) pairs of an item
+Facets = tuple[tuple[str, str], ...]
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    folded = text.casefold()
+    if not folded.isascii():
+        decomposed = unicodedata.normalize("NFKD", folded)
+        folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_WORD.findall(folded))
+
+
+def tokens(normalized: str) -> list[str]:
+    """The distinct tokens of a normalized label that get index keys."""
+    return list(dict.fromkeys(t[:MAX_TOKEN_LENGTH] for t in normalized.split()))[:MAX_TOKENS_PER_ITEM]
+
+
+def _key(token: str, item_id: str) -> str:
+    return f"{token}{SEP}{item_id}"
+
+
+def book_facets(genres: Optional[Iterable[str]], published_year: Optional[int]) -> Facets:
+    facets = [("genre", genre) for genre in dict.fromkeys(genres or [])]
+    if published_year:
+        facets.append(("decade", f"{published_year // 10 * 10}s"))
+    return tuple(facets)
+
+
+def post_facets(post_type: Optional[str], tags: Optional[Iterable[str]]) -> Facets:
+    facets = [("post_type", post_type)] if post_type else []
+    facets.extend(("tag", tag) for tag in dict.fromkeys(tags or []))
+    return tuple(facets)
+
+
+def group_facets(tags: Optional[Iterable[str]]) -> Facets:
+    return tuple(("tag", tag) for tag in dict.fromkeys(tags or []))
+
+
+def _exact_matches(words: list[str], label_words: list[str]) -> Optional[int]:
+    """How many words are whole label words, or None if one prefixes no label word."""
+    exact = 0
+    for word in words:
+        if word in label_words:
+            exact += 1
+        elif not any(w.startswith(word) for w in label_words):
+            return None
+    return exact
+
+
+class SortedKeys:
+    """
+    Sorted strings stored as a list of sorted chunks, each at most
+    2 * CHUNK_SIZE long. Inserts and deletes bisect to one chunk and shift
+    only that chunk, instead of the whole list as `insort` on a flat list
+    would. Not thread-safe; SuggestIndex guards it with its lock.
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        keys = sorted(keys)
+        self._chunks = [keys[i:i + CHUNK_SIZE] for i in range(0, len(keys), CHUNK_SIZE)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = len(keys)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for chunk in self._chunks for key in chunk)
+
+    def _locate(self, key: str) -> tuple[int, int]:
+        """(chunk, position) of the first key >= `key`; (len(chunks), 0) if none."""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._chunks):
+            return i, 0
+        return i, bisect_left(self._chunks[i], key)
+
+    def add(self, key: str) -> None:
+        if not self._chunks:
+            self._chunks.append([key])
+            self._maxes.append(key)
+            self._len += 1
+            return
+        i = min(bisect_left(self._maxes, key), len(self._chunks) - 1)
+        chunk = self._chunks[i]
+        insort(chunk, key)
+        self._maxes[i] = chunk[-1]
+        if len(chunk) > 2 * CHUNK_SIZE:
+            self._chunks[i:i + 1] = [chunk[:CHUNK_SIZE], chunk[CHUNK_SIZE:]]
+            self._maxes[i:i + 1] = [chunk[CHUNK_SIZE - 1], chunk[-1]]
+        self._len += 1
+
+    def discard(self, key: str) -> bool:
+        """Remove `key` if present; return whether it was."""
+        i, j = self._locate(key)
+        if i == len(self._chunks) or self._chunks[i][j] != key:
+            return False
+        chunk = self._chunks[i]
+        del chunk[j]
+        if chunk:
+            self._maxes[i] = chunk[-1]
+        else:
+            del self._chunks[i]
+            del self._maxes[i]
+        self._len -= 1
+        return True
+
+    def irange(self, start: str, stop: Optional[str] = None) -> Iterator[str]:
+        """Keys from `start` (inclusive) to `stop` (exclusive, default: the end), in order."""
+        i, j = self._locate(start)
+        while i < len(self._chunks):
+            chunk = self._chunks[i]
+            if stop is not None and self._maxes[i] >= stop:
+                yield from chunk[j:bisect_left(chunk, stop)]
+                return
+            yield from chunk[j:]
+            i, j = i + 1, 0
+
+    def count(self, start: str, stop: str) -> int:
+        """How many keys are >= `start` and < `stop`."""
+        i, j = self._locate(start)
+        k, l = self._locate(stop)
+        if i == k:
+            return l - j
+        return len(self._chunks[i]) - j + sum(len(chunk) for chunk in self._chunks[i + 1:k]) + l
+
+
+class SuggestIndex:
+    """Thread-safe sorted-key prefix index of (kind, id) -> label and facets."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.ready = False
+        self.dropped = 0
+        self._keys: dict[str, SortedKeys] = {kind: SortedKeys() for kind in KINDS}
+        self._size = 0
+        self._items: dict[tuple[str, str], tuple[str, str, Facets]] = {}  # -> (label, normalized, facets)
+        self._lock = threading.Lock()
+        self._pending: Optional[list] = None  # Writes made while a rebuild is running
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, kind: str, item_id: str, label: Optional[str], facets: Facets = ()) -> None:
+        """Add or replace an item; an empty label removes it."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((kind, item_id, label, facets))
+            self._put(kind, item_id, label, facets)
+
+    def remove(self, kind: str, item_id: str) -> None:
+        self.put(kind, item_id, None)
+
+    def _put(self, kind: str, item_id: str, label: Optional[str], facets: Facets) -> None:
+        keys = self._keys[kind]
+        old = self._items.pop((kind, item_id), None)
+        if old is not None:
+            for token in tokens(old[1]):
+                if keys.discard(_key(token, item_id)):
+                    self._size -= 1
+        normalized = normalize(label or "")
+        new_tokens = tokens(normalized)
+        if not new_tokens:
+            return
+        if self._size + len(new_tokens) > self.max_entries:
+            self.dropped += 1
+            return
+        self._items[kind, item_id] = (label, normalized, facets)
+        for token in new_tokens:
+            keys.add(_key(token, item_id))
+        self._size += len(new_tokens)
+
+    def rebuild(self, items: Iterable[tuple[str, str, str, Facets]]) -> None:
+        """Replace the contents with (kind, id, label, facets) items, keeping writes made meanwhile."""
+        with self._lock:
+            self._pending = []
+        try:
+            keys, entries, size, dropped = {kind: [] for kind in KINDS}, {}, 0, 0
+            for kind, item_id, label, facets in items:
+                normalized = normalize(label or "")
+                item_tokens = tokens(normalized)
+                if not item_tokens:
+                    continue
+                if size + len(item_tokens) > self.max_entries:
+                    dropped += 1
+                    continue
+                entries[kind, item_id] = (label, normalized, facets)
+                keys[kind].extend(_key(token, item_id) for token in item_tokens)
+                size += len(item_tokens)
+            keys = {kind: SortedKeys(kind_keys) for kind, kind_keys in keys.items()}
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._keys, self._items, self._size, self.dropped = keys, entries, size, dropped
+            for write in pending:
+                self._put(*write)
+            self.ready = True
+
+    def suggest(self, query: str, limit: int, kinds: Optional[set[str]] = None) -> list[dict]:
+        """
+        Best `limit` items whose tokens start with the query's last word and
+        match its earlier words. Labels starting with the whole query rank
+        first, then exact word matches, then shorter labels. Items of a kind
+        with the same label are suggested once.
+        """
+        normalized = normalize(query)
+        words = normalized.split()
+        if not words:
+            return []
+        prefix, earlier = words[-1][:MAX_TOKEN_LENGTH], words[:-1]
+        candidates = {}  # (kind, normalized label) -> (rank, item id)
+        with self._lock:
+            for kind in SUGGEST_KINDS:
+                if kinds and kind not in kinds:
+                    continue
+                for key in islice(self._keys[kind].irange(prefix), MAX_SCAN):
+                    if not key.startswith(prefix):
+                        break
+                    token, _, item_id = key.partition(SEP)
+                    label, label_normalized, _ = self._items[kind, item_id]
+                    if earlier:
+                        label_words = label_normalized.split()
+                        if not all(any(w.startswith(word) for w in label_words) for word in earlier):
+                            continue
+                    rank = (not label_normalized.startswith(normalized), token != prefix, len(label), label)
+                    seen = candidates.get((kind, label_normalized))
+                    if seen is None or rank < seen[0]:
+                        candidates[kind, label_normalized] = (rank, item_id)
+        best = heapq.nsmallest(limit, candidates.items(), key=lambda item: item[1])
+        return [{"type": kind, "id": item_id, "text": rank[3]} for (kind, _), (rank, item_id) in best]
+
+    def search(
+        self,
+        kind: str,
+        query: str,
+        limit: int,
+        filters: Iterable[tuple[str, str]] = (),
+        max_matches: int = None,
+    ) -> tuple[list[tuple[str, str, float]], int, Counter, bool]:
+        """
+        Items of `kind` matching every word of `query` as a token prefix.
+
+        Returns the best `limit` (id, label, relevance) hits, the number of
+        matches, facet counts over all matches, and whether matching stopped
+        at `max_matches` (so counts are lower bounds). Relevance is in 0-1:
+        mostly the share of query words matching whole label words, then how
+        much of the label the query covers, then whether the label starts
+        with the query. Only items carrying every (facet, value) in
+        `filters` match.
+        """
+        max_matches = max_matches or settings.SEARCH_MAX_MATCHES
+        normalized = normalize(query)
+        words = list(dict.fromkeys(w[:MAX_TOKEN_LENGTH] for w in normalized.split()))
+        filters = set(filters)
+        hits, matched_facets, capped = [], [], False
+        if not words:
+            return hits, 0, Counter(), capped
+        with self._lock:
+            keys = self._keys[kind]
+            # Drive the scan from the word with the fewest keys. An item's
+            # exact token sorts before its longer ones, so the first key seen
+            # for an item tells whether that word matches it exactly
+            counts = [keys.count(word, word + END) for word in words]
+            driver = min(range(len(words)), key=counts.__getitem__)
+            others = words[:driver] + words[driver + 1:]
+            capped = counts[driver] > max_matches
+            seen = set()
+            for key in islice(keys.irange(words[driver], words[driver] + END), max_matches):
+                token, _, item_id = key.partition(SEP)
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                label, label_normalized, item_facets = self._items[kind, item_id]
+                if filters and not filters.issubset(item_facets):
+                    continue
+                if others:
+                    label_words = label_normalized.split()
+                    exact = _exact_matches(others, label_words)
+                    if exact is None:
+                        continue
+                    size = len(label_words)
+                else:
+                    exact, size = 0, label_normalized.count(" ") + 1
+                exact += token == words[driver]
+                relevance = (
+                    0.6 * (exact + 0.7 * (len(words) - exact)) / len(words)
+                    + 0.3 * min(1.0, len(words) / size)
+                    + 0.1 * label_normalized.startswith(normalized)
+                )
+                hits.append((item_id, label, relevance))
+                matched_facets.extend(item_facets)
+        facets = Counter(matched_facets)
+        total = len(hits)
+        best = heapq.nlargest(limit, hits, key=lambda hit: (hit[2], -len(hit[1])))
+        return best, total, facets, capped
+
+
+suggest_index = SuggestIndex(settings.SEARCH_SUGGEST_MAX_ENTRIES)
+
+
+def index_user(user: User) -> None:
+    """Index an active user's nickname, or drop the user."""
+    suggest_index.put("user", user.id, user.nickname if user.is_active else None)
+
+
+def index_post(post: Post) -> None:
+    """Index an approved post's title, or drop the post."""
+    suggest_index.put(
+        "post", post.id, post.title if post.is_approved == 1 else None, post_facets(post.type, post.tags)
+    )
+
+
+def _load_items(db: Session):
+    queries = [
+        ("book", select(Book.id, Book.title, Book.genres, Book.published_year), book_facets),
+        ("author", select(Author.id, Author.name), None),
+        ("user", select(User.id, User.nickname).where(User.is_active == True, User.nickname.is_not(None)), None),
+        ("group", select(Group.id, Group.name, Group.tags), group_facets),
+        ("post", select(Post.id, Post.title, Post.type, Post.tags).where(Post.is_approved == 1), post_facets),
+    ]
+    for kind, query, facets in queries:
+        for item_id, label, *fields in db.execute(query.execution_options(yield_per=READ_CHUNK_ROWS)):
+            yield kind, item_id, label, facets(*fields) if facets else ()
+
+
+def rebuild_suggest_index() -> None:
+    """Rebuild the index from the database."""
+    db = SessionLocal()
+    db.info["read_only"] = True
+    try:
+        suggest_index.rebuild(_load_items(db))
+        if suggest_index.dropped:
+            print(f"⚠️ Suggest index full: {suggest_index.dropped} items left out")
+    except Exception as e:
+        print(f"❌ Failed to build the suggest index: {e}")
+    finally:
+        db.close()
+
+
+_refresher: Optional[asyncio.Task] = None
+
+
+async def _run_refresher(interval: float) -> None:
+    while True:
+        await asyncio.to_thread(rebuild_suggest_index)
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+
+def start_suggest_index(interval: float = None) -> None:
+    """Build the index in the background and refresh it periodically (idempotent; 0 builds once)."""
+    global _refresher
+    if _refresher is not None and not _refresher.done():
+        return
+    interval = interval if interval is not None else settings.SEARCH_SUGGEST_REFRESH_SECONDS
+    _refresher = asyncio.get_running_loop().create_task(_run_refresher(interval))
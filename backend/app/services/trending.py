@@ -0,0 +1,242 @@
+"""
+Trending books and posts.
+
+Reviews, shelf adds and likes add a weight to the item's score, and scores
+decay exponentially with a half-life of TRENDING_HALF_LIFE_HOURS. Decay is
+applied forward: an event at time t adds w * 2^((t - L) / half-life), where
+L is the landmark time. All scores then shrink by the same factor as time
+passes, so the stored values rank items correctly without ever being
+rewritten, a write is one atomic `score = score + x` upsert, and the top N
+is an index range read.
+
+The stored values grow as events move away from L. `compact` rebases them
+to a new landmark, drops items that have decayed below TRENDING_MIN_SCORE
+and keeps the TRENDING_MAX_ITEMS best of each kind. It runs in-process every
+TRENDING_COMPACT_INTERVAL_SECONDS (see `start_compactor`) and from
+app.utils.trending. The landmark is the `updated_at` of the 'trending' row
+in resource_versions, which each compaction bumps.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import get_settings
+from app.database import SessionLocal, engine
+from app.models.book import Book
+from app.models.post import Post
+from app.models.resource_version import ResourceVersion
+from app.models.trending import TrendingScore
+from app.services.cache import invalidate_tags
+from app.services.recommendations import ScoredBook
+from app.services.versions import bump_version
+
+settings = get_settings()
+
+LANDMARK = "trending"  # resource_versions row whose updated_at is the landmark
+
+BOOK = "book"
+POST = "post"
+
+REVIEW_WEIGHT = 3.0
+SHELF_WEIGHT = 2.0
+LIKE_WEIGHT = 1.0
+
+# Rows read per requested item, so items deleted since the last compaction
+# do not leave the list short
+OVERFETCH = 2
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes; everything is stored in UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def growth(elapsed: timedelta) -> float:
+    """How much an event's weight has grown after `elapsed` (2^(elapsed / half-life))."""
+    return 2 ** (elapsed.total_seconds() / (settings.TRENDING_HALF_LIFE_HOURS * 3600))
+
+
+def landmark(db: Session, for_update: bool = False, read: bool = False) -> Optional[datetime]:
+    """
+    The time stored scores are relative to, or None before the first write.
+    
+    `for_update` locks the row until commit: exclusively (FOR UPDATE) for
+    `compact`, which moves it, or shared (FOR SHARE) with `read=True` for
+    score writers, which run concurrently with each other but cannot
+    interleave with a compaction.
+    """
+    query = select(ResourceVersion.updated_at).where(ResourceVersion.name == LANDMARK)
+    if for_update:
+        query = query.with_for_update(read=read)
+    value = db.scalar(query)
+    return _utc(value) if value else None
+
+
+def _add_score():
+    """Upsert adding to an item's score, or None when the dialect has no upsert."""
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    stmt = dialect_insert(TrendingScore)
+    return stmt.on_conflict_do_update(
+        index_elements=["kind", "item_id"],
+        set_={"score": TrendingScore.score + stmt.excluded.score},
+    )
+
+
+def bump_trending(
+    db: Session, kind: str, item_id: str, weight: float, at: Optional[datetime] = None
+) -> None:
+    """
+    Add an event's weight to an item's trending score.
+
+    `at` is when the event happened (default now). To take an event back
+    (e.g. an unlike), pass a negative weight and the original event's time,
+    which subtracts exactly what it added. Taking back an event never
+    creates a score for an item that has none.
+
+    Called after the triggering write has committed. Like feed delivery this
+    is best effort: failures are logged and rolled back.
+    """
+    try:
+        at = _utc(at) if at else datetime.now(timezone.utc)
+        # Landmark read and score write share one transaction (see `landmark`)
+        base = landmark(db, for_update=True, read=True)
+        if base is None:
+            bump_version(db, LANDMARK)
+            base = datetime.now(timezone.utc)
+        row = {"kind": kind, "item_id": item_id, "score": weight * growth(at - base)}
+        add = (
+            update(TrendingScore)
+            .where(TrendingScore.kind == kind, TrendingScore.item_id == item_id)
+            .values(score=TrendingScore.score + row["score"])
+        )
+        upsert = _add_score()
+        if weight < 0:
+            db.execute(add)
+        elif upsert is not None:
+            db.execute(upsert, row)
+        elif not db.execute(add).rowcount:
+            db.execute(insert(TrendingScore), row)
+        db.commit()
+    except Exception as e:
+        print(f"❌ Failed to record trending {kind} {item_id}: {e}")
+        db.rollback()
+
+
+def top(db: Session, kind: str, limit: int) -> list[tuple[str, float]]:
+    """The `limit` highest (item id, current score) pairs of a kind."""
+    rows = db.execute(
+        select(TrendingScore.item_id, TrendingScore.score)
+        .where(TrendingScore.kind == kind)
+        .order_by(TrendingScore.score.desc())
+        .limit(limit)
+    ).all()
+    if not rows:
+        return []
+    decay = 1 / growth(datetime.now(timezone.utc) - landmark(db))
+    return [(item_id, score * decay) for item_id, score in rows]
+
+
+def trending_books(db: Session, limit: int) -> list[ScoredBook]:
+    """Books with the most recent reviews and shelf adds, hottest first."""
+    ranked = top(db, BOOK, limit * OVERFETCH)
+    books = db.query(Book).options(selectinload(Book.price_options)).filter(
+        Book.id.in_([book_id for book_id, _ in ranked])
+    )
+    books = {book.id: book for book in books}
+    return [ScoredBook(books[book_id], score) for book_id, score in ranked if book_id in books][:limit]
+
+
+def trending_posts(db: Session, limit: int, columns) -> list[dict]:
+    """Approved posts with the most recent likes, hottest first, as `columns` plus score."""
+    ranked = top(db, POST, limit * OVERFETCH)
+    posts = db.query(*columns).filter(
+        Post.id.in_([post_id for post_id, _ in ranked]),
+        Post.is_approved == 1,
+    )
+    posts = {post.id: post for post in posts}
+    return [
+        {**posts[post_id]._mapping, "score": round(score, 4)}
+        for post_id, score in ranked
+        if post_id in posts
+    ][:limit]
+
+
+def _trim(db: Session) -> None:
+    ranked = (
+        select(
+            TrendingScore.kind,
+            TrendingScore.item_id,
+            func.row_number().over(
+                partition_by=TrendingScore.kind,
+                order_by=TrendingScore.score.desc(),
+            ).label("rn"),
+        )
+        .subquery()
+    )
+    db.execute(
+        delete(TrendingScore).where(
+            tuple_(TrendingScore.kind, TrendingScore.item_id).in_(
+                select(ranked.c.kind, ranked.c.item_id).where(ranked.c.rn > settings.TRENDING_MAX_ITEMS)
+            )
+        )
+    )
+
+
+def compact(db: Session) -> None:
+    """Rebase scores to now and drop decayed, deleted and excess items, in one transaction."""
+    base = landmark(db, for_update=True)
+    if base is not None:
+        decay = 1 / growth(datetime.now(timezone.utc) - base)
+        db.execute(update(TrendingScore).values(score=TrendingScore.score * decay))
+    db.execute(delete(TrendingScore).where(TrendingScore.score < settings.TRENDING_MIN_SCORE))
+    db.execute(delete(TrendingScore).where(
+        TrendingScore.kind == BOOK,
+        TrendingScore.item_id.not_in(select(Book.id)),
+    ))
+    db.execute(delete(TrendingScore).where(
+        TrendingScore.kind == POST,
+        TrendingScore.item_id.not_in(select(Post.id).where(Post.is_approved == 1)),
+    ))
+    _trim(db)
+    bump_version(db, LANDMARK)
+    db.commit()
+    invalidate_tags("trending")
+
+
+def _compact_once() -> None:
+    db = SessionLocal()
+    try:
+        compact(db)
+    except Exception as e:
+        print(f"❌ Trending compaction failed: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+_compactor: Optional[asyncio.Task] = None
+
+
+async def _run_compactor(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(_compact_once)
+
+
+def start_compactor(interval: float = None) -> None:
+    """Compact trending scores periodically on the running loop (idempotent; 0 disables)."""
+    global _compactor
+    if _compactor is not None and not _compactor.done():
+        return
+    interval = interval if interval is not None else settings.TRENDING_COMPACT_INTERVAL_SECONDS
+    if interval > 0:
+        _compactor = asyncio.get_running_loop().create_task(_run_compactor(interval))
@@ -0,0 +1,84 @@
+"""
+Resource versioning for conditional GETs.
+
+Rows carry a `version` counter and collections have a row in
+`resource_versions`. Write handlers bump both; read endpoints declare how to
+look up their version with `@versioned(...)` so `ConditionalGetMiddleware`
+can answer If-None-Match without running the endpoint. The middleware
+publishes the version it found through `resolved_version`, which the
+response cache adds to its keys so a cached body is only ever served under
+the ETag of the version it was built from.
+"""
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.resource_version import ResourceVersion
+
+# (version tag, last modified) or None when the resource does not exist
+VersionInfo = Optional[Tuple[str, Optional[datetime]]]
+VersionLookup = Callable[[Session, dict], VersionInfo]
+
+# Version tag of the current request's resource, set by ConditionalGetMiddleware
+resolved_version: ContextVar[Optional[str]] = ContextVar("resolved_version", default=None)
+
+
+def bump_version(db: Session, *names: str) -> None:
+    """Increment collection versions inside the caller's transaction."""
+    now = datetime.now(timezone.utc)
+    for name in names:
+        updated = db.query(ResourceVersion).filter(ResourceVersion.name == name).update(
+            {"version": ResourceVersion.version + 1, "updated_at": now},
+            synchronize_session=False,
+        )
+        if not updated:
+            db.add(ResourceVersion(name=name, version=1, updated_at=now))
+
+
+def touch(obj) -> None:
+    """Increment a row's version counter before committing a change to it."""
+    obj.version = (obj.version or 0) + 1
+
+
+def row_version(model, path_param: str) -> VersionLookup:
+    """Version lookup reading a single row's `version` and `updated_at`."""
+    def lookup(db: Session, path_params: dict) -> VersionInfo:
+        row = db.query(model.version, model.updated_at).filter(
+            model.id == path_params[path_param]
+        ).first()
+        if row is None:
+            return None
+        return str(row.version), row.updated_at
+    return lookup
+
+
+def collection_version(name: str) -> VersionLookup:
+    """Version lookup reading a collection's counter."""
+    def lookup(db: Session, path_params: dict) -> VersionInfo:
+        row = db.query(ResourceVersion.version, ResourceVersion.updated_at).filter(
+            ResourceVersion.name == name
+        ).first()
+        if row is None:
+            return "0", None
+        return str(row.version), row.updated_at
+    return lookup
+
+
+def collection_versions(*names: str) -> VersionLookup:
+    """Version lookup for responses built from several collections."""
+    lookups = [collection_version(name) for name in names]
+    def lookup(db: Session, path_params: dict) -> VersionInfo:
+        infos = [collection_lookup(db, path_params) for collection_lookup in lookups]
+        modified = [last_modified for _, last_modified in infos if last_modified is not None]
+        return ".".join(tag for tag, _ in infos), max(modified, default=None)
+    return lookup
+
+
+def versioned(lookup: VersionLookup):
+    """Mark an endpoint as supporting conditional GETs via `lookup`."""
+    def decorator(func):
+        func.resource_version = lookup
+        return func
+    return decorator
@@ -0,0 +1,441 @@
+"""
+Bulk loading helpers shared by the seed and import scripts.
+
+- `iter_records` streams objects from a JSON array, one array inside a
+  top-level JSON object, or NDJSON, without loading the whole file.
+- `bulk_upsert` loads rows in batches: one ID lookup per batch, then
+  multi-row `INSERT ... ON CONFLICT` statements.
+- `copy_table` streams rows into PostgreSQL with `COPY ... FROM STDIN`.
+- `bulk_load` picks the fastest of the two for the database, and
+  `run_stages` loads several tables in foreign-key order, in parallel
+  where the database allows it.
+"""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import chain, islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import JSON, insert, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine, read_engine
+from app.models.user import UUIDArray
+from app.services import cache
+from app.services.versions import bump_version
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_WORKERS = 4
+_READ_SIZE = 64 * 1024
+_WHITESPACE = " \t\r\n"
+
+
+class _JSONStream:
+    """Incremental reader of JSON values from a text file."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(_READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop the consumed prefix so memory stays bounded by the largest value
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of JSON input")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and not isinstance(value, (dict, list, str)):
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+    def array_items(self) -> Iterator:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def iter_records(path, key: Optional[str] = None) -> Iterator[dict]:
+    """
+    Stream records from `path`.
+
+    `.ndjson` / `.jsonl` files hold one object per line. Other files hold a
+    JSON array, or a JSON object whose `key` member is the array (e.g.
+    `data.json` with "books" and "authors").
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix in (".ndjson", ".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        stream = _JSONStream(f)
+        if stream.peek() == "[":
+            yield from stream.array_items()
+            return
+
+        stream.expect("{")
+        while stream.peek() != "}":
+            name = stream.value()
+            stream.expect(":")
+            if stream.peek() == "[":
+                items = stream.array_items()
+                if name == key:
+                    yield from items
+                    return
+                for _ in items:  # Skip other arrays one element at a time
+                    pass
+            else:
+                stream.value()
+            if stream.peek() == ",":
+                stream.pos += 1
+        if key is not None:
+            raise KeyError(f"{path} has no top-level '{key}' array")
+
+
+def chunked(rows: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of up to `size` items."""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _insert(model, update: bool, columns: Iterable[str]):
+    """
+    INSERT that ignores (or overwrites) rows whose id already exists.
+
+    Executed with a list of rows, SQLAlchemy sends it as multi-row
+    `INSERT ... VALUES (...), (...)` batches ("insertmanyvalues") from one
+    cached compiled statement, instead of compiling a new `.values([...])`
+    statement for every batch.
+    """
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(model)
+
+    stmt = dialect_insert(model)
+    if update:
+        return stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_={name: stmt.excluded[name] for name in columns if name != "id"},
+        )
+    return stmt.on_conflict_do_nothing(index_elements=["id"])
+
+
+class LoadStats:
+    """Row counts and timing for one bulk load."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def rows(self) -> int:
+        return self.inserted + self.updated + self.skipped
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def finish(self) -> "LoadStats":
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.inserted} inserted, {self.updated} updated, {self.skipped} skipped "
+            f"in {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s)"
+        )
+
+
+def bulk_upsert(
+    db: Session,
+    model,
+    rows: Iterable[dict],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    update: bool = False,
+    name: str = None,
+) -> LoadStats:
+    """
+    Insert `rows` (dicts of column values, all with the same keys) in batches.
+
+    Each batch costs one `SELECT id ... WHERE id IN (...)` and at most one
+    INSERT. Existing ids are skipped, or overwritten when `update` is set.
+    Every batch is committed, so a large load keeps memory flat and can be
+    re-run after a failure.
+    """
+    stats = LoadStats(name or model.__tablename__)
+    for batch in chunked(rows, batch_size):
+        ids = [row["id"] for row in batch]
+        existing = set(db.execute(select(model.id).where(model.id.in_(ids))).scalars())
+        if update:
+            to_write = batch
+            stats.updated += len(existing)
+            stats.inserted += len(batch) - len(existing)
+        else:
+            to_write = [row for row in batch if row["id"] not in existing]
+            stats.skipped += len(batch) - len(to_write)
+            stats.inserted += len(to_write)
+        if to_write:
+            db.execute(_insert(model, update, to_write[0].keys()), to_write)
+        db.commit()
+    return stats.finish()
+
+
+def _copy_field(value, column) -> str:
+    """Format one value for COPY ... WITH (FORMAT csv); unquoted empty means NULL."""
+    if value is None:
+        return ""
+    if isinstance(column.type, (ARRAY, UUIDArray)):
+        items = ('"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"' for item in value)
+        value = "{" + ",".join(items) + "}"
+    elif isinstance(column.type, JSON):
+        value = json.dumps(value)
+    elif isinstance(value, bool):
+        return "t" if value else "f"
+    elif isinstance(value, (int, float)):
+        return repr(value)
+    elif isinstance(value, datetime):
+        return value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class _CopyStream:
+    """File-like reader over COPY lines, for psycopg2's copy_expert."""
+
+    def __init__(self, lines: Iterator[str]):
+        self.lines = lines
+        self.buf = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self.buf) < size:
+            line = next(self.lines, None)
+            if line is None:
+                break
+            self.buf += line
+        if size < 0:
+            data, self.buf = self.buf, ""
+        else:
+            data, self.buf = self.buf[:size], self.buf[size:]
+        return data
+
+
+def copy_table(model, columns: list[str], rows: Iterator[dict], update: bool = False) -> LoadStats:
+    """
+    Load `rows` into a Postgres table with COPY.
+
+    Rows are copied into a temporary staging table, then merged with
+    `INSERT ... SELECT ... ON CONFLICT (id)` so existing rows are skipped
+    (or overwritten with `update`) exactly as bulk_upsert does.
+    """
+    table = model.__tablename__
+    stats = LoadStats(table)
+    quote = engine.dialect.identifier_preparer.quote
+    stage = quote(f"_import_{table}")
+    column_list = ", ".join(quote(name) for name in columns)
+    table_columns = [model.__table__.columns[name] for name in columns]
+    staged = 0
+
+    def lines():
+        nonlocal staged
+        for row in rows:
+            staged += 1
+            yield ",".join(_copy_field(row[column.name], column) for column in table_columns) + "\n"
+
+    if update:
+        conflict = "DO UPDATE SET " + ", ".join(
+            f"{quote(name)} = EXCLUDED.{quote(name)}" for name in columns if name != "id"
+        )
+    else:
+        conflict = "DO NOTHING"
+
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"CREATE TEMP TABLE {stage} (LIKE {quote(table)} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        copy_sql = f"COPY {stage} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+        if hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(copy_sql) as copy:
+                for line in lines():
+                    copy.write(line)
+        else:  # psycopg2
+            cursor.copy_expert(copy_sql, _CopyStream(lines()))
+        # DISTINCT ON keeps one row per id; ON CONFLICT cannot touch a row twice.
+        # xmax = 0 only for freshly inserted rows, which separates inserts from updates.
+        cursor.execute(
+            f"WITH merged AS ("
+            f"INSERT INTO {quote(table)} ({column_list}) "
+            f"SELECT DISTINCT ON (id) {column_list} FROM {stage} ORDER BY id "
+            f"ON CONFLICT (id) {conflict} RETURNING (xmax = 0) AS inserted"
+            f") SELECT count(*) FILTER (WHERE inserted), count(*) FROM merged"
+        )
+        inserted, written = cursor.fetchone()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    stats.inserted = inserted
+    stats.updated = written - inserted
+    stats.skipped = staged - written
+    return stats.finish()
+
+
+def bulk_load(
+    model,
+    rows: Iterable[dict],
+    columns: Optional[list[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    update: bool = False,
+) -> LoadStats:
+    """
+    Load `rows` with the fastest path for the database: COPY on PostgreSQL,
+    bulk_upsert (batched executemany) elsewhere. `columns` defaults to the
+    keys of the first row.
+    """
+    rows = iter(rows)
+    if engine.dialect.name == "postgresql":
+        if columns is None:
+            first = next(rows, None)
+            if first is None:
+                return LoadStats(model.__tablename__).finish()
+            columns, rows = list(first), chain([first], rows)
+        return copy_table(model, columns, rows, update=update)
+
+    db = SessionLocal()
+    try:
+        return bulk_upsert(db, model, rows, batch_size=batch_size, update=update)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def load_order(models: Iterable) -> list[list]:
+    """
+    Group models into stages so each table's foreign-key parents load first.
+
+    Only parents that are being loaded count; others must already exist.
+    Self-references (e.g. comment replies) are left to row order.
+    """
+    by_table = {model.__tablename__: model for model in models}
+    pending = {
+        name: {
+            fk.column.table.name
+            for fk in model.__table__.foreign_keys
+            if fk.column.table.name != name
+        }
+        for name, model in by_table.items()
+    }
+    for deps in pending.values():
+        deps.intersection_update(pending)
+
+    stages, loaded = [], set()
+    while pending:
+        stage = sorted(name for name, deps in pending.items() if deps <= loaded)
+        if not stage:
+            raise ValueError(f"Circular foreign keys between {', '.join(sorted(pending))}")
+        stages.append([by_table[name] for name in stage])
+        loaded.update(stage)
+        for name in stage:
+            del pending[name]
+    return stages
+
+
+def run_stages(jobs: dict, workers: int = DEFAULT_WORKERS) -> list[LoadStats]:
+    """
+    Run `jobs` (model -> callable returning LoadStats) in foreign-key order.
+
+    Jobs in the same stage run in parallel threads, one connection each.
+    """
+    if engine.dialect.name == "sqlite" and engine is read_engine:
+        # Without SQLITE_SINGLE_WRITER, parallel writers would fail with
+        # "database is locked" instead of queueing for the write lock
+        workers = 1
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        for stage in load_order(jobs):
+            futures = [pool.submit(jobs[model]) for model in stage]
+            # Wait for the whole stage (and surface the first error) before its children load
+            for future in futures:
+                stats = future.result()
+                print(f"   ✅ {stats}")
+                results.append(stats)
+    return results
+
+
+def invalidate_after_load() -> None:
+    """Bump collection versions and clear the response cache after a bulk load."""
+    db = SessionLocal()
+    try:
+        bump_version(db, "books", "authors", "posts")
+        db.commit()
+    finally:
+        db.close()
+    try:
+        cache.backend.clear()
+    except Exception as e:
+        print(f"⚠️ Cache clear failed: {e}")
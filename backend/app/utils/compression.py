@@ -0,0 +1,128 @@
+"""
+Content-encoding helpers shared by the compression middleware and the cache.
+
+gzip is always available. Brotli and Zstandard are used when the optional
+`brotli` / `zstandard` packages are installed.
+"""
+import zlib
+from contextvars import ContextVar
+from typing import Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+# Encoding negotiated for the current request, set by CompressionMiddleware
+negotiated_encoding: ContextVar[Optional[str]] = ContextVar("negotiated_encoding", default=None)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+# Suffixes appended to strong ETags of encoded representations
+ETAG_SUFFIXES = ("-gzip", "-br", "-zstd")
+
+
+def available_encodings() -> list[str]:
+    """Encodings this server can produce, in order of preference."""
+    installed = {"gzip"}
+    if brotli is not None:
+        installed.add("br")
+    if zstandard is not None:
+        installed.add("zstd")
+    return [e for e in settings.COMPRESSION_PREFERENCE if e in installed]
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred encoding the client accepts, or None for identity."""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    for encoding in available_encodings():
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    """Whether a response of this media type is worth compressing."""
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a complete body in one shot."""
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(data)
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+class StreamingCompressor:
+    """Incremental compressor; each `compress` call returns flushed output."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        elif encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+        else:
+            self._obj = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it immediately."""
+        if self.encoding == "br":
+            return self._obj.process(chunk) + self._obj.flush()
+        if self.encoding == "zstd":
+            return self._obj.compress(chunk) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self._obj.compress(chunk) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, chunk: bytes = b"") -> bytes:
+        """Compress the last chunk and end the stream."""
+        if self.encoding == "br":
+            return self._obj.process(chunk) + self._obj.finish()
+        return self._obj.compress(chunk) + self._obj.flush()
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Derive the strong ETag of an encoded representation: "abc" -> "abc-gzip"."""
+    if etag.endswith('"') and not etag[:-1].endswith(ETAG_SUFFIXES):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+def strip_etag_encoding(etag: str) -> str:
+    """Map an encoded representation's ETag back to the identity ETag."""
+    for suffix in ETAG_SUFFIXES:
+        if etag.endswith(f'{suffix}"'):
+            return etag[: -len(suffix) - 1] + '"'
+    return etag
@@ -0,0 +1,208 @@
+"""
+Offline job rebuilding content-based "similar books" for the whole catalog.
+
+Two streaming passes over `books`: the first counts document frequencies,
+the second builds each book's TF-IDF vector (see
+app.services.content_similarity) into an in-memory inverted index. Each
+term keeps only its CONTENT_MAX_POSTINGS highest-weight books, so finding a
+book's candidates touches at most CONTENT_MAX_TERMS * CONTENT_MAX_POSTINGS
+postings however large the catalog is.
+
+Neighbors are then scored in blocks of books and written block by block.
+Memory is the index (about CONTENT_MAX_TERMS postings per book) plus one
+block of results. The vocabulary, vectors and neighbors replace the old ones
+in one transaction.
+
+Run after bulk loads (seed, import_csv, synth); books created or edited
+through the API are indexed as they change.
+
+Usage:
+    python -m app.utils.content_index
+    python -m app.utils.content_index --max-terms 16 --block-size 5000
+"""
+import argparse
+import heapq
+import time
+from array import array
+from collections import Counter
+from operator import itemgetter
+from pathlib import Path
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import delete, insert, select
+
+from app.config import get_settings
+from app.database import SessionLocal, init_db
+from app.models.book import Book
+from app.models.recommendation import BookContentSimilarity, BookTerm, ContentTerm
+from app.services.cache import invalidate_tags
+from app.services.content_similarity import idf, term_frequencies, tfidf_vector
+from app.services.versions import bump_version
+from app.utils.bulk import DEFAULT_BATCH_SIZE, chunked
+
+settings = get_settings()
+
+READ_CHUNK_ROWS = 5_000
+DEFAULT_BLOCK_SIZE = 2_000
+
+
+def iter_books():
+    """Yield (id, term frequencies) for every book, streaming."""
+    db = SessionLocal()
+    db.info["read_only"] = True
+    try:
+        rows = db.execute(
+            select(Book.id, Book.description, Book.genres, Book.author, Book.publisher)
+            .order_by(Book.id)
+            .execution_options(yield_per=READ_CHUNK_ROWS)
+        )
+        for book_id, description, genres, author, publisher in rows:
+            yield book_id, term_frequencies(description, genres, author, publisher)
+    finally:
+        db.close()
+
+
+class ContentIndex:
+    """Vocabulary, per-book vectors and truncated postings, as compact arrays."""
+
+    def __init__(self, idfs: dict[str, float], max_terms: int, max_postings: int):
+        self.idfs = idfs
+        self.term_ids = {term: index for index, term in enumerate(idfs)}
+        self.terms = list(idfs)
+        self.book_ids: list[str] = []
+        self.vector_terms: list[array] = []
+        self.vector_weights: list[array] = []
+        self.max_terms = max_terms
+        self.max_postings = max_postings
+        self._postings: list[list] = [[] for _ in self.terms]  # (weight, book) while building
+
+    def add(self, book_id: str, frequencies: dict[str, float]) -> None:
+        book = len(self.book_ids)
+        vector = tfidf_vector(frequencies, self.idfs, self.max_terms)
+        self.book_ids.append(book_id)
+        self.vector_terms.append(array("I", (self.term_ids[term] for term, _ in vector)))
+        self.vector_weights.append(array("f", (weight for _, weight in vector)))
+        for term, weight in vector:
+            postings = self._postings[self.term_ids[term]]
+            # Min-heap of the term's heaviest postings so far
+            if len(postings) < self.max_postings:
+                heapq.heappush(postings, (weight, book))
+            elif weight > postings[0][0]:
+                heapq.heapreplace(postings, (weight, book))
+
+    def finish(self) -> None:
+        """Freeze the postings into (books, weights) arrays."""
+        self.posting_books = [array("I", (book for _, book in postings)) for postings in self._postings]
+        self.posting_weights = [array("f", (weight for weight, _ in postings)) for postings in self._postings]
+        del self._postings
+
+    def neighbors(self, book: int, top_k: int) -> list[tuple[int, float]]:
+        scores = {}
+        for term, weight in zip(self.vector_terms[book], self.vector_weights[book]):
+            for other, other_weight in zip(self.posting_books[term], self.posting_weights[term]):
+                scores[other] = scores.get(other, 0.0) + weight * other_weight
+        scores.pop(book, None)
+        return heapq.nlargest(top_k, scores.items(), key=itemgetter(1))
+
+    def term_rows(self):
+        for book, book_id in enumerate(self.book_ids):
+            for term, weight in zip(self.vector_terms[book], self.vector_weights[book]):
+                yield {"book_id": book_id, "term": self.terms[term], "weight": round(weight, 6)}
+
+
+def build_index(max_terms: int, max_postings: int, min_df: int, max_df_ratio: float) -> ContentIndex:
+    document_frequencies = Counter()
+    documents = 0
+    for _, frequencies in iter_books():
+        document_frequencies.update(frequencies.keys())
+        documents += 1
+    max_df = max(max_df_ratio * documents, min_df)
+    idfs = {
+        term: idf(df, documents)
+        for term, df in document_frequencies.items()
+        if min_df <= df <= max_df
+    }
+    print(f"📖 {documents} books, {len(idfs)} of {len(document_frequencies)} terms kept")
+    del document_frequencies
+
+    index = ContentIndex(idfs, max_terms, max_postings)
+    for book_id, frequencies in iter_books():
+        index.add(book_id, frequencies)
+    index.finish()
+    return index
+
+
+def build_content_index(
+    max_terms: int = None,
+    max_postings: int = None,
+    top_k: int = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+):
+    """Rebuild content_terms, book_terms and book_content_similarities."""
+    max_terms = max_terms or settings.CONTENT_MAX_TERMS
+    max_postings = max_postings or settings.CONTENT_MAX_POSTINGS
+    top_k = top_k or settings.RECOMMENDATIONS_TOP_K
+    init_db()
+
+    started = time.perf_counter()
+    index = build_index(max_terms, max_postings, settings.CONTENT_MIN_DF, settings.CONTENT_MAX_DF_RATIO)
+    print(f"   🗂️ Index built in {time.perf_counter() - started:.2f}s")
+
+    db = SessionLocal()
+    rows = 0
+    try:
+        db.execute(delete(BookContentSimilarity))
+        db.execute(delete(BookTerm))
+        db.execute(delete(ContentTerm))
+        for batch in chunked(({"term": term, "idf": value} for term, value in index.idfs.items()), batch_size):
+            db.execute(insert(ContentTerm), batch)
+        for batch in chunked(index.term_rows(), batch_size):
+            db.execute(insert(BookTerm), batch)
+
+        book_ids = index.book_ids
+        for start in range(0, len(book_ids), block_size):
+            block = [
+                {"book_id": book_ids[book], "similar_book_id": book_ids[other], "score": round(score, 6)}
+                for book in range(start, min(start + block_size, len(book_ids)))
+                for other, score in index.neighbors(book, top_k)
+            ]
+            for batch in chunked(block, batch_size):
+                db.execute(insert(BookContentSimilarity), batch)
+            rows += len(block)
+            print(f"   ⏳ {min(start + block_size, len(book_ids))}/{len(book_ids)} books ({time.perf_counter() - started:.1f}s)")
+
+        bump_version(db, "recommendations")
+        db.commit()
+    except Exception as e:
+        print(f"❌ Error building the content index: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    invalidate_tags("recommendations")
+
+    elapsed = time.perf_counter() - started
+    print("\n🎉 Content index built!")
+    print(f"   📊 {rows} neighbors for {len(index.book_ids)} books in {elapsed:.2f}s")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild content-based similar books (TF-IDF).")
+    parser.add_argument("--max-terms", type=int, help=f"Terms kept per book (default: {settings.CONTENT_MAX_TERMS})")
+    parser.add_argument("--max-postings", type=int, help=f"Books kept per term (default: {settings.CONTENT_MAX_POSTINGS})")
+    parser.add_argument("--top-k", type=int, help=f"Neighbors kept per book (default: {settings.RECOMMENDATIONS_TOP_K})")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help="Books scored per block")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT")
+    args = parser.parse_args()
+    build_content_index(
+        max_terms=args.max_terms,
+        max_postings=args.max_postings,
+        top_k=args.top_k,
+        block_size=args.block_size,
+        batch_size=args.batch_size,
+    )
@@ -0,0 +1,222 @@
+"""
+Streaming table exports for the admin API.
+
+`stream_rows` pages through a table in primary-key order with a server-side
+cursor (`yield_per`), so only one chunk of rows is in memory at a time.
+The encoders turn those chunks into CSV, NDJSON or Parquet bytes as they
+arrive. CSV output uses the same layout as `exports/*.csv`, so a dump can be
+loaded back with `python -m app.utils.import_csv`.
+
+Parquet needs the optional `pyarrow` package.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import JSON, Boolean, DateTime, Float, Integer, Table, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.audit_log import AuditLog
+from app.models.author import Author
+from app.models.book import Book, PriceOption
+from app.models.group import Group
+from app.models.post import Post
+from app.models.review import Review
+from app.models.user import User, UUIDArray
+
+settings = get_settings()
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+# Exportable tables by export name (users.csv holds the `profiles` table)
+EXPORT_TABLES = {
+    "authors": Author,
+    "books": Book,
+    "price_options": PriceOption,
+    "posts": Post,
+    "users": User,
+    "groups": Group,
+    "reviews": Review,
+    "audit_logs": AuditLog,
+}
+
+# format -> (media type, file extension)
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def available_formats() -> list[str]:
+    return [name for name in FORMATS if name != "parquet" or pyarrow is not None]
+
+
+def next_cursor(model, conditions: list, after: Optional[str], limit: int) -> Optional[str]:
+    """
+    Cursor for the page after this one, or None if this page is the last.
+
+    The page ends at the `limit`-th matching id; a row after it means more
+    remain. Found with one index-ordered lookup before streaming starts, so
+    it can go in a response header.
+    """
+    db = SessionLocal()
+    db.info["read_only"] = True
+    try:
+        stmt = select(model.id).where(*conditions)
+        if after is not None:
+            stmt = stmt.where(model.id > after)
+        ids = db.scalars(stmt.order_by(model.id).offset(limit - 1).limit(2)).all()
+    finally:
+        db.close()
+    return ids[0] if len(ids) == 2 else None
+
+
+def stream_rows(
+    model,
+    conditions: list,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+    chunk_size: int = None,
+) -> Iterator[list]:
+    """
+    Yield lists of row tuples (all table columns) in id order.
+
+    Rows after the `after` id are returned, so an interrupted export resumes
+    from the last id received. The session is opened and closed here, since
+    the response body is produced after the endpoint has returned.
+    """
+    table: Table = model.__table__
+    stmt = select(*table.columns).where(*conditions)
+    if after is not None:
+        stmt = stmt.where(table.c.id > after)
+    stmt = stmt.order_by(table.c.id)
+    if limit:
+        stmt = stmt.limit(limit)
+
+    db = SessionLocal()
+    db.info["read_only"] = True
+    try:
+        result = db.execute(stmt.execution_options(yield_per=chunk_size or settings.EXPORT_CHUNK_ROWS))
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def _drain(buffer) -> bytes:
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return 1 if value else 0
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_csv(columns: list, chunks: Iterable[list]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow([column.name for column in columns])
+    yield _drain(buffer)
+    for rows in chunks:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield _drain(buffer)
+
+
+def encode_ndjson(columns: list, chunks: Iterable[list]) -> Iterator[bytes]:
+    names = [column.name for column in columns]
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(names, row)), default=_json_default, ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+def _arrow_type(column):
+    column_type = column.type
+    if isinstance(column_type, (JSON, ARRAY, UUIDArray)):
+        return pyarrow.string()  # Stored as JSON text
+    if isinstance(column_type, Boolean):
+        return pyarrow.bool_()
+    if isinstance(column_type, Integer):
+        return pyarrow.int64()
+    if isinstance(column_type, Float):
+        return pyarrow.float64()
+    if isinstance(column_type, DateTime):
+        return pyarrow.timestamp("us", tz="UTC" if column_type.timezone else None)
+    return pyarrow.string()
+
+
+class _ParquetSink(io.RawIOBase):
+    """Write-only file that hands back what pyarrow wrote since the last drain."""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        written = self.buffer.write(data)
+        self.position += written
+        return written
+
+    def tell(self) -> int:
+        return self.position
+
+
+def encode_parquet(columns: list, chunks: Iterable[list]) -> Iterator[bytes]:
+    """One row group per chunk; the footer is written when the rows run out."""
+    schema = pyarrow.schema([(column.name, _arrow_type(column)) for column in columns])
+    json_columns = [isinstance(column.type, (JSON, ARRAY, UUIDArray)) for column in columns]
+    sink = _ParquetSink()
+    with pyarrow.parquet.ParquetWriter(sink, schema) as writer:
+        for rows in chunks:
+            arrays = [
+                pyarrow.array(
+                    [json.dumps(row[index]) if is_json and row[index] is not None else row[index] for row in rows],
+                    type=field.type,
+                )
+                for index, (field, is_json) in enumerate(zip(schema, json_columns))
+            ]
+            writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+            yield _drain(sink.buffer)
+    yield _drain(sink.buffer)
+
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson, "parquet": encode_parquet}
+
+
+def export_table(
+    model,
+    fmt: str,
+    conditions: list,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Encoded export of `model`'s table, one chunk of bytes per page of rows."""
+    columns = list(model.__table__.columns)
+    return ENCODERS[fmt](columns, stream_rows(model, conditions, after=after, limit=limit))
@@ -0,0 +1,192 @@
+"""
+Rebuild the database from the CSV table dumps in `backend/exports/`.
+
+Each `<table>.csv` is streamed row by row and loaded into the model with the
+same name. Tables are loaded in foreign-key order: every stage only holds
+tables whose parents were loaded by an earlier stage, and the tables of a
+stage load in parallel, one connection each.
+
+Loading goes through app.utils.bulk.bulk_load: `COPY ... FROM STDIN` on
+PostgreSQL, batched executemany on SQLite.
+
+Either way re-running an import is safe: existing ids are skipped, or
+overwritten with --update.
+
+Usage:
+    python -m app.utils.import_csv
+    python -m app.utils.import_csv --dir exports --tables books price_options --update
+"""
+import argparse
+import csv
+import json
+import time
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import JSON, Boolean, DateTime, Float, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.database import init_db
+from app.models.book import Book, PriceOption
+from app.models.author import Author
+from app.models.post import Post
+from app.models.user import User, UUIDArray
+from app.models.group import Group
+from app.models.review import Review
+from app.utils.bulk import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_WORKERS,
+    LoadStats,
+    bulk_load,
+    invalidate_after_load,
+    load_order,
+    run_stages,
+)
+
+EXPORTS_DIR = Path(__file__).parent.parent.parent / "exports"
+
+# Tables with an export, keyed by table (and file) name
+MODELS = {model.__tablename__: model for model in (Author, Book, PriceOption, Post, User, Group, Review)}
+FILE_NAMES = {"profiles": "users"}  # users.csv holds the `profiles` table
+TABLE_NAMES = {file_name: table for table, file_name in FILE_NAMES.items()}
+
+# Long post bodies exceed the csv module's default 128 KiB field limit
+csv.field_size_limit(16 * 1024 * 1024)
+
+_TRUE = {"1", "t", "true", "y", "yes"}
+
+
+def csv_path(directory: Path, table: str) -> Path:
+    return directory / f"{FILE_NAMES.get(table, table)}.csv"
+
+
+def _converter(column):
+    """Build a function turning a CSV cell into a value for `column`."""
+    column_type = column.type
+
+    if isinstance(column_type, (JSON, ARRAY, UUIDArray)):
+        parse = json.loads
+    elif isinstance(column_type, Boolean):
+        parse = lambda value: value.strip().lower() in _TRUE
+    elif isinstance(column_type, Integer):
+        parse = int
+    elif isinstance(column_type, Float):
+        parse = float
+    elif isinstance(column_type, DateTime):
+        parse = datetime.fromisoformat
+    else:
+        parse = None
+
+    def convert(value: str):
+        # CSV has no NULL; an empty cell is NULL unless the column forbids it
+        if value == "" and (column.nullable or parse is not None):
+            return None
+        return parse(value) if parse is not None else value
+
+    return convert
+
+
+def iter_rows(path: Path, model) -> tuple[list[str], Iterator[dict]]:
+    """
+    Return (columns, rows) for a CSV dump of `model`'s table.
+
+    Columns the model does not have (e.g. a legacy `hashed_password`) are
+    dropped. Rows are read lazily, so memory is bounded by the batch size.
+    """
+    f = open(path, "r", encoding="utf-8", newline="")
+    reader = csv.reader(f)
+    header = next(reader, [])
+    table_columns = model.__table__.columns
+    unknown = [name for name in header if name not in table_columns]
+    if unknown:
+        print(f"⚠️ {path.name}: ignoring unknown columns {', '.join(unknown)}")
+    fields = [
+        (index, name, _converter(table_columns[name]))
+        for index, name in enumerate(header)
+        if name in table_columns
+    ]
+
+    def rows():
+        with f:
+            for line_number, record in enumerate(reader, start=2):
+                if not record:
+                    continue
+                try:
+                    yield {name: convert(record[index]) for index, name, convert in fields}
+                except (ValueError, IndexError) as e:
+                    raise ValueError(f"{path.name} line {line_number}: {e}") from e
+
+    return [name for _, name, _ in fields], rows()
+
+
+def import_table(path: Path, table: str, batch_size: int = DEFAULT_BATCH_SIZE, update: bool = False) -> LoadStats:
+    """Load one CSV file into its table with the fastest path for the dialect."""
+    columns, rows = iter_rows(path, MODELS[table])
+    return bulk_load(MODELS[table], rows, columns=columns, batch_size=batch_size, update=update)
+
+
+def import_csv(
+    directory=None,
+    tables: Optional[Iterable[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    update: bool = False,
+    workers: int = DEFAULT_WORKERS,
+):
+    """
+    Import every table that has a CSV in `directory` (default: exports/).
+
+    `tables` limits the import to those table names; `workers` caps how many
+    tables of one stage load at once.
+    """
+    init_db()
+
+    directory = Path(directory) if directory else EXPORTS_DIR
+    if tables:
+        tables = [TABLE_NAMES.get(name, name) for name in tables]
+        unknown = [name for name in tables if name not in MODELS]
+        if unknown:
+            raise ValueError(f"Unknown tables: {', '.join(unknown)} (known: {', '.join(sorted(MODELS))})")
+        missing = [name for name in tables if not csv_path(directory, name).exists()]
+        if missing:
+            print(f"❌ No CSV for {', '.join(missing)} in {directory}")
+            return
+    else:
+        tables = [name for name in MODELS if csv_path(directory, name).exists()]
+        if not tables:
+            print(f"❌ No table exports found in {directory}")
+            return
+
+    started = time.perf_counter()
+    jobs = {
+        MODELS[name]: partial(import_table, csv_path(directory, name), name, batch_size, update)
+        for name in tables
+    }
+    stages = load_order(jobs)
+    print(f"📂 Importing from {directory}: {' → '.join(', '.join(m.__tablename__ for m in stage) for stage in stages)}")
+    results = run_stages(jobs, workers=workers)
+
+    # Invalidate cached responses and ETags for everything that may have changed
+    invalidate_after_load()
+
+    elapsed = time.perf_counter() - started
+    total_rows = sum(s.rows for s in results)
+    print("\n🎉 CSV import complete!")
+    print(f"   📊 {total_rows} rows from {len(results)} tables in {elapsed:.2f}s ({total_rows / elapsed if elapsed else 0:,.0f} rows/s)")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import the BookNook CSV table exports.")
+    parser.add_argument("--dir", help="Directory holding <table>.csv files (default: exports/)")
+    parser.add_argument("--tables", nargs="+", help=f"Tables to import (default: every CSV found; known: {', '.join(sorted(MODELS))})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT on SQLite")
+    parser.add_argument("--update", action="store_true", help="Overwrite rows that already exist")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Tables loaded in parallel per stage")
+    args = parser.parse_args()
+    import_csv(args.dir, args.tables, batch_size=args.batch_size, update=args.update, workers=args.workers)
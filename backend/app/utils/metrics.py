@@ -0,0 +1,264 @@
+"""
+In-process metrics exposed in the Prometheus text format at /metrics.
+
+A small dependency-free registry of counters, gauges and histograms.
+Request metrics are recorded by MetricsMiddleware, database metrics by
+SQLAlchemy event hooks in `app.database`, and cache metrics by
+`app.services.cache`. Values that are cheaper to read than to track
+(pool sizes, cache hit ratios) are filled in by collectors at scrape time.
+
+Metrics are per process. With several workers, scrape each one or run a
+single worker behind the scraper.
+"""
+import asyncio
+import threading
+from contextvars import ContextVar
+from typing import Callable, Iterable, Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class: a named family of samples keyed by label values."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key: tuple, value) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Distribution of observations over cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts..., sum, count]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def _render_sample(self, key: tuple, state) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+        lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+class Registry:
+    """Holds metrics and scrape-time collectors."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callable that refreshes gauges right before each scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"⚠️ Metrics collector {collector.__name__} failed: {e}")
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# HTTP
+HTTP_REQUESTS = registry.register(Counter(
+    "booknook_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"),
+))
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "booknook_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"),
+))
+HTTP_IN_FLIGHT = registry.register(Gauge(
+    "booknook_http_requests_in_flight", "HTTP requests currently being served.",
+))
+HTTP_QUERIES_PER_REQUEST = registry.register(Histogram(
+    "booknook_http_request_queries", "SQL statements issued per request.", ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+))
+
+# Database
+DB_QUERY_DURATION = registry.register(Histogram(
+    "booknook_db_query_duration_seconds", "SQL statement execution time.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+))
+DB_POOL_CHECKOUT_DURATION = registry.register(Histogram(
+    "booknook_db_pool_checkout_duration_seconds", "Time connections stay checked out of the pool.", ("pool",),
+))
+DB_POOL_EVENTS = registry.register(Counter(
+    "booknook_db_pool_events_total", "Pool events: connect, checkout, invalidate, close, timeout.", ("event", "pool"),
+))
+DB_POOL_CONNECTIONS = registry.register(Gauge(
+    "booknook_db_pool_connections", "Pool connections by state.", ("pool", "state"),
+))
+
+# Cache
+CACHE_REQUESTS = registry.register(Counter(
+    "booknook_cache_requests_total", "Response cache lookups by route and outcome.", ("route", "outcome"),
+))
+CACHE_HIT_RATIO = registry.register(Gauge(
+    "booknook_cache_hit_ratio", "Response cache hit ratio by route since startup.", ("route",),
+))
+
+# Event loop
+EVENT_LOOP_LAG = registry.register(Gauge(
+    "booknook_event_loop_lag_seconds", "Most recent event loop scheduling delay.",
+))
+EVENT_LOOP_LAG_HISTOGRAM = registry.register(Histogram(
+    "booknook_event_loop_lag_distribution_seconds", "Event loop scheduling delay.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+))
+
+
+class RequestMetrics:
+    """Per-request counters shared by the middleware and the DB event hooks."""
+
+    __slots__ = ("queries", "db_time", "slow_queries")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.slow_queries = 0
+
+
+# Set by MetricsMiddleware for the duration of each HTTP request
+current_request: ContextVar[Optional[RequestMetrics]] = ContextVar("current_request", default=None)
+
+
+def record_query(elapsed: float) -> None:
+    """Account one executed SQL statement."""
+    DB_QUERY_DURATION.observe(elapsed)
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+
+def render() -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    return registry.render()
+
+
+_loop_monitor: Optional[asyncio.Task] = None
+
+
+async def _monitor_event_loop(interval: float) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+
+
+def start_event_loop_monitor(interval: float = None) -> None:
+    """Start sampling event loop lag on the running loop (idempotent)."""
+    global _loop_monitor
+    if _loop_monitor is not None and not _loop_monitor.done():
+        return
+    interval = interval or settings.METRICS_EVENT_LOOP_INTERVAL_SECONDS
+    _loop_monitor = asyncio.get_running_loop().create_task(_monitor_event_loop(interval))
+
@@ -0,0 +1,48 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe strings encoding the sort key of the last row
+returned, so the next page is an index range scan instead of an OFFSET skip.
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: str) -> str:
+    """Encode a (created_at, id) sort key as an opaque cursor."""
+    stamp = created_at.isoformat() if created_at else ""
+    raw = f"{stamp}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    """Decode a cursor produced by `encode_cursor`, raising 400 if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        stamp, row_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        return (datetime.fromisoformat(stamp) if stamp else None), row_id
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def after_cursor(created_col, id_col, cursor: str, descending: bool = False):
+    """Build the WHERE clause selecting rows strictly after a cursor."""
+    created_at, row_id = decode_cursor(cursor)
+    if created_at is None:
+        return id_col < row_id if descending else id_col > row_id
+    if descending:
+        return or_(
+            created_col < created_at,
+            and_(created_col == created_at, id_col < row_id),
+        )
+    return or_(
+        created_col > created_at,
+        and_(created_col == created_at, id_col > row_id),
+    )
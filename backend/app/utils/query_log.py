@@ -0,0 +1,146 @@
+"""
+Slow-query log and per-request query budgets.
+
+The SQLAlchemy hooks in `app.database` time every statement. Statements
+slower than SLOW_QUERY_THRESHOLD_MS are logged with normalized SQL and, for
+SELECTs, the database's EXPLAIN output. MetricsMiddleware compares each
+request's statement count with its budget (QUERY_BUDGET_PER_REQUEST, or
+`@query_budget(n)` on the endpoint) and flags requests that go over.
+
+With QUERY_BUDGET_ENFORCE=true an over-budget request raises
+QueryBudgetExceeded, which TestClient re-raises in the calling test.
+`assert_max_queries` does the same for code called directly.
+"""
+import re
+from contextlib import contextmanager
+from typing import Optional
+
+from app.config import get_settings
+from app.utils import metrics
+
+settings = get_settings()
+
+SLOW_QUERIES = metrics.registry.register(metrics.Counter(
+    "booknook_db_slow_queries_total", "SQL statements slower than SLOW_QUERY_THRESHOLD_MS.",
+))
+QUERY_BUDGET_EXCEEDED = metrics.registry.register(metrics.Counter(
+    "booknook_http_query_budget_exceeded_total", "Requests that issued more statements than their budget.",
+    ("method", "route"),
+))
+HTTP_REQUEST_DB_TIME = metrics.registry.register(metrics.Histogram(
+    "booknook_http_request_db_seconds", "Total SQL time per request.", ("method", "route"),
+))
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request or block issues more statements than allowed."""
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace, literals and placeholder lists so similar queries group together."""
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _PLACEHOLDER_LIST.sub("(...)", sql)
+
+
+def _explain(cursor, dialect_name: str, statement: str, parameters) -> Optional[str]:
+    """Run EXPLAIN for a SELECT on the same DBAPI connection, isolated by a savepoint."""
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if dialect_name == "sqlite" else "EXPLAIN "
+    explain_cursor = cursor.connection.cursor()
+    # A failed statement would abort the surrounding Postgres transaction
+    savepoint = dialect_name == "postgresql"
+    try:
+        if savepoint:
+            explain_cursor.execute("SAVEPOINT slow_query_explain")
+        explain_cursor.execute(prefix + statement, parameters)
+        plan = "\n".join(" | ".join(str(col) for col in row) for row in explain_cursor.fetchall())
+        if savepoint:
+            explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    except Exception as e:
+        if savepoint:
+            explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+        return f"(EXPLAIN failed: {e})"
+    finally:
+        explain_cursor.close()
+
+
+def record_statement(cursor, dialect_name: str, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+    """Account one executed statement and log it if it was slow."""
+    metrics.record_query(elapsed)
+    if elapsed * 1000 < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    SLOW_QUERIES.inc()
+    stats = metrics.current_request.get()
+    if stats is not None:
+        stats.slow_queries += 1
+    message = f"🐢 Slow query ({elapsed * 1000:.1f} ms): {normalize_sql(statement)}"
+    if settings.SLOW_QUERY_EXPLAIN and not executemany:
+        plan = _explain(cursor, dialect_name, statement, parameters)
+        if plan:
+            message += f"\n{plan}"
+    print(message)
+
+
+def query_budget(max_queries: int):
+    """Override QUERY_BUDGET_PER_REQUEST for one endpoint."""
+    def decorator(func):
+        func.query_budget = max_queries
+        return func
+    return decorator
+
+
+def budget_for(route) -> int:
+    """Statement budget of the matched route (its endpoint's override, or the default)."""
+    endpoint = getattr(route, "endpoint", None)
+    return getattr(endpoint, "query_budget", settings.QUERY_BUDGET_PER_REQUEST)
+
+
+def server_timing(stats: "metrics.RequestMetrics", elapsed: float, budget: int) -> str:
+    """Server-Timing header value for a request's DB and total time."""
+    parts = [
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+        f"app;dur={elapsed * 1000:.1f}",
+    ]
+    if stats.queries > budget:
+        parts.append(f'budget;desc="exceeded {stats.queries}/{budget}"')
+    return ", ".join(parts)
+
+
+def check_budget(method: str, route_path: str, stats: "metrics.RequestMetrics", budget: int) -> None:
+    """Record DB time and flag the request if it went over its statement budget."""
+    HTTP_REQUEST_DB_TIME.observe(stats.db_time, method=method, route=route_path)
+    if stats.queries <= budget:
+        return
+    QUERY_BUDGET_EXCEEDED.inc(method=method, route=route_path)
+    message = f"{method} {route_path} issued {stats.queries} queries (budget {budget})"
+    print(f"⚠️ Query budget exceeded: {message}")
+    if settings.QUERY_BUDGET_ENFORCE:
+        raise QueryBudgetExceeded(message)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """
+    Fail if the block issues more than `max_queries` statements.
+
+        with assert_max_queries(3) as stats:
+            get_shelves(user_id, db)
+    """
+    stats = metrics.RequestMetrics()
+    token = metrics.current_request.set(stats)
+    try:
+        yield stats
+    finally:
+        metrics.current_request.reset(token)
+    if stats.queries > max_queries:
+        raise QueryBudgetExceeded(f"{stats.queries} queries issued (budget {max_queries})")
@@ -0,0 +1,201 @@
+"""
+Offline job computing "readers also liked" neighbors for every book.
+
+A user's books are those on any of their shelves plus those they reviewed
+with at least RECOMMENDATIONS_MIN_RATING stars. Two books are similar when
+many of the same users have them: the score is the cosine similarity of the
+books' user sets, count(both) / sqrt(count(a) * count(b)), and pairs shared
+by fewer than RECOMMENDATIONS_MIN_COOCCURRENCE users are dropped as noise.
+
+The top RECOMMENDATIONS_TOP_K neighbors per book replace the contents of
+`book_similarities` in one transaction, so readers never see a half-written
+table. Requests only read that table (see app.services.recommendations).
+
+Cost grows with the sum over users of (books per user)^2, so users with more
+than RECOMMENDATIONS_MAX_BOOKS_PER_USER books are sampled down to that many.
+Books are handled one at a time, so memory is the interaction lists plus one
+book's co-occurrence counts.
+
+Usage:
+    python -m app.utils.recommend
+    python -m app.utils.recommend --top-k 100 --min-cooccurrence 3
+"""
+import argparse
+import heapq
+import random
+import time
+from array import array
+from collections import Counter
+from math import sqrt
+from pathlib import Path
+from typing import Iterator
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import delete, insert, select
+
+from app.config import get_settings
+from app.database import SessionLocal, init_db
+from app.models.recommendation import BookSimilarity
+from app.models.review import Review
+from app.models.shelf import Shelf, ShelfItem
+from app.services.cache import invalidate_tags
+from app.services.versions import bump_version
+from app.utils.bulk import DEFAULT_BATCH_SIZE, chunked
+
+settings = get_settings()
+
+READ_CHUNK_ROWS = 10_000
+
+
+class Interactions:
+    """Users' book sets as dense integer indexes, in both directions."""
+
+    def __init__(self, book_ids: list[str], user_books: list[array]):
+        self.book_ids = book_ids
+        self.user_books = user_books
+        self.book_users = [array("I") for _ in book_ids]
+        for user, books in enumerate(user_books):
+            for book in books:
+                self.book_users[book].append(user)
+
+    @property
+    def total(self) -> int:
+        return sum(len(books) for books in self.user_books)
+
+
+def load_interactions(min_rating: int, max_books_per_user: int, seed: int = 0) -> Interactions:
+    """Read shelved and well-reviewed books per user, streaming both tables."""
+    book_index: dict[str, int] = {}
+    user_books: dict[str, set] = {}
+
+    def add(user_id: str, book_id: str):
+        book = book_index.setdefault(book_id, len(book_index))
+        user_books.setdefault(user_id, set()).add(book)
+
+    db = SessionLocal()
+    db.info["read_only"] = True
+    try:
+        shelved = (
+            select(Shelf.user_id, ShelfItem.book_id)
+            .join(ShelfItem, ShelfItem.shelf_id == Shelf.id)
+            .execution_options(yield_per=READ_CHUNK_ROWS)
+        )
+        for user_id, book_id in db.execute(shelved):
+            add(user_id, book_id)
+        reviewed = (
+            select(Review.user_id, Review.book_id)
+            .where(Review.is_approved == 1, Review.rating >= min_rating)
+            .execution_options(yield_per=READ_CHUNK_ROWS)
+        )
+        for user_id, book_id in db.execute(reviewed):
+            add(user_id, book_id)
+    finally:
+        db.close()
+
+    rng = random.Random(seed)
+    sampled = []
+    for books in user_books.values():
+        books = sorted(books)
+        if len(books) > max_books_per_user:
+            books = sorted(rng.sample(books, max_books_per_user))
+        sampled.append(array("I", books))
+    book_ids = [None] * len(book_index)
+    for book_id, index in book_index.items():
+        book_ids[index] = book_id
+    return Interactions(book_ids, sampled)
+
+
+def neighbors(interactions: Interactions, top_k: int, min_cooccurrence: int) -> Iterator[tuple[int, list]]:
+    """Yield (book, [(score, other book), ...]) with the best neighbors first."""
+    degree = [len(users) for users in interactions.book_users]
+    for book, users in enumerate(interactions.book_users):
+        if len(users) < min_cooccurrence:
+            continue
+        counts = Counter()
+        for user in users:
+            counts.update(interactions.user_books[user])
+        del counts[book]
+        scored = [
+            (count / sqrt(degree[book] * degree[other]), other)
+            for other, count in counts.items()
+            if count >= min_cooccurrence
+        ]
+        if scored:
+            yield book, heapq.nlargest(top_k, scored)
+
+
+def similarity_rows(interactions: Interactions, top_k: int, min_cooccurrence: int) -> Iterator[dict]:
+    book_ids = interactions.book_ids
+    for book, best in neighbors(interactions, top_k, min_cooccurrence):
+        for rank, (score, other) in enumerate(best):
+            yield {
+                "book_id": book_ids[book],
+                "rank": rank,
+                "similar_book_id": book_ids[other],
+                "score": round(score, 6),
+            }
+
+
+def compute_recommendations(
+    top_k: int = None,
+    min_cooccurrence: int = None,
+    max_books_per_user: int = None,
+    min_rating: int = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+):
+    """Recompute `book_similarities` from the current shelves and reviews."""
+    top_k = top_k or settings.RECOMMENDATIONS_TOP_K
+    min_cooccurrence = min_cooccurrence or settings.RECOMMENDATIONS_MIN_COOCCURRENCE
+    max_books_per_user = max_books_per_user or settings.RECOMMENDATIONS_MAX_BOOKS_PER_USER
+    min_rating = min_rating or settings.RECOMMENDATIONS_MIN_RATING
+    init_db()
+
+    started = time.perf_counter()
+    interactions = load_interactions(min_rating, max_books_per_user)
+    print(
+        f"📚 {interactions.total} interactions: {len(interactions.user_books)} users, "
+        f"{len(interactions.book_ids)} books ({time.perf_counter() - started:.2f}s)"
+    )
+
+    db = SessionLocal()
+    try:
+        db.execute(delete(BookSimilarity))
+        rows, books = 0, set()
+        for batch in chunked(similarity_rows(interactions, top_k, min_cooccurrence), batch_size):
+            db.execute(insert(BookSimilarity), batch)
+            rows += len(batch)
+            books.update(row["book_id"] for row in batch)
+        bump_version(db, "recommendations")
+        db.commit()
+    except Exception as e:
+        print(f"❌ Error computing recommendations: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    invalidate_tags("recommendations")
+
+    elapsed = time.perf_counter() - started
+    print("\n🎉 Recommendations computed!")
+    print(f"   📊 {rows} neighbors for {len(books)} books in {elapsed:.2f}s")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute similar books from shelves and reviews.")
+    parser.add_argument("--top-k", type=int, help=f"Neighbors kept per book (default: {settings.RECOMMENDATIONS_TOP_K})")
+    parser.add_argument("--min-cooccurrence", type=int, help=f"Shared readers required (default: {settings.RECOMMENDATIONS_MIN_COOCCURRENCE})")
+    parser.add_argument("--max-books-per-user", type=int, help=f"Sample larger histories down (default: {settings.RECOMMENDATIONS_MAX_BOOKS_PER_USER})")
+    parser.add_argument("--min-rating", type=int, help=f"Lowest review rating counted (default: {settings.RECOMMENDATIONS_MIN_RATING})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT")
+    args = parser.parse_args()
+    compute_recommendations(
+        top_k=args.top_k,
+        min_cooccurrence=args.min_cooccurrence,
+        max_books_per_user=args.max_books_per_user,
+        min_rating=args.min_rating,
+        batch_size=args.batch_size,
+    )
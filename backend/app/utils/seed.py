@@ -1,19 +1,23 @@
-# """
-# Data seeding utility to migrate existing JSON data to the database.
+"""
+Data seeding utility to load the JSON reference data into the database.
 
-# Run this script to populate the database with initial data from the JSON files.
-# Usage: python -m app.utils.seed
-# """
+Input is streamed (JSON arrays, a named array inside a JSON object, or
+NDJSON) and loaded in batches with app.utils.bulk, so seeding is
+idempotent and memory stays flat however large the input is.
 
-import json
-import os
-import uuid
+Usage:
+    python -m app.utils.seed
+    python -m app.utils.seed --books books.ndjson --batch-size 5000 --update
+"""
+import argparse
 from pathlib import Path
 
 # Add parent directory to path for imports
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from sqlalchemy import select
+
 from app.database import SessionLocal, init_db
 from app.models.book import Book, PriceOption
 from app.models.author import Author
@@ -21,264 +25,246 @@ from app.models.post import Post
 from app.models.user import User
 from app.models.group import Group
 from app.models.review import Review
-from app.services.auth import get_password_hash
+from app.services.cache import invalidate_tags
+from app.services.versions import bump_version
+from app.utils.bulk import DEFAULT_BATCH_SIZE, bulk_upsert, chunked, iter_records
+
+DATA_DIR = Path(__file__).parent.parent.parent
+
+
+SAMPLE_USERS = [
+    {
+        "id": "admin-001",
+        "email": "admin@booknook.com",
+        "name": "Admin",
+        "bio": "BookNook System Administrator",
+        "avatar_url": "https://ui-avatars.com/api/?name=Admin&background=dc2626&color=fff",
+        "is_admin": True,
+    },
+    {
+        "id": "u_sarah",
+        "email": "sarah@booknook.com",
+        "name": "Sarah Jenkins",
+        "bio": "Editor turned author. Cozy mystery enthusiast.",
+        "avatar_url": "https://images.unsplash.com/photo-1544005313-94ddf0286df2?auto=format&fit=crop&w=200&h=200&q=80",
+        "is_admin": False,
+    },
+    {
+        "id": "u_editorial",
+        "email": "editorial@booknook.com",
+        "name": "BookNook Editorial",
+        "bio": "Official updates and curated lists from the BookNook team.",
+        "avatar_url": "https://ui-avatars.com/api/?name=BookNook+Editorial&background=138A92&color=fff",
+        "is_admin": True,
+    },
+    {
+        "id": "u2",
+        "email": "john@booknook.com",
+        "name": "John Doe",
+        "bio": "Casual reader.",
+        "avatar_url": "https://i.pravatar.cc/150?u=u2",
+        "is_admin": False,
+    },
+]
+
+SAMPLE_GROUPS = [
+    {
+        "id": "g1",
+        "name": "Sci-Fi Enthusiasts",
+        "description": "A place to discuss time travel, space operas, and the future of humanity.",
+        "admin_id": "admin-001",
+        "image_url": "https://images.unsplash.com/photo-1451187580459-43490279c0fa?auto=format&fit=crop&w=800&q=80",
+        "tags": ["Sci-Fi", "Future", "Tech"],
+        "members": ["admin-001", "u2", "u_sarah"],
+        "pending_members": [],
+    },
+    {
+        "id": "g2",
+        "name": "Classic Literature Club",
+        "description": "Revisiting the classics from Austen to Dickens.",
+        "admin_id": "u_sarah",
+        "image_url": "https://images.unsplash.com/photo-1463320726281-696a485928c7?auto=format&fit=crop&w=800&q=80",
+        "tags": ["Classics", "History", "Literature"],
+        "members": ["u_sarah", "u2"],
+        "pending_members": ["admin-001"],
+    },
+]
+
+SAMPLE_REVIEWS = [
+    {
+        "id": "r1",
+        "book_id": "b1",
+        "user_id": "u_sarah",
+        "user_name": "Sarah Jenkins",
+        "rating": 5,
+        "content": "Absolutely mind-bending! Thorne outdoes himself with this exploration of temporal mechanics.",
+        "date": "Dec 1, 2024",
+    },
+    {
+        "id": "r2",
+        "book_id": "b2",
+        "user_id": "u2",
+        "user_name": "John Doe",
+        "rating": 4,
+        "content": "A beautiful homage to the noir genre with stunning period detail.",
+        "date": "Nov 28, 2024",
+    },
+]
+
+
+def _first(data: dict, *keys, default=None):
+    """Read a field that may be camelCase (data.json) or snake_case (table dumps)."""
+    for key in keys:
+        if key in data:
+            return data[key]
+    return default
+
+
+def author_row(data: dict) -> dict:
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "image_url": _first(data, "imageUrl", "image_url"),
+        "bio": data.get("bio"),
+        "born": data.get("born"),
+        "died": data.get("died"),
+        "top_book_ids": _first(data, "topBookIds", "top_book_ids", default=[]),
+    }
 
 
-def load_json_file(filepath: str) -> dict:
-    """Load and parse a JSON file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def book_row(data: dict) -> dict:
+    return {
+        "id": data["id"],
+        "title": data["title"],
+        "author": data["author"],
+        "publisher": data.get("publisher"),
+        "cover_url": _first(data, "coverUrl", "cover_url"),
+        "description": data.get("description"),
+        "published_year": _first(data, "publishedYear", "published_year"),
+        "genres": data.get("genres") or [],
+    }
 
 
-def seed_database():
-    """Seed the database with data from JSON files."""
+def price_option_rows(book: dict) -> list[dict]:
+    """Price options nested in a book; ids are derived from the book so re-runs match."""
+    return [
+        {
+            "id": po.get("id") or f"po-{book['id']}-{index}",
+            "book_id": book["id"],
+            "vendor": po["vendor"],
+            "price": po["price"],
+            "url": po.get("url"),
+            "in_stock": bool(_first(po, "inStock", "in_stock", default=True)),
+        }
+        for index, po in enumerate(_first(book, "priceOptions", "price_options", default=[]))
+    ]
+
+
+def post_row(data: dict) -> dict:
+    return {
+        "id": data["id"],
+        "type": data["type"],
+        "title": data["title"],
+        "excerpt": data.get("excerpt"),
+        "content": data.get("content"),
+        "author": data["author"],
+        "date": data.get("date"),
+        "image_url": _first(data, "imageUrl", "image_url"),
+        "tags": data.get("tags") or [],
+        "is_approved": 1,
+    }
+
+
+def user_row(data: dict) -> dict:
+    return {
+        "id": data["id"],
+        "email": data["email"],
+        "name": data["name"],
+        "bio": data.get("bio"),
+        "avatar_url": data.get("avatar_url"),
+        "is_admin": data.get("is_admin", False),
+        "is_active": True,
+        "joined_date": "Jan 2024",
+        "following": [],
+        "followers": [],
+    }
+
+
+def _books_with_price_options(records, price_options: list):
+    """Yield book rows while collecting their nested price options."""
+    for record in records:
+        price_options.extend(price_option_rows(record))
+        yield book_row(record)
+
+
+def seed_database(
+    books_path=None,
+    authors_path=None,
+    posts_path=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    update: bool = False,
+):
+    """
+    Seed the database from JSON/NDJSON files.
+
+    Defaults to `data.json` (books and authors) and `posts.json` in the
+    backend folder. Existing rows are skipped, or overwritten with `update`.
+    """
     # Initialize database tables
     init_db()
-    
+
+    data_file = DATA_DIR / "data.json"
+    books_path = Path(books_path) if books_path else data_file
+    authors_path = Path(authors_path) if authors_path else data_file
+    posts_path = Path(posts_path) if posts_path else DATA_DIR / "posts.json"
+
+    for path in {books_path, authors_path, posts_path}:
+        if not path.exists():
+            print(f"❌ {path.name} not found at {path}")
+            return
+
     db = SessionLocal()
-    
+    results = []
     try:
-        # Find the data files (they should be in the frontend folder)
-        project_root = Path(__file__).parent.parent.parent.parent
-        frontend_folder = project_root / "backend"
-        data_file = frontend_folder / "data.json"
-        posts_file = frontend_folder / "posts.json"
-        
-        print(f"📂 Looking for data files in: {frontend_folder}")
-        
-        if not data_file.exists():
-            print(f"❌ data.json not found at {data_file}")
-            return
-        
-        if not posts_file.exists():
-            print(f"❌ posts.json not found at {posts_file}")
-            return
-        
-        # Load data
-        print("📖 Loading data.json...")
-        data = load_json_file(str(data_file))
-        
-        print("📖 Loading posts.json...")
-        posts_data = load_json_file(str(posts_file))
-        
-        # Seed Authors
-        print("\n👤 Seeding authors...")
-        authors = data.get("authors", [])
-        for author_data in authors:
-            existing = db.query(Author).filter(Author.id == author_data["id"]).first()
-            if not existing:
-                author = Author(
-                    id=author_data["id"],
-                    name=author_data["name"],
-                    image_url=author_data.get("imageUrl"),
-                    bio=author_data.get("bio"),
-                    born=author_data.get("born"),
-                    died=author_data.get("died"),
-                    top_book_ids=author_data.get("topBookIds", []),
-                )
-                db.add(author)
-        db.commit()
-        print(f"   ✅ Added {len(authors)} authors")
-        
-        # Seed Books
-        print("\n📚 Seeding books...")
-        books = data.get("books", [])
-        for book_data in books:
-            existing = db.query(Book).filter(Book.id == book_data["id"]).first()
-            if not existing:
-                book = Book(
-                    id=book_data["id"],
-                    title=book_data["title"],
-                    author=book_data["author"],
-                    publisher=book_data.get("publisher"),
-                    cover_url=book_data.get("coverUrl"),
-                    description=book_data.get("description"),
-                    published_year=book_data.get("publishedYear"),
-                    genres=book_data.get("genres", []),
-                )
-                db.add(book)
-                db.flush()  # Get the book ID
-                
-                # Add price options
-                for po_data in book_data.get("priceOptions", []):
-                    price_option = PriceOption(
-                        id=f"po-{uuid.uuid4().hex[:12]}",
-                        book_id=book_data["id"],
-                        vendor=po_data["vendor"],
-                        price=po_data["price"],
-                        url=po_data.get("url"),
-                        in_stock=po_data.get("inStock", True),
-                    )
-                    db.add(price_option)
-        db.commit()
-        print(f"   ✅ Added {len(books)} books with price options")
-        
-        # Seed Posts
-        print("\n📝 Seeding posts...")
-        # posts.json is a list, not a dict with 'posts' key
-        posts = posts_data if isinstance(posts_data, list) else posts_data.get("posts", [])
-        for post_data in posts:
-            existing = db.query(Post).filter(Post.id == post_data["id"]).first()
-            if not existing:
-                post = Post(
-                    id=post_data["id"],
-                    type=post_data["type"],
-                    title=post_data["title"],
-                    excerpt=post_data.get("excerpt"),
-                    content=post_data.get("content"),
-                    author=post_data["author"],
-                    date=post_data.get("date"),
-                    image_url=post_data.get("imageUrl"),
-                    tags=post_data.get("tags", []),
-                    is_approved=1,
-                )
-                db.add(post)
-        db.commit()
-        print(f"   ✅ Added {len(posts)} posts")
-        
-        # Seed sample users
-        print("\n👥 Seeding sample users...")
-        sample_users = [
-            {
-                "id": "u_sarah",
-                "email": "sarah@booknook.com",
-                "name": "Sarah Jenkins",
-                "password": "password123",
-                "bio": "Editor turned author. Cozy mystery enthusiast.",
-                "avatar_url": "https://images.unsplash.com/photo-1544005313-94ddf0286df2?auto=format&fit=crop&w=200&h=200&q=80",
-                "is_admin": False,
-            },
-            {
-                "id": "u_editorial",
-                "email": "editorial@booknook.com",
-                "name": "BookNook Editorial",
-                "password": "password123",
-                "bio": "Official updates and curated lists from the BookNook team.",
-                "avatar_url": "https://ui-avatars.com/api/?name=BookNook+Editorial&background=138A92&color=fff",
-                "is_admin": True,
-            },
-            {
-                "id": "u2",
-                "email": "john@booknook.com",
-                "name": "John Doe",
-                "password": "password123",
-                "bio": "Casual reader.",
-                "avatar_url": "https://i.pravatar.cc/150?u=u2",
-                "is_admin": False,
-            },
-        ]
-        
-        for user_data in sample_users:
-            existing = db.query(User).filter(User.id == user_data["id"]).first()
-            if not existing:
-                user = User(
-                    id=user_data["id"],
-                    email=user_data["email"],
-                    name=user_data["name"],
-                    hashed_password=get_password_hash(user_data["password"]),
-                    bio=user_data["bio"],
-                    avatar_url=user_data["avatar_url"],
-                    is_admin=user_data["is_admin"],
-                    is_active=True,
-                    joined_date="Jan 2024",
-                    following=[],
-                    followers=[],
-                )
-                db.add(user)
-        db.commit()
-        print(f"   ✅ Added {len(sample_users)} sample users")
-        
-        # Seed sample groups
-        print("\n🏠 Seeding groups...")
-        sample_groups = [
-            {
-                "id": "g1",
-                "name": "Sci-Fi Enthusiasts",
-                "description": "A place to discuss time travel, space operas, and the future of humanity.",
-                "admin_id": "admin-001",
-                "image_url": "https://images.unsplash.com/photo-1451187580459-43490279c0fa?auto=format&fit=crop&w=800&q=80",
-                "tags": ["Sci-Fi", "Future", "Tech"],
-                "members": ["admin-001", "u2", "u_sarah"],
-                "pending_members": [],
-            },
-            {
-                "id": "g2",
-                "name": "Classic Literature Club",
-                "description": "Revisiting the classics from Austen to Dickens.",
-                "admin_id": "u_sarah",
-                "image_url": "https://images.unsplash.com/photo-1463320726281-696a485928c7?auto=format&fit=crop&w=800&q=80",
-                "tags": ["Classics", "History", "Literature"],
-                "members": ["u_sarah", "u2"],
-                "pending_members": ["admin-001"],
-            },
-        ]
-        
-        for group_data in sample_groups:
-            existing = db.query(Group).filter(Group.id == group_data["id"]).first()
-            if not existing:
-                group = Group(
-                    id=group_data["id"],
-                    name=group_data["name"],
-                    description=group_data["description"],
-                    admin_id=group_data["admin_id"],
-                    image_url=group_data["image_url"],
-                    tags=group_data["tags"],
-                    members=group_data["members"],
-                    pending_members=group_data["pending_members"],
-                )
-                db.add(group)
-        db.commit()
-        print(f"   ✅ Added {len(sample_groups)} groups")
-        
-        # Seed sample reviews
-        print("\n⭐ Seeding sample reviews...")
-        sample_reviews = [
-            {
-                "id": "r1",
-                "book_id": "b1",
-                "user_id": "u_sarah",
-                "user_name": "Sarah Jenkins",
-                "rating": 5,
-                "content": "Absolutely mind-bending! Thorne outdoes himself with this exploration of temporal mechanics.",
-                "date": "Dec 1, 2024",
-            },
-            {
-                "id": "r2",
-                "book_id": "b2",
-                "user_id": "u2",
-                "user_name": "John Doe",
-                "rating": 4,
-                "content": "A beautiful homage to the noir genre with stunning period detail.",
-                "date": "Nov 28, 2024",
-            },
-        ]
-        
-        for review_data in sample_reviews:
-            existing = db.query(Review).filter(Review.id == review_data["id"]).first()
-            if not existing:
-                review = Review(
-                    id=review_data["id"],
-                    book_id=review_data["book_id"],
-                    user_id=review_data["user_id"],
-                    user_name=review_data["user_name"],
-                    rating=review_data["rating"],
-                    content=review_data["content"],
-                    date=review_data["date"],
-                    is_approved=1,
-                )
-                db.add(review)
+        print(f"📂 Seeding from: {', '.join(sorted({str(books_path), str(authors_path), str(posts_path)}))}")
+
+        def load(model, rows):
+            results.append(bulk_upsert(db, model, rows, batch_size=batch_size, update=update))
+
+        load(Author, (author_row(a) for a in iter_records(authors_path, "authors")))
+
+        # Price options are flushed per books batch so memory stays bounded
+        price_options = []
+        books = _books_with_price_options(iter_records(books_path, "books"), price_options)
+        book_stats, po_stats = None, None
+        for batch in chunked(books, batch_size):
+            stats = bulk_upsert(db, Book, batch, batch_size=batch_size, update=update)
+            book_stats = _merge(book_stats, stats)
+            stats = bulk_upsert(db, PriceOption, price_options, batch_size=batch_size, update=update)
+            po_stats = _merge(po_stats, stats)
+            price_options.clear()
+        results.extend(s for s in (book_stats, po_stats) if s is not None)
+
+        load(Post, (post_row(p) for p in iter_records(posts_path, "posts")))
+        load(User, (user_row(u) for u in SAMPLE_USERS))
+        load(Group, SAMPLE_GROUPS)
+        # Sample reviews point at reference books, which a custom books file may lack
+        book_ids = set(db.scalars(select(Book.id).where(Book.id.in_([r["book_id"] for r in SAMPLE_REVIEWS]))))
+        load(Review, ({**r, "is_approved": 1} for r in SAMPLE_REVIEWS if r["book_id"] in book_ids))
+
+        # Invalidate cached catalog responses
+        bump_version(db, "books", "authors", "posts")
         db.commit()
-        print(f"   ✅ Added {len(sample_reviews)} reviews")
-        
+        invalidate_tags("books:list", "authors:list", "posts:list")
+
         print("\n🎉 Database seeding complete!")
-        print("\n📊 Summary:")
-        print(f"   - Authors: {db.query(Author).count()}")
-        print(f"   - Books: {db.query(Book).count()}")
-        print(f"   - Posts: {db.query(Post).count()}")
-        print(f"   - Users: {db.query(User).count()}")
-        print(f"   - Groups: {db.query(Group).count()}")
-        print(f"   - Reviews: {db.query(Review).count()}")
-        
+        for stats in results:
+            print(f"   ✅ {stats}")
+        total_rows = sum(s.rows for s in results)
+        total_time = sum(s.elapsed for s in results)
+        print(f"   📊 {total_rows} rows in {total_time:.2f}s ({total_rows / total_time if total_time else 0:,.0f} rows/s)")
+        return results
+
     except Exception as e:
         print(f"❌ Error seeding database: {e}")
         db.rollback()
@@ -287,5 +273,22 @@ def seed_database():
         db.close()
 
 
+def _merge(total, stats):
+    if total is None:
+        return stats
+    total.inserted += stats.inserted
+    total.updated += stats.updated
+    total.skipped += stats.skipped
+    total.elapsed += stats.elapsed
+    return total
+
+
 if __name__ == "__main__":
-    seed_database()
+    parser = argparse.ArgumentParser(description="Seed the BookNook database from JSON or NDJSON files.")
+    parser.add_argument("--books", help="Books file (default: data.json)")
+    parser.add_argument("--authors", help="Authors file (default: data.json)")
+    parser.add_argument("--posts", help="Posts file (default: posts.json)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT")
+    parser.add_argument("--update", action="store_true", help="Overwrite rows that already exist")
+    args = parser.parse_args()
+    seed_database(args.books, args.authors, args.posts, batch_size=args.batch_size, update=args.update)
@@ -0,0 +1,44 @@
+"""
+Fast-path JSON serialization for list endpoints.
+
+Returning `[Schema.model_validate(o) for o in rows]` makes FastAPI validate
+the list again against `response_model` and then encode it with stdlib
+`json`. `json_list_response` instead validates the ORM rows once through a
+cached TypeAdapter and lets pydantic-core write the JSON bytes directly.
+The endpoint's `response_model` still documents the schema in OpenAPI.
+"""
+from functools import lru_cache
+from typing import Any, Iterable, Type
+
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+class PreEncodedJSONResponse(Response):
+    """JSON response whose body is already encoded bytes."""
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def dump_list(schema: Type[BaseModel], rows: Iterable[Any], exclude_unset: bool = False) -> bytes:
+    """Validate ORM objects (or rows/dicts) against `schema` and encode them as a JSON array."""
+    adapter = _list_adapter(schema)
+    items = adapter.validate_python(list(rows), from_attributes=True)
+    return adapter.dump_json(items, exclude_unset=exclude_unset)
+
+
+def json_list_response(
+    schema: Type[BaseModel],
+    rows: Iterable[Any],
+    exclude_unset: bool = False,
+    headers: dict = None,
+) -> PreEncodedJSONResponse:
+    """Build a pre-encoded JSON array response from ORM objects."""
+    return PreEncodedJSONResponse(
+        content=dump_list(schema, rows, exclude_unset=exclude_unset),
+        headers=headers,
+    )
@@ -0,0 +1,549 @@
+"""
+Deterministic synthetic data for scale testing.
+
+Generates users (with follows and shelves), authors, books, price options,
+reviews, direct messages, posts, likes and comments with the skew real
+traffic has:
+
+- Followers follow a power law: a handful of accounts are followed by a
+  large share of users, which exercises the feed's celebrity path.
+- Reviews, likes and shelved books concentrate on popular books and posts,
+  and a minority of users account for most of them (no user reviews, likes
+  or shelves the same item twice).
+- Direct messages concentrate in a few chatty pairs.
+
+The same --seed always produces the same rows, and different seeds use
+different ids, so datasets can be layered. Rows are streamed into
+app.utils.bulk.bulk_load (COPY on PostgreSQL, executemany on SQLite) in
+foreign-key order, so memory stays flat apart from the follow graph
+(about 8 bytes per follow edge).
+
+Usage:
+    python -m app.utils.synth
+    python -m app.utils.synth --users 1e6 --books 1e6 --reviews 2e7 --messages 5e6
+"""
+import argparse
+import random
+import time
+import zlib
+from array import array
+from bisect import bisect
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from math import gcd
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.database import init_db
+from app.models.book import Book, PriceOption
+from app.models.author import Author
+from app.models.post import Post
+from app.models.user import User
+from app.models.review import Review
+from app.models.message import Message
+from app.models.interaction import Comment, Like
+from app.models.shelf import Shelf, ShelfItem, ShelfType
+from app.utils.bulk import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_WORKERS,
+    bulk_load,
+    invalidate_after_load,
+    load_order,
+    run_stages,
+)
+
+# Power-law exponents: larger means more concentrated on the top ranks
+FOLLOW_SKEW = 1.2  # Which accounts get followed
+USER_ACTIVITY_SKEW = 0.9  # Who writes reviews, likes, comments and DMs
+BOOK_POPULARITY_SKEW = 1.1  # Which books get reviewed
+AUTHOR_OUTPUT_SKEW = 1.0  # Which authors write the books
+POST_POPULARITY_SKEW = 1.1  # Which posts get liked and commented on
+DM_PAIR_SKEW = 1.3  # Which conversations get the messages
+
+MAX_REVIEWS_PER_USER = 5000
+MAX_LIKES_PER_USER = 2000
+MAX_SHELVED_PER_USER = 1000
+MESSAGES_PER_PAIR = 25  # Average; sets the number of conversations
+REPLY_RATE = 0.3  # Share of comments that reply to the previous one on the post
+
+START = datetime(2023, 1, 1, tzinfo=timezone.utc)
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+
+FIRST_NAMES = [
+    "Ada", "Ben", "Chloe", "Dev", "Elena", "Finn", "Grace", "Hiro", "Isla", "Jonah",
+    "Kira", "Liam", "Maya", "Noah", "Olga", "Priya", "Quinn", "Rosa", "Sam", "Tariq",
+    "Uma", "Victor", "Wen", "Ximena", "Yusuf", "Zoe",
+]
+LAST_NAMES = [
+    "Abbott", "Baker", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Hughes", "Ito",
+    "Jensen", "Khan", "Lopez", "Moreau", "Nakamura", "Okafor", "Petrov", "Quist",
+    "Rossi", "Silva", "Tanaka", "Ueda", "Varga", "Walsh", "Xu", "Young", "Zimmer",
+]
+WORDS = [
+    "shadow", "river", "glass", "winter", "garden", "signal", "empire", "ember",
+    "harbor", "silent", "paper", "orbit", "crown", "forest", "memory", "lantern",
+    "tide", "clockwork", "salt", "echo", "iron", "velvet", "storm", "atlas",
+]
+GENRES = [
+    "Adventure", "Cooking", "Cyberpunk", "Drama", "Eco-Fiction", "Fantasy",
+    "Historical Fiction", "Horror", "Humor", "Mystery", "Non-Fiction", "Romance",
+    "Sci-Fi", "Thriller", "Travel",
+]
+VENDORS = ["Amazon", "Kindle", "Barnes & Noble"]
+POST_TYPES = ["blog", "news", "spotlight"]
+SHELVES = [
+    (ShelfType.WANT_TO_READ, "Want to Read"),
+    (ShelfType.CURRENTLY_READING, "Currently Reading"),
+    (ShelfType.READ, "Read"),
+]
+REVIEW_LINES = [
+    "Could not put it down.",
+    "Slow start, but the last third is superb.",
+    "Beautiful prose and a twist I did not see coming.",
+    "Not for me, though I see the appeal.",
+    "The characters stayed with me for weeks.",
+    "Overhyped, but solid.",
+]
+MESSAGE_LINES = [
+    "Have you started the new one yet?",
+    "Chapter 12 though!!",
+    "Book club on Thursday?",
+    "I just added it to my shelf.",
+    "No spoilers please 😅",
+    "You were right about the ending.",
+]
+RATING_WEIGHTS = [5, 8, 17, 35, 35]  # Share of 1..5 star reviews, in percent
+
+
+def _count(value: str) -> int:
+    """Parse counts such as 1000, 1e6 or 2.5e5."""
+    return int(float(value))
+
+
+class Zipf:
+    """
+    Sample indexes 0..n-1 with P(rank r) proportional to 1 / (r + 1) ** s.
+
+    Ranks are spread over indexes with a fixed stride coprime to n, so the
+    most popular items are not simply the lowest ids.
+    """
+
+    def __init__(self, n: int, s: float):
+        self.n = n
+        self.s = s
+        self.cumulative = array("d")
+        total = 0.0
+        for rank in range(n):
+            total += (rank + 1) ** -s
+            self.cumulative.append(total)
+        self.total = total
+        stride = max(int(n * 0.6180339887), 1)
+        while gcd(stride, n) != 1:
+            stride += 1
+        self.stride = stride
+
+    def weight(self, rank: int) -> float:
+        return (rank + 1) ** -self.s
+
+    def index(self, rank: int) -> int:
+        return rank * self.stride % self.n
+
+    def sample(self, rng: random.Random) -> int:
+        rank = min(bisect(self.cumulative, rng.random() * self.total), self.n - 1)
+        return self.index(rank)
+
+    def distinct(self, rng: random.Random, k: int, exclude: Optional[int] = None) -> list[int]:
+        """`k` different indexes (never `exclude`); uniform once the head is exhausted."""
+        k = min(k, self.n - (exclude is not None))
+        chosen = {}
+        attempts = 0
+        while len(chosen) < k:
+            attempts += 1
+            index = self.sample(rng) if attempts <= 10 * k else rng.randrange(self.n)
+            if index != exclude:
+                chosen[index] = None
+        return list(chosen)
+
+    def allocate(self, rng: random.Random, total: int, cap: int) -> Iterator[tuple[int, int]]:
+        """
+        Split `total` over the indexes in rank order, proportionally to weight.
+
+        No index gets more than `cap`; what the head cannot take spills over
+        to the tail, so the counts add up to `total` whenever n * cap allows.
+        """
+        remaining, remaining_weight = total, self.total
+        for rank in range(self.n):
+            if remaining <= 0:
+                return
+            weight = self.weight(rank)
+            expected = remaining * weight / remaining_weight if remaining_weight > 0 else remaining
+            count = min(int(expected + rng.random()), cap, remaining)
+            remaining -= count
+            remaining_weight -= weight
+            if count:
+                yield self.index(rank), count
+
+
+class Synth:
+    """Row generators for one seed and set of table sizes."""
+
+    def __init__(
+        self,
+        seed: int = 42,
+        users: int = 10_000,
+        authors: Optional[int] = None,
+        books: int = 20_000,
+        reviews: int = 200_000,
+        messages: int = 50_000,
+        posts: int = 500,
+        likes: int = 50_000,
+        comments: int = 20_000,
+        shelf_items: int = 100_000,
+        follows: float = 20.0,
+    ):
+        self.seed = seed
+        self.users = max(users, 2)
+        self.books = max(books, 1)
+        self.authors = max(authors if authors is not None else self.books // 20, 1)
+        self.reviews = reviews
+        self.messages = messages
+        self.posts = max(posts, 1)
+        self.likes = likes
+        self.comments = comments
+        self.shelf_items = shelf_items
+        self.follows = follows
+        self.tag = f"{zlib.crc32(str(seed).encode()):08x}"
+
+        self.user_activity = Zipf(self.users, USER_ACTIVITY_SKEW)
+        self.book_popularity = Zipf(self.books, BOOK_POPULARITY_SKEW)
+        self.post_popularity = Zipf(self.posts, POST_POPULARITY_SKEW)
+        # Books are spread over authors up front so both tables agree
+        rng = self._rng("book-authors")
+        author_output = Zipf(self.authors, AUTHOR_OUTPUT_SKEW)
+        self.book_authors = array("I", (author_output.sample(rng) for _ in range(self.books)))
+
+    def _rng(self, name: str) -> random.Random:
+        # String seeds are hashed with SHA-512, so streams are stable across runs
+        return random.Random(f"{self.seed}:{name}")
+
+    def _time(self, rng: random.Random) -> datetime:
+        return START + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+
+    # Ids are unique per seed; users need UUIDs for the Postgres `profiles` table
+    def user_id(self, i: int) -> str:
+        return f"{self.tag}-0000-4000-8000-{i:012x}"
+
+    def _id(self, kind: str, i: int) -> str:
+        return f"s{self.seed}{kind}{i}"
+
+    @staticmethod
+    def user_name(i: int) -> str:
+        return f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[i // len(FIRST_NAMES) % len(LAST_NAMES)]}"
+
+    @staticmethod
+    def author_name(i: int) -> str:
+        first = FIRST_NAMES[(i * 7 + 3) % len(FIRST_NAMES)]
+        last = LAST_NAMES[(i * 11 + 5) % len(LAST_NAMES)]
+        return f"{first} {last} {i}" if i >= len(FIRST_NAMES) * len(LAST_NAMES) else f"{first} {last}"
+
+    def follow_graph(self) -> tuple[array, array, array, array]:
+        """
+        Follow edges as (following offsets, targets, follower offsets, sources).
+
+        Each user follows an exponentially distributed number of accounts
+        (mean `follows`), picked by a power law over users.
+        """
+        rng = self._rng("follows")
+        popularity = Zipf(self.users, FOLLOW_SKEW)
+        out_offsets, targets = array("Q", [0]), array("I")
+        in_degree = array("I", [0]) * self.users
+        for user in range(self.users):
+            degree = int(rng.expovariate(1 / self.follows)) if self.follows > 0 else 0
+            for target in popularity.distinct(rng, min(degree, self.users // 2), exclude=user):
+                targets.append(target)
+                in_degree[target] += 1
+            out_offsets.append(len(targets))
+
+        in_offsets = array("Q", [0])
+        for degree in in_degree:
+            in_offsets.append(in_offsets[-1] + degree)
+        sources = array("I", [0]) * len(targets)
+        position = array("Q", in_offsets[:-1])
+        for user in range(self.users):
+            for edge in range(out_offsets[user], out_offsets[user + 1]):
+                target = targets[edge]
+                sources[position[target]] = user
+                position[target] += 1
+        return out_offsets, targets, in_offsets, sources
+
+    def user_rows(self) -> Iterator[dict]:
+        rng = self._rng("users")
+        out_offsets, targets, in_offsets, sources = self.follow_graph()
+        for i in range(self.users):
+            joined = self._time(rng)
+            yield {
+                "id": self.user_id(i),
+                "email": f"user{i}.{self.tag}@synth.booknook.test",
+                "name": self.user_name(i),
+                "avatar_url": f"https://i.pravatar.cc/150?u={self.tag}{i}",
+                "bio": f"Reads mostly {rng.choice(GENRES).lower()}.",
+                "is_admin": False,
+                "is_active": True,
+                "joined_date": joined.strftime("%b %Y"),
+                "age": rng.randint(16, 80),
+                "nickname": None,
+                "profile_completed": True,
+                "following": [self.user_id(t) for t in targets[out_offsets[i]:out_offsets[i + 1]]],
+                "followers": [self.user_id(s) for s in sources[in_offsets[i]:in_offsets[i + 1]]],
+                "created_at": joined,
+            }
+
+    def author_rows(self) -> Iterator[dict]:
+        rng = self._rng("authors")
+        top_books = [[] for _ in range(self.authors)]
+        for book, author in enumerate(self.book_authors):
+            if len(top_books[author]) < 6:
+                top_books[author].append(self._id("b", book))
+        for i in range(self.authors):
+            born = rng.randint(1900, 2000)
+            yield {
+                "id": self._id("a", i),
+                "name": self.author_name(i),
+                "image_url": f"https://picsum.photos/seed/{self._id('a', i)}/400/400",
+                "bio": f"Writes {rng.choice(GENRES).lower()} about {rng.choice(WORDS)}s and {rng.choice(WORDS)}s.",
+                "born": str(born),
+                "died": str(born + rng.randint(40, 95)) if born < 1940 and rng.random() < 0.6 else None,
+                "top_book_ids": top_books[i],
+            }
+
+    def book_rows(self) -> Iterator[dict]:
+        rng = self._rng("books")
+        for i in range(self.books):
+            yield {
+                "id": self._id("b", i),
+                "title": f"The {rng.choice(WORDS).title()} of {rng.choice(WORDS).title()}",
+                "author": self.author_name(self.book_authors[i]),
+                "publisher": f"{rng.choice(LAST_NAMES)} Press",
+                "cover_url": f"https://picsum.photos/seed/{self._id('b', i)}/300/450",
+                "description": " ".join(rng.choices(WORDS, k=40)).capitalize() + ".",
+                # Skewed towards recent years
+                "published_year": 2025 - int(rng.expovariate(1 / 15)) % 125,
+                "genres": rng.sample(GENRES, rng.randint(1, 3)),
+            }
+
+    def price_option_rows(self) -> Iterator[dict]:
+        rng = self._rng("price-options")
+        for i in range(self.books):
+            for j, vendor in enumerate(rng.sample(VENDORS, rng.randint(1, len(VENDORS)))):
+                yield {
+                    "id": f"{self._id('po', i)}-{j}",
+                    "book_id": self._id("b", i),
+                    "vendor": vendor,
+                    "price": round(rng.uniform(2.99, 29.99), 2),
+                    "url": "#",
+                    "in_stock": rng.random() < 0.9,
+                }
+
+    def review_rows(self) -> Iterator[dict]:
+        rng = self._rng("reviews")
+        cap = min(MAX_REVIEWS_PER_USER, max(self.books // 2, 1))
+        i = 0
+        for user, count in self.user_activity.allocate(rng, self.reviews, cap):
+            for book in self.book_popularity.distinct(rng, count):
+                created = self._time(rng)
+                yield {
+                    "id": self._id("r", i),
+                    "book_id": self._id("b", book),
+                    "user_id": self.user_id(user),
+                    "user_name": self.user_name(user),
+                    "rating": rng.choices(range(1, 6), RATING_WEIGHTS)[0],
+                    "content": rng.choice(REVIEW_LINES),
+                    "date": created.strftime("%b %d, %Y"),
+                    "is_approved": 1,
+                    "created_at": created,
+                }
+                i += 1
+
+    def message_rows(self) -> Iterator[dict]:
+        rng = self._rng("messages")
+        pairs = max(min(self.messages // MESSAGES_PER_PAIR, self.users * (self.users - 1) // 2), 1)
+        senders = array("I", (self.user_activity.sample(rng) for _ in range(pairs)))
+        receivers = array("I", (self.user_activity.distinct(rng, 1, exclude=s)[0] for s in senders))
+        conversations = Zipf(pairs, DM_PAIR_SKEW)
+        step = SPAN_SECONDS / max(self.messages, 1)
+        for i in range(self.messages):
+            pair = conversations.sample(rng)
+            sender, receiver = senders[pair], receivers[pair]
+            if rng.random() < 0.5:
+                sender, receiver = receiver, sender
+            created = START + timedelta(seconds=i * step)
+            yield {
+                "id": self._id("m", i),
+                "sender_id": self.user_id(sender),
+                "receiver_id": self.user_id(receiver),
+                "content": rng.choice(MESSAGE_LINES),
+                "timestamp": created.strftime("%I:%M %p"),
+                # Everything but the last few percent has been read
+                "read": i < self.messages * 0.97,
+                "created_at": created,
+            }
+
+    def post_rows(self) -> Iterator[dict]:
+        rng = self._rng("posts")
+        for i in range(self.posts):
+            created = self._time(rng)
+            title = f"{rng.randint(3, 10)} {rng.choice(WORDS).title()} Books for {rng.choice(GENRES)} Fans"
+            yield {
+                "id": self._id("p", i),
+                "type": rng.choice(POST_TYPES),
+                "title": title,
+                "excerpt": f"{title}, picked by the editors.",
+                "content": "\n\n".join(" ".join(rng.choices(WORDS, k=60)).capitalize() + "." for _ in range(4)),
+                "author": "BookNook Editorial",
+                "date": created.strftime("%b %d, %Y"),
+                "image_url": f"https://picsum.photos/seed/{self._id('p', i)}/800/400",
+                "tags": rng.sample(GENRES, 2),
+                "is_approved": 1,
+                "created_at": created,
+            }
+
+    def like_rows(self) -> Iterator[dict]:
+        rng = self._rng("likes")
+        cap = min(MAX_LIKES_PER_USER, self.posts)
+        i = 0
+        for user, count in self.user_activity.allocate(rng, self.likes, cap):
+            for post in self.post_popularity.distinct(rng, count):
+                yield {
+                    "id": self._id("l", i),
+                    "user_id": self.user_id(user),
+                    "post_id": self._id("p", post),
+                    "created_at": self._time(rng),
+                }
+                i += 1
+
+    def comment_rows(self) -> Iterator[dict]:
+        rng = self._rng("comments")
+        last_comment = {}  # post -> latest comment id, for replies
+        step = SPAN_SECONDS / max(self.comments, 1)
+        for i in range(self.comments):
+            post = self.post_popularity.sample(rng)
+            comment_id = self._id("c", i)
+            parent = last_comment.get(post) if rng.random() < REPLY_RATE else None
+            last_comment[post] = comment_id
+            yield {
+                "id": comment_id,
+                "user_id": self.user_id(self.user_activity.sample(rng)),
+                "post_id": self._id("p", post),
+                "parent_id": parent,
+                "content": rng.choice(REVIEW_LINES),
+                # Increasing, so a reply is always newer than its parent
+                "created_at": START + timedelta(seconds=i * step),
+            }
+
+    def shelf_rows(self) -> Iterator[dict]:
+        """The three standard shelves for every user."""
+        rng = self._rng("shelves")
+        for i in range(self.users):
+            for index, (shelf_type, name) in enumerate(SHELVES):
+                yield {
+                    "id": f"{self._id('sh', i)}-{index}",
+                    "user_id": self.user_id(i),
+                    "name": name,
+                    "type": shelf_type.value,
+                    "is_public": rng.random() < 0.9,
+                    "created_at": self._time(rng),
+                }
+
+    def shelf_item_rows(self) -> Iterator[dict]:
+        rng = self._rng("shelf-items")
+        cap = min(MAX_SHELVED_PER_USER, self.books)
+        i = 0
+        for user, count in self.user_activity.allocate(rng, self.shelf_items, cap):
+            for book in self.book_popularity.distinct(rng, count):
+                yield {
+                    "id": self._id("si", i),
+                    "shelf_id": f"{self._id('sh', user)}-{rng.randrange(len(SHELVES))}",
+                    "book_id": self._id("b", book),
+                    "added_at": self._time(rng),
+                }
+                i += 1
+
+    def tables(self) -> dict:
+        """Row generator for each model."""
+        return {
+            User: self.user_rows,
+            Author: self.author_rows,
+            Book: self.book_rows,
+            PriceOption: self.price_option_rows,
+            Review: self.review_rows,
+            Message: self.message_rows,
+            Post: self.post_rows,
+            Like: self.like_rows,
+            Comment: self.comment_rows,
+            Shelf: self.shelf_rows,
+            ShelfItem: self.shelf_item_rows,
+        }
+
+
+def generate(
+    seed: int = 42,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    **sizes,
+):
+    """Generate and load a synthetic dataset; `sizes` are Synth's table sizes."""
+    init_db()
+    started = time.perf_counter()
+    synth = Synth(seed=seed, **sizes)
+
+    def load(model, rows):
+        return bulk_load(model, rows(), batch_size=batch_size)
+
+    jobs = {model: partial(load, model, rows) for model, rows in synth.tables().items()}
+    stages = load_order(jobs)
+    print(f"🧪 Generating seed {seed}: {' → '.join(', '.join(m.__tablename__ for m in stage) for stage in stages)}")
+    results = run_stages(jobs, workers=workers)
+    invalidate_after_load()
+
+    elapsed = time.perf_counter() - started
+    total_rows = sum(s.rows for s in results)
+    print("\n🎉 Synthetic data loaded!")
+    print(f"   📊 {total_rows} rows in {elapsed:.2f}s ({total_rows / elapsed if elapsed else 0:,.0f} rows/s)")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a deterministic, skewed BookNook dataset for scale testing.")
+    parser.add_argument("--seed", type=int, default=42, help="Same seed, same data (default: 42)")
+    parser.add_argument("--users", type=_count, default=10_000)
+    parser.add_argument("--authors", type=_count, default=None, help="Default: books / 20")
+    parser.add_argument("--books", type=_count, default=20_000)
+    parser.add_argument("--reviews", type=_count, default=200_000)
+    parser.add_argument("--messages", type=_count, default=50_000)
+    parser.add_argument("--posts", type=_count, default=500)
+    parser.add_argument("--likes", type=_count, default=50_000)
+    parser.add_argument("--comments", type=_count, default=20_000)
+    parser.add_argument("--shelf-items", type=_count, default=100_000, help="Books on users' shelves")
+    parser.add_argument("--follows", type=float, default=20.0, help="Mean accounts followed per user")
+    parser.add_argument("--batch-size", type=_count, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT on SQLite")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Tables loaded in parallel per stage")
+    args = parser.parse_args()
+    generate(
+        seed=args.seed,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        users=args.users,
+        authors=args.authors,
+        books=args.books,
+        reviews=args.reviews,
+        messages=args.messages,
+        posts=args.posts,
+        likes=args.likes,
+        comments=args.comments,
+        shelf_items=args.shelf_items,
+        follows=args.follows,
+    )
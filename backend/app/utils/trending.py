@@ -0,0 +1,133 @@
+"""
+Compact or rebuild trending scores (see app.services.trending).
+
+Compaction rebases scores to now and drops decayed items; the API also runs
+it in-process every TRENDING_COMPACT_INTERVAL_SECONDS, so run it from cron
+only when that is disabled.
+
+A rebuild replays recent reviews, shelf adds and likes into fresh scores.
+Run it after bulk loads (seed, import_csv, synth), whose rows never went
+through the API.
+
+Usage:
+    python -m app.utils.trending
+    python -m app.utils.trending --rebuild --days 14
+"""
+import argparse
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import delete, insert, select
+
+from app.config import get_settings
+from app.database import SessionLocal, init_db
+from app.models.interaction import Like
+from app.models.review import Review
+from app.models.shelf import ShelfItem
+from app.models.trending import TrendingScore
+from app.services.cache import invalidate_tags
+from app.services.trending import (
+    BOOK, LANDMARK, LIKE_WEIGHT, POST, REVIEW_WEIGHT, SHELF_WEIGHT, compact, growth,
+)
+from app.services.versions import bump_version
+from app.utils.bulk import DEFAULT_BATCH_SIZE, chunked
+
+settings = get_settings()
+
+READ_CHUNK_ROWS = 10_000
+DEFAULT_DAYS = 7
+
+# (kind, weight, item id column, event time column) per replayed table
+EVENTS = [
+    (BOOK, REVIEW_WEIGHT, Review.book_id, Review.created_at),
+    (BOOK, SHELF_WEIGHT, ShelfItem.book_id, ShelfItem.added_at),
+    (POST, LIKE_WEIGHT, Like.post_id, Like.created_at),
+]
+
+
+def rebuild_trending(days: int = DEFAULT_DAYS, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Replace trending scores with the decayed events of the last `days` days."""
+    init_db()
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=days)
+
+    scores = defaultdict(float)
+    db = SessionLocal()
+    db.info["read_only"] = True
+    try:
+        for kind, weight, item_column, time_column in EVENTS:
+            rows = db.execute(
+                select(item_column, time_column)
+                .where(time_column >= since)
+                .execution_options(yield_per=READ_CHUNK_ROWS)
+            )
+            for item_id, at in rows:
+                at = at if at.tzinfo else at.replace(tzinfo=timezone.utc)
+                scores[kind, item_id] += weight * growth(at - now)
+    finally:
+        db.close()
+    scored = [
+        {"kind": kind, "item_id": item_id, "score": score}
+        for (kind, item_id), score in scores.items()
+        if score >= settings.TRENDING_MIN_SCORE
+    ]
+    print(f"📈 {len(scored)} items scored from the last {days} days")
+
+    db = SessionLocal()
+    try:
+        db.execute(delete(TrendingScore))
+        for batch in chunked(scored, batch_size):
+            db.execute(insert(TrendingScore), batch)
+        # Scores above are relative to `now`; the bumped landmark is a few
+        # milliseconds later, which shifts them by a negligible factor
+        bump_version(db, LANDMARK)
+        db.commit()
+    except Exception as e:
+        print(f"❌ Error rebuilding trending scores: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    invalidate_tags("trending")
+
+    # Apply the usual pruning (deleted books, unapproved posts, size cap)
+    compact_trending()
+    print(f"\n🎉 Trending rebuilt in {time.perf_counter() - started:.2f}s")
+    return len(scored)
+
+
+def compact_trending():
+    """Rebase scores to now and prune them."""
+    init_db()
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        compact(db)
+        remaining = db.query(TrendingScore).count()
+    except Exception as e:
+        print(f"❌ Error compacting trending scores: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    print(f"🧹 Trending compacted to {remaining} items in {time.perf_counter() - started:.2f}s")
+    return remaining
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact or rebuild trending scores.")
+    parser.add_argument("--rebuild", action="store_true", help="Replay recent events into fresh scores")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="Days of events replayed by --rebuild")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT")
+    args = parser.parse_args()
+    if args.rebuild:
+        rebuild_trending(days=args.days, batch_size=args.batch_size)
+    else:
+        compact_trending()
@@ -0,0 +1,403 @@
+"""
+API benchmark for the hot request paths.
+
+Runs the ASGI app in-process (httpx's ASGITransport, no network) against a
+synthetic dataset from app.utils.synth at one or more scales, and reports
+p50/p95/p99 latency, requests per second and queries per request for:
+book list, book search, shelves, the feed, batch likes, a conversation,
+admin dashboard stats and auth (`/auth/me`).
+
+Query counts come from the Server-Timing header MetricsMiddleware adds.
+The response cache is swapped for a no-op backend unless --cache is given,
+so every request reaches the database.
+
+Each (database, scale) pair runs in its own subprocess, since the engine is
+bound to DATABASE_URL at import. SQLite runs in a throwaway file. A Postgres
+URL must point at a disposable database and needs --reset, because every
+table is dropped and recreated.
+
+The JSON report can be saved as a baseline; with --baseline the run exits
+with status 1 when an endpoint's p95 latency grows by more than
+--tolerance, or it issues more queries per request than before. Latency
+baselines are only comparable on the same machine.
+
+Usage:
+    python -m benchmarks.api
+    python -m benchmarks.api --scales small medium --report report.json
+    python -m benchmarks.api --save-baseline benchmarks/baseline.json
+    python -m benchmarks.api --baseline benchmarks/baseline.json
+    python -m benchmarks.api --database-url postgresql://localhost/booknook_bench --reset
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+SEED = 7
+
+# Synth table sizes per scale
+SCALES = {
+    "small": dict(
+        users=1_000, books=2_000, reviews=10_000, messages=5_000, posts=100,
+        likes=5_000, comments=2_000, shelf_items=10_000,
+    ),
+    "medium": dict(
+        users=10_000, books=20_000, reviews=200_000, messages=50_000, posts=500,
+        likes=50_000, comments=20_000, shelf_items=100_000,
+    ),
+    "large": dict(
+        users=100_000, books=100_000, reviews=1_000_000, messages=250_000, posts=2_000,
+        likes=250_000, comments=100_000, shelf_items=500_000,
+    ),
+}
+
+ENDPOINTS = [
+    "auth", "book_list", "book_search", "shelves",
+    "feed", "batch_likes", "conversation", "dashboard",
+]
+
+FEED_ACTORS = 300  # Accounts that publish an activity before the run
+SAMPLE_USERS = 20  # Distinct callers, from the most to the least active
+BATCH_LIKES = 20  # Posts per batch likes request
+NOISE_FLOOR_MS = 1.0  # p95 changes smaller than this never count as regressions
+
+ADMIN_ID = "00000000-0000-4000-8000-00000000be4c"
+ADMIN_EMAIL = "bench-admin@booknook.com"
+
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Linear-interpolated percentile (0-100) of an already sorted list."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(latencies: list[float], queries: list[int], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "queries_per_request": round(statistics.fmean(queries), 2) if queries else None,
+    }
+
+
+# Worker: load one dataset and time every endpoint against it
+
+def prepare(scale: str) -> dict:
+    """
+    Create the schema, load the dataset and pick callers and request targets.
+
+    Every model must be imported (app.main does) before this runs, so
+    `create_all` sees all tables.
+    """
+    from sqlalchemy import func, select
+
+    from app.database import Base, SessionLocal, engine
+    from app.models.message import Message
+    from app.models.user import User
+    from app.services.auth import create_access_token, create_admin_access_token
+    from app.services.feed import publish_activity
+    from app.utils.synth import FOLLOW_SKEW, WORDS, Synth, Zipf, generate
+
+    sizes = SCALES[scale]
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    generate(seed=SEED, **sizes)
+
+    synth = Synth(seed=SEED, **sizes)
+    ranks = sorted({min(int(synth.users * (i / SAMPLE_USERS) ** 3), synth.users - 1) for i in range(SAMPLE_USERS)})
+    users = [synth.user_id(synth.user_activity.index(rank)) for rank in ranks]
+
+    db = SessionLocal()
+    try:
+        db.add(User(
+            id=ADMIN_ID,
+            email=ADMIN_EMAIL,
+            name="Bench Admin",
+            is_admin=True,
+            is_active=True,
+            following=[],
+            followers=[],
+        ))
+        db.commit()
+
+        # Give timelines something to read: the most followed accounts
+        # (celebrity path) and a spread of ordinary ones post a review
+        followed = Zipf(synth.users, FOLLOW_SKEW)
+        step = max(synth.users // FEED_ACTORS, 1)
+        actors = dict.fromkeys(
+            [followed.index(rank) for rank in range(min(FEED_ACTORS // 3, synth.users))]
+            + list(range(0, synth.users, step))[:FEED_ACTORS]
+        )
+        for index, actor_index in enumerate(actors):
+            actor = db.get(User, synth.user_id(actor_index))
+            publish_activity(
+                db, actor, "review", "review", f"bench-r{index}",
+                payload={"book_id": synth._id("b", 0), "book_title": "Benchmark", "rating": 4, "content": ""},
+            )
+
+        pairs = db.execute(
+            select(Message.sender_id, Message.receiver_id)
+            .group_by(Message.sender_id, Message.receiver_id)
+            .order_by(func.count().desc(), Message.sender_id, Message.receiver_id)
+            .limit(SAMPLE_USERS)
+        ).all()
+    finally:
+        db.close()
+
+    def token(user_id: str) -> dict:
+        return {"Authorization": f"Bearer {create_access_token({'sub': user_id, 'email': f'{user_id}@example.com'})}"}
+
+    posts = [synth._id("p", synth.post_popularity.index(rank)) for rank in range(min(BATCH_LIKES, synth.posts))]
+    return {
+        "users": users,
+        "user_headers": [token(user_id) for user_id in users],
+        "pairs": [(token(sender), receiver) for sender, receiver in pairs],
+        "admin_headers": {
+            "Authorization": f"Bearer {create_admin_access_token({'sub': ADMIN_ID, 'email': ADMIN_EMAIL})}",
+        },
+        "posts": posts,
+        "terms": WORDS,
+        "books": synth.books,
+    }
+
+
+def requests_for(name: str, fixtures: dict, i: int) -> tuple[str, str, dict, dict]:
+    """(method, url, headers, json body) of the i-th request to an endpoint."""
+    users, user_headers = fixtures["users"], fixtures["user_headers"]
+    caller = i % len(users)
+    if name == "auth":
+        return "GET", "/auth/me", user_headers[caller], None
+    if name == "book_list":
+        return "GET", f"/books?skip={(i * 97) % max(fixtures['books'] - 50, 1)}&limit=50", {}, None
+    if name == "book_search":
+        terms = fixtures["terms"]
+        return "GET", f"/books?search={terms[(i * 7) % len(terms)]}&limit=20", {}, None
+    if name == "shelves":
+        return "GET", f"/shelves/user/{users[caller]}", {}, None
+    if name == "feed":
+        return "GET", "/feed?limit=20", user_headers[caller], None
+    if name == "batch_likes":
+        return "POST", "/posts/batch/likes", user_headers[caller], {"post_ids": fixtures["posts"]}
+    if name == "conversation":
+        headers, other = fixtures["pairs"][i % len(fixtures["pairs"])]
+        return "GET", f"/messages/conversation/{other}", headers, None
+    if name == "dashboard":
+        return "GET", "/admin/dashboard/stats", fixtures["admin_headers"], None
+    raise ValueError(f"Unknown endpoint: {name}")
+
+
+async def measure(client, name: str, fixtures: dict, requests: int, warmup: int) -> dict:
+    for i in range(warmup):
+        method, url, headers, body = requests_for(name, fixtures, i)
+        await client.request(method, url, headers=headers, json=body)
+
+    latencies, queries, errors = [], [], 0
+    started = time.perf_counter()
+    for i in range(warmup, warmup + requests):
+        method, url, headers, body = requests_for(name, fixtures, i)
+        request_started = time.perf_counter()
+        response = await client.request(method, url, headers=headers, json=body)
+        latencies.append(time.perf_counter() - request_started)
+        if response.status_code >= 400:
+            errors += 1
+        match = _QUERIES.search(response.headers.get("server-timing", ""))
+        if match:
+            queries.append(int(match.group(1)))
+    return summarize(latencies, queries, errors, time.perf_counter() - started)
+
+
+async def run_endpoints(app, fixtures: dict, endpoints: list[str], requests: int, warmup: int) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return {name: await measure(client, name, fixtures, requests, warmup) for name in endpoints}
+
+
+def worker(args) -> None:
+    from app.main import app
+    from app.services import cache
+
+    class NoCache(cache.CacheBackend):
+        """Stores nothing, so every request reaches the database."""
+
+        name = "none"
+
+        def get(self, key):
+            return None
+
+        def set(self, key, value, ttl, tags=()):
+            pass
+
+        def invalidate_tags(self, tags):
+            return 0
+
+        def clear(self):
+            pass
+
+    if not args.cache:
+        cache.set_backend(NoCache())
+
+    fixtures = prepare(args.scale)
+    results = asyncio.run(run_endpoints(app, fixtures, args.endpoints, args.requests, args.warmup))
+    Path(args.output).write_text(json.dumps(results))
+
+
+# Parent: one worker per (database, scale), then report and compare
+
+def database_label(url: str) -> str:
+    return url.split(":", 1)[0].split("+", 1)[0]
+
+
+def run_worker(url: str, scale: str, args) -> dict:
+    with tempfile.TemporaryDirectory(prefix="booknook-bench-") as tmp:
+        if url is None:
+            url = f"sqlite:///{Path(tmp) / f'bench-{scale}.db'}"
+        output = Path(tmp) / "results.json"
+        command = [
+            sys.executable, "-m", "benchmarks.api", "--worker",
+            "--scale", scale,
+            "--output", str(output),
+            "--requests", str(args.requests),
+            "--warmup", str(args.warmup),
+            "--endpoints", *args.endpoints,
+        ]
+        if args.cache:
+            command.append("--cache")
+        print(f"🏁 {database_label(url)} / {scale}")
+        log = None if args.verbose else subprocess.DEVNULL
+        started = time.perf_counter()
+        subprocess.run(
+            command, cwd=BACKEND_DIR, env={**os.environ, "DATABASE_URL": url},
+            stdout=log, check=True,
+        )
+        print(f"   done in {time.perf_counter() - started:.1f}s")
+        return json.loads(output.read_text())
+
+
+def print_results(label: str, scale: str, results: dict) -> None:
+    print(f"\n📊 {label} / {scale}")
+    print(f"   {'endpoint':<14}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'queries':>9}{'errors':>8}")
+    for name, stats in results.items():
+        queries = stats["queries_per_request"]
+        print(
+            f"   {name:<14}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+            f"{stats['rps']:>9.1f}{queries if queries is not None else '-':>9}{stats['errors']:>8}"
+        )
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Describe every endpoint that got slower or chattier than the baseline."""
+    regressions = []
+    for label, scales in report["results"].items():
+        for scale, endpoints in scales.items():
+            base_endpoints = baseline.get("results", {}).get(label, {}).get(scale, {})
+            for name, stats in endpoints.items():
+                base = base_endpoints.get(name)
+                if base is None:
+                    continue
+                where = f"{label}/{scale}/{name}"
+                limit = base["p95_ms"] * (1 + tolerance)
+                if stats["p95_ms"] > limit and stats["p95_ms"] - base["p95_ms"] > NOISE_FLOOR_MS:
+                    regressions.append(f"{where}: p95 {stats['p95_ms']:.2f} ms > {base['p95_ms']:.2f} ms +{tolerance:.0%}")
+                queries, base_queries = stats["queries_per_request"], base["queries_per_request"]
+                if queries is not None and base_queries is not None and queries > base_queries + 0.01:
+                    regressions.append(f"{where}: {queries} queries/request > {base_queries}")
+                if stats["errors"] > base["errors"]:
+                    regressions.append(f"{where}: {stats['errors']} errors > {base['errors']}")
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", action="append", help="Database to benchmark; repeatable (default: a temporary SQLite file)")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small"])
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per endpoint first")
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache enabled")
+    parser.add_argument("--reset", action="store_true", help="Allow dropping every table in a non-SQLite database")
+    parser.add_argument("--report", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Fail if results regress against this report")
+    parser.add_argument("--save-baseline", help="Also write the report here, as the next baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 growth (default: 0.25 = 25%%)")
+    parser.add_argument("--verbose", action="store_true", help="Show the workers' output")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--scale", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    urls = args.database_url or [None]
+    for url in urls:
+        if url is not None and not url.startswith("sqlite") and not args.reset:
+            parser.error(f"{url} would have every table dropped; pass --reset to confirm")
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"requests": args.requests, "warmup": args.warmup, "cache": args.cache, "seed": SEED},
+        "results": {},
+    }
+    for url in urls:
+        label = database_label(url) if url else "sqlite"
+        for scale in args.scales:
+            results = run_worker(url, scale, args)
+            report["results"].setdefault(label, {})[scale] = results
+            print_results(label, scale, results)
+
+    for path in (args.report, args.save_baseline):
+        if path:
+            Path(path).write_text(json.dumps(report, indent=2) + "\n")
+            print(f"\n💾 Report written to {path}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+Load generator replaying weighted user journeys against a running server.
+
+Unlike benchmarks.api, this goes over real HTTP to a running uvicorn, so
+connection pool exhaustion, lock waits and other contention show up.
+Each virtual user session picks one journey by weight:
+
+    browse_books   two catalog pages, sometimes filtered by genre
+    open_book      a book's page
+    read_reviews   a book's reviews, then a reviewer's profile
+    like_posts     the posts list, their like counts, then toggle a like
+    send_dm        a conversation, then a new message in it
+    shelve_book    the caller's shelves, then add a book to one of them
+
+Books and posts are picked with a popularity skew. Callers are existing
+users (GET /users), signed in with tokens minted from this backend's
+SECRET_KEY, so the server must share its .env.
+
+Two workload models:
+- Open (--rate): sessions arrive as a Poisson process, whether or not
+  earlier ones finished. Latency counts from the scheduled arrival, so
+  queueing delay is not hidden. Arrivals beyond --concurrency sessions in
+  flight are dropped and reported.
+- Closed (no --rate): --concurrency virtual users run journeys back to
+  back.
+
+The summary has latency percentiles, throughput and error rates per
+journey and per request. Journey latency excludes think time.
+
+Usage:
+    uvicorn app.main:app --workers 4 &
+    python -m benchmarks.load --rate 50 --duration 60
+    python -m benchmarks.load --concurrency 32 --duration 30 --think-time 0
+    python -m benchmarks.load --rate 20 --journeys send_dm=1 shelve_book=1 --report load.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from itertools import accumulate
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from benchmarks.api import percentile
+
+DEFAULT_WEIGHTS = {
+    "browse_books": 30,
+    "open_book": 25,
+    "read_reviews": 15,
+    "like_posts": 12,
+    "send_dm": 8,
+    "shelve_book": 10,
+}
+
+CATALOG_BOOKS = 2000  # Books fetched up front to pick from
+CATALOG_POSTS = 200
+CATALOG_USERS = 1000
+PAGE_SIZE = 20
+GENRES = ["Fantasy", "Horror", "Mystery", "Romance", "Sci-Fi", "Thriller"]
+
+
+class JourneyFailed(Exception):
+    """A request in a journey failed; the rest of the journey is skipped."""
+
+
+class Skewed:
+    """Pick list items with P(rank r) proportional to 1 / (r + 1)."""
+
+    def __init__(self, items: list):
+        self.items = items
+        self.cumulative = list(accumulate(1 / (rank + 1) for rank in range(len(items))))
+
+    def pick(self, rng: random.Random):
+        return rng.choices(self.items, cum_weights=self.cumulative)[0]
+
+
+class Recorder:
+    """Collects journey and request outcomes for the summary."""
+
+    def __init__(self):
+        self.journeys = defaultdict(list)  # name -> latencies of successful journeys
+        self.journey_errors = defaultdict(Counter)  # name -> error kind -> count
+        self.requests = defaultdict(list)  # route -> latencies
+        self.request_errors = defaultdict(Counter)
+        self.dropped = 0
+
+    def summary(self, elapsed: float) -> dict:
+        def stats(latencies: list[float], errors: Counter) -> dict:
+            ordered = sorted(latencies)
+            failed = sum(errors.values())
+            total = len(ordered) + failed
+            result = {
+                "count": total,
+                "errors": failed,
+                "error_rate": round(failed / total, 4) if total else 0.0,
+                "per_second": round(total / elapsed, 2) if elapsed else 0.0,
+                "error_kinds": dict(errors.most_common()),
+            }
+            if ordered:
+                result.update({
+                    "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+                    "p95_ms": round(percentile(ordered, 95) * 1000, 1),
+                    "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+                    "max_ms": round(ordered[-1] * 1000, 1),
+                })
+            return result
+
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "dropped_arrivals": self.dropped,
+            "journeys": {
+                name: stats(self.journeys[name], self.journey_errors[name])
+                for name in sorted(set(self.journeys) | set(self.journey_errors))
+            },
+            "requests": {
+                route: stats(self.requests[route], self.request_errors[route])
+                for route in sorted(set(self.requests) | set(self.request_errors))
+            },
+        }
+
+
+class VirtualUser:
+    """One session: a caller, its auth header and the shared catalog."""
+
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random, catalog: dict, recorder: Recorder, think_time: float):
+        self.client = client
+        self.rng = rng
+        self.catalog = catalog
+        self.recorder = recorder
+        self.think_time = think_time
+        self.user_id, self.headers = rng.choice(catalog["callers"])
+        self.thinking = 0.0  # Seconds slept, excluded from journey latency
+
+    async def request(self, route: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError as e:
+            kind = type(e).__name__
+            self.recorder.request_errors[route][kind] += 1
+            raise JourneyFailed(kind) from e
+        if response.status_code >= 400:
+            kind = f"HTTP {response.status_code}"
+            self.recorder.request_errors[route][kind] += 1
+            raise JourneyFailed(kind)
+        self.recorder.requests[route].append(time.perf_counter() - started)
+        return response
+
+    async def think(self):
+        if self.think_time > 0:
+            pause = self.rng.expovariate(1 / self.think_time)
+            self.thinking += pause
+            await asyncio.sleep(pause)
+
+    def book(self) -> str:
+        return self.catalog["books"].pick(self.rng)
+
+    # Journeys
+
+    async def browse_books(self):
+        genre = f"&genre={self.rng.choice(GENRES)}" if self.rng.random() < 0.3 else ""
+        skip = self.rng.randrange(0, max(len(self.catalog["books"].items) - 2 * PAGE_SIZE, 1), PAGE_SIZE)
+        await self.request("GET /books", "GET", f"/books?skip={skip}&limit={PAGE_SIZE}{genre}")
+        await self.think()
+        await self.request("GET /books", "GET", f"/books?skip={skip + PAGE_SIZE}&limit={PAGE_SIZE}{genre}")
+
+    async def open_book(self):
+        await self.request("GET /books/{id}", "GET", f"/books/{self.book()}")
+
+    async def read_reviews(self):
+        response = await self.request("GET /reviews/book/{id}", "GET", f"/reviews/book/{self.book()}")
+        reviews = response.json()
+        if reviews:
+            await self.think()
+            reviewer = self.rng.choice(reviews)["user_id"]
+            await self.request("GET /users/{id}", "GET", f"/users/{reviewer}")
+
+    async def like_posts(self):
+        response = await self.request("GET /posts", "GET", f"/posts?limit={PAGE_SIZE}")
+        post_ids = [post["id"] for post in response.json()]
+        if not post_ids:
+            return
+        await self.request("POST /posts/batch/likes", "POST", "/posts/batch/likes", json={"post_ids": post_ids})
+        await self.think()
+        post_id = self.catalog["posts"].pick(self.rng) if self.catalog["posts"].items else post_ids[0]
+        await self.request("POST /posts/{id}/like", "POST", f"/posts/{post_id}/like")
+
+    async def send_dm(self):
+        users = self.catalog["users"]
+        other = users.pick(self.rng)
+        if other == self.user_id:
+            other = users.items[(users.items.index(other) + 1) % len(users.items)]
+        await self.request("GET /messages/conversation/{id}", "GET", f"/messages/conversation/{other}")
+        await self.think()
+        await self.request(
+            "POST /messages", "POST", "/messages",
+            json={"receiver_id": other, "content": "Have you read this one yet?"},
+        )
+
+    async def shelve_book(self):
+        response = await self.request("GET /shelves/user/{id}", "GET", f"/shelves/user/{self.user_id}")
+        shelves = response.json()
+        await self.think()
+        if shelves:
+            shelf_id = self.rng.choice(shelves)["id"]
+        else:
+            response = await self.request("POST /shelves", "POST", "/shelves", json={"name": "Load test", "is_public": True})
+            shelf_id = response.json()["id"]
+        await self.request("POST /shelves/{id}/books", "POST", f"/shelves/{shelf_id}/books", json={"book_id": self.book()})
+
+
+JOURNEYS = {name: getattr(VirtualUser, name) for name in DEFAULT_WEIGHTS}
+
+
+async def run_session(client, rng, catalog, recorder, think_time, journey: str, scheduled: float):
+    """Run one journey and record its latency from the scheduled start."""
+    user = VirtualUser(client, rng, catalog, recorder, think_time)
+    try:
+        await JOURNEYS[journey](user)
+    except JourneyFailed as e:
+        recorder.journey_errors[journey][str(e)] += 1
+        return
+    except Exception as e:  # Malformed responses count against the journey too
+        recorder.journey_errors[journey][type(e).__name__] += 1
+        return
+    recorder.journeys[journey].append(time.perf_counter() - scheduled - user.thinking)
+
+
+async def open_model(client, catalog, recorder, args, rng, pick_journey):
+    """Poisson arrivals at --rate sessions/s, at most --concurrency in flight."""
+    in_flight = set()
+    started = time.perf_counter()
+    scheduled = started
+    while True:
+        scheduled += rng.expovariate(args.rate)
+        if scheduled - started >= args.duration:
+            break
+        await asyncio.sleep(max(scheduled - time.perf_counter(), 0))
+        if len(in_flight) >= args.concurrency:
+            recorder.dropped += 1
+            continue
+        task = asyncio.create_task(run_session(
+            client, random.Random(rng.random()), catalog, recorder, args.think_time, pick_journey(), scheduled,
+        ))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    if in_flight:
+        await asyncio.wait(in_flight)
+
+
+async def closed_model(client, catalog, recorder, args, rng, pick_journey):
+    """--concurrency virtual users, each running journeys back to back."""
+    deadline = time.perf_counter() + args.duration
+
+    async def virtual_user(user_rng):
+        while time.perf_counter() < deadline:
+            await run_session(client, user_rng, catalog, recorder, args.think_time, pick_journey(), time.perf_counter())
+
+    await asyncio.gather(*(virtual_user(random.Random(rng.random())) for _ in range(args.concurrency)))
+
+
+async def load_catalog(client: httpx.AsyncClient) -> dict:
+    """Ids to request, fetched through the API; popular-first order is not assumed."""
+    from app.services.auth import create_access_token
+
+    async def collect(path: str, total: int, page: int) -> list[dict]:
+        items = []
+        while len(items) < total:
+            response = await client.get(path, params={"skip": len(items), "limit": page})
+            response.raise_for_status()
+            batch = response.json()
+            items.extend(batch)
+            if len(batch) < page:
+                break
+        return items
+
+    books = [book["id"] for book in await collect("/books", CATALOG_BOOKS, 100)]
+    posts = [post["id"] for post in await collect("/posts", CATALOG_POSTS, 50)]
+    users = [user["id"] for user in await collect("/users", CATALOG_USERS, 50)]
+    if not books or len(users) < 2:
+        raise SystemExit("❌ The server needs books and at least two users (python -m app.utils.synth)")
+
+    def headers(user: dict) -> dict:
+        return {"Authorization": f"Bearer {create_access_token({'sub': user, 'email': f'{user}@example.com'})}"}
+
+    return {
+        "books": Skewed(books),
+        "posts": Skewed(posts),
+        "users": Skewed(users),
+        "callers": [(user, headers(user)) for user in users],
+    }
+
+
+def print_summary(summary: dict, args) -> None:
+    model = f"open, {args.rate:g} sessions/s" if args.rate else f"closed, {args.concurrency} users"
+    print(f"\n📊 {summary['elapsed_s']}s ({model})")
+    if summary["dropped_arrivals"]:
+        print(f"   ⚠️ {summary['dropped_arrivals']} arrivals dropped at {args.concurrency} sessions in flight")
+    for section in ("journeys", "requests"):
+        print(f"\n   {section[:-1]:<34}{'count':>7}{'/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for name, stats in summary[section].items():
+            print(
+                f"   {name:<34}{stats['count']:>7}{stats['per_second']:>8.1f}"
+                f"{stats.get('p50_ms', 0):>9.1f}{stats.get('p95_ms', 0):>9.1f}{stats.get('p99_ms', 0):>9.1f}"
+                f"{stats['error_rate']:>8.1%}"
+            )
+            for kind, count in stats["error_kinds"].items():
+                print(f"      ❌ {kind}: {count}")
+
+
+def _weight(value: str) -> tuple[str, float]:
+    name, _, weight = value.partition("=")
+    if name not in DEFAULT_WEIGHTS:
+        raise argparse.ArgumentTypeError(f"unknown journey {name!r} (known: {', '.join(DEFAULT_WEIGHTS)})")
+    try:
+        return name, float(weight or 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad weight in {value!r}")
+
+
+async def main_async(args) -> dict:
+    weights = dict(args.journeys) if args.journeys else DEFAULT_WEIGHTS
+    rng = random.Random(args.seed)
+    names, cumulative = list(weights), list(accumulate(weights.values()))
+
+    def pick_journey() -> str:
+        return rng.choices(names, cum_weights=cumulative)[0]
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        catalog = await load_catalog(client)
+        print(
+            f"🚦 {args.base_url}: {len(catalog['books'].items)} books, {len(catalog['posts'].items)} posts, "
+            f"{len(catalog['users'].items)} users; {', '.join(f'{n}={w:g}' for n, w in weights.items())}"
+        )
+        recorder = Recorder()
+        started = time.perf_counter()
+        model = open_model if args.rate else closed_model
+        await model(client, catalog, recorder, args, rng, pick_journey)
+        return recorder.summary(time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rate", type=float, help="Open model: session arrivals per second")
+    parser.add_argument("--concurrency", type=int, default=16, help="Virtual users (closed) or max sessions in flight (open)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load for")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean pause between a journey's requests, in seconds")
+    parser.add_argument("--journeys", nargs="+", type=_weight, metavar="NAME=WEIGHT", help="Journey mix (default: all, realistic weights)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--report", help="Write the JSON summary here")
+    args = parser.parse_args()
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+
+    summary = asyncio.run(main_async(args))
+    print_summary(summary, args)
+    if args.report:
+        Path(args.report).write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"\n💾 Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
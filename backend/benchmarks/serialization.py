@@ -0,0 +1,93 @@
+"""
+Serialization benchmark for list endpoints.
+
+Compares the old list path (per-item `model_validate`, FastAPI's
+re-validation against `response_model`, `jsonable_encoder`-style dict
+conversion and stdlib `json`) with `app.utils.serialization.dump_list`,
+for pages of ORM books with price options.
+
+Usage: python -m benchmarks.serialization [--items 1000] [--repeat 20]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import TypeAdapter
+
+from app.models.book import Book, PriceOption
+from app.schemas.book import BookResponse
+from app.utils.serialization import dump_list
+
+
+def make_books(count: int) -> list[Book]:
+    """Build transient Book rows shaped like the seed data."""
+    books = []
+    for i in range(count):
+        book = Book(
+            id=f"b{i}",
+            title=f"Benchmark Book {i}",
+            author=f"Author {i % 97}",
+            publisher="Reed Ltd Press",
+            cover_url=f"https://picsum.photos/seed/book_b{i}/300/450",
+            description="Skill among organization show. Might former purpose face whatever. " * 3,
+            published_year=1950 + i % 70,
+            genres=["Historical Fiction", "Drama", "Fantasy"][: 1 + i % 3],
+        )
+        book.price_options = [
+            PriceOption(id=f"po-{i}-{v}", book_id=book.id, vendor=vendor, price=9.99 + v, url="#", in_stock=True)
+            for v, vendor in enumerate(["Amazon", "Kindle"])
+        ]
+        books.append(book)
+    return books
+
+
+def old_path(books: list[Book]) -> bytes:
+    """What list endpoints did before: validate, re-validate, encode with json."""
+    items = [BookResponse.model_validate(b) for b in books]
+    # FastAPI: dump returned models, validate against response_model, serialize
+    adapter = TypeAdapter(list[BookResponse])
+    validated = adapter.validate_python([m.model_dump() for m in items])
+    return json.dumps(adapter.dump_python(validated, mode="json")).encode("utf-8")
+
+
+def new_path(books: list[Book]) -> bytes:
+    """Single validation from attributes, encoded by pydantic-core."""
+    return dump_list(BookResponse, books)
+
+
+def measure(fn, books: list[Book], repeat: int) -> list[float]:
+    fn(books)  # Warm-up (adapter construction, imports)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(books)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    books = make_books(args.items)
+    assert json.loads(old_path(books)) == json.loads(new_path(books))
+
+    print(f"📊 Serializing {args.items} books ({args.repeat} runs each)")
+    results = {}
+    for name, fn in (("before", old_path), ("after", new_path)):
+        timings = measure(fn, books, args.repeat)
+        median = statistics.median(timings)
+        results[name] = median
+        print(f"   {name:<7} {median * 1000:8.2f} ms/page  {median / args.items * 1e6:7.2f} µs/item")
+    print(f"   speedup {results['before'] / results['after']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Shared test fixtures.
+
+The suite runs the app against an in-memory SQLite database with query
+budgets enforced, so an endpoint that grows an N+1 fails its tests.
+Settings are read when `app` is first imported, so the environment is set
+before any app import.
+"""
+import os
+
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+os.environ["QUERY_BUDGET_ENFORCE"] = "true"
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.models.book import Book
+from app.models.post import Post
+from app.models.user import User
+from app.services import cache
+from app.services.auth import create_access_token, create_admin_access_token
+from app.services.like_counts import like_count_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_database():
+    """Empty tables and caches for every test."""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    cache.backend.clear()
+    like_count_cache.clear()
+
+
+@pytest.fixture
+def db():
+    """
+    A session on the test database.
+
+    Every session shares the one in-memory connection, so commit test data
+    before making requests.
+    """
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    """Client for the app. Startup events (admin seeding, background tasks) are not run."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_user(db):
+    """Create an active user; returns (user, auth headers). Admins get an admin token."""
+    def make(name: str = None, is_admin: bool = False):
+        name = name or f"user-{uuid.uuid4().hex[:8]}"
+        user = User(
+            id=str(uuid.uuid4()),
+            email=f"{name}@example.com",
+            name=name,
+            nickname=name,
+            is_active=True,
+            is_admin=is_admin,
+            following=[],
+            followers=[],
+        )
+        db.add(user)
+        db.commit()
+        create_token = create_admin_access_token if is_admin else create_access_token
+        token = create_token({"sub": user.id, "email": user.email})
+        return user, {"Authorization": f"Bearer {token}"}
+    return make
+
+
+@pytest.fixture
+def make_post(db):
+    """Create a post (approved unless told otherwise)."""
+    def make(author: User = None, title: str = "A post", is_approved: int = 1, **fields):
+        post = Post(
+            id=f"p-{uuid.uuid4().hex[:12]}",
+            type=fields.pop("type", "blog"),
+            title=title,
+            content=fields.pop("content", "Body"),
+            author=author.name if author else "Someone",
+            author_id=author.id if author else None,
+            is_approved=is_approved,
+            **fields,
+        )
+        db.add(post)
+        db.commit()
+        return post
+    return make
+
+
+@pytest.fixture
+def make_book(db):
+    """Create a book."""
+    def make(title: str = "A book", **fields):
+        book = Book(
+            id=f"b-{uuid.uuid4().hex[:12]}",
+            title=title,
+            author=fields.pop("author", "An Author"),
+            description=fields.pop("description", "A description"),
+            genres=fields.pop("genres", ["Fiction"]),
+            **fields,
+        )
+        db.add(book)
+        db.commit()
+        return book
+    return make
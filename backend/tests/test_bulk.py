@@ -0,0 +1,139 @@
+"""Bulk loading helpers (app.utils.bulk)."""
+import json
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import Column, ForeignKey, MetaData, String, Table
+
+from app.models.book import Book, PriceOption
+from app.models.interaction import Comment, Like
+from app.models.post import Post
+from app.models.user import User
+from app.utils import bulk
+from app.utils.bulk import _copy_field, _CopyStream, bulk_load, bulk_upsert, chunked, iter_records, load_order
+from app.utils.query_log import assert_max_queries
+
+BOOKS = [{"id": f"b{i}", "title": f"Book {i}", "author": "An Author"} for i in range(5)]
+
+
+def titles(db):
+    db.expire_all()
+    return {book.id: book.title for book in db.query(Book)}
+
+
+def test_iter_records_reads_arrays_and_ndjson(tmp_path):
+    array = tmp_path / "books.json"
+    array.write_text(json.dumps(BOOKS))
+    lines = tmp_path / "books.ndjson"
+    lines.write_text("\n".join(json.dumps(row) for row in BOOKS) + "\n\n")
+
+    assert list(iter_records(array)) == BOOKS
+    assert list(iter_records(lines)) == BOOKS
+
+
+def test_iter_records_picks_one_array_out_of_an_object(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({
+        "meta": {"note": "brackets ] and \"quotes\" in strings", "count": 12345},
+        "authors": [{"id": "a1", "name": "[Someone]"}],
+        "books": BOOKS,
+    }))
+
+    assert list(iter_records(path, key="books")) == BOOKS
+    with pytest.raises(KeyError):
+        list(iter_records(path, key="reviews"))
+
+
+def test_iter_records_reads_values_across_buffer_refills(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk, "_READ_SIZE", 7)
+    rows = [{"id": "b1", "description": "x" * 50, "pages": 1234567}, {"id": "b2", "pages": 98765}]
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"books": rows}, indent=2))
+
+    assert list(iter_records(path, key="books")) == rows
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+
+def test_bulk_upsert_inserts_then_skips_existing_ids(db):
+    stats = bulk_upsert(db, Book, BOOKS[:3], batch_size=2)
+    assert (stats.inserted, stats.updated, stats.skipped) == (3, 0, 0)
+
+    renamed = [{**row, "title": "Renamed"} for row in BOOKS]
+    stats = bulk_upsert(db, Book, renamed, batch_size=2)
+
+    assert (stats.inserted, stats.updated, stats.skipped) == (2, 0, 3)
+    assert titles(db) == {"b0": "Book 0", "b1": "Book 1", "b2": "Book 2", "b3": "Renamed", "b4": "Renamed"}
+
+
+def test_bulk_upsert_can_overwrite_existing_rows(db):
+    bulk_upsert(db, Book, BOOKS[:3])
+
+    renamed = [{**row, "title": "Renamed"} for row in BOOKS]
+    stats = bulk_upsert(db, Book, renamed, update=True)
+
+    assert (stats.inserted, stats.updated, stats.skipped) == (2, 3, 0)
+    assert set(titles(db).values()) == {"Renamed"}
+
+
+def test_bulk_upsert_costs_one_lookup_and_one_insert_per_batch(db):
+    with assert_max_queries(4):
+        bulk_upsert(db, Book, BOOKS[:4], batch_size=2)
+
+
+def test_bulk_load_falls_back_to_bulk_upsert(db):
+    stats = bulk_load(Book, iter(BOOKS), batch_size=2)
+
+    assert stats.inserted == len(BOOKS)
+    assert len(titles(db)) == len(BOOKS)
+
+
+def test_load_order_puts_parents_first():
+    stages = load_order([Like, Comment, Post, User, Book, PriceOption])
+
+    assert stages == [[Book, User], [Post, PriceOption], [Comment, Like]]
+    # Parents that are not being loaded are assumed to exist already
+    assert load_order([Comment, Like]) == [[Comment, Like]]
+
+
+def test_load_order_rejects_cycles():
+    metadata = MetaData()
+
+    class Shelf:
+        __tablename__ = "shelves"
+        __table__ = Table("shelves", metadata, Column("id", String, primary_key=True),
+                          Column("cover_id", ForeignKey("covers.id")))
+
+    class Cover:
+        __tablename__ = "covers"
+        __table__ = Table("covers", metadata, Column("id", String, primary_key=True),
+                          Column("shelf_id", ForeignKey("shelves.id")))
+
+    with pytest.raises(ValueError, match="Circular"):
+        load_order([Shelf, Cover])
+
+
+def test_copy_field_formats_csv_values():
+    columns = Book.__table__.c
+    followers = User.__table__.c.followers
+
+    assert _copy_field(None, columns.title) == ""
+    assert _copy_field('Say "hi", again', columns.title) == '"Say ""hi"", again"'
+    assert _copy_field(1999, columns.published_year) == "1999"
+    assert _copy_field(True, PriceOption.__table__.c.in_stock) == "t"
+    assert _copy_field(["Sci-Fi", 'A "quote"'], columns.genres) == '"[""Sci-Fi"", ""A \\""quote\\""""]"'
+    assert _copy_field(["a1", 'b"2'], followers) == '"{""a1"",""b\\""2""}"'
+    when = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert _copy_field(when, columns.updated_at) == "2024-01-02T03:04:05+00:00"
+
+
+def test_copy_stream_serves_reads_of_any_size():
+    stream = _CopyStream(iter(["a,b\n", "c,d\n", "e,f\n"]))
+
+    assert stream.read(3) == "a,b"
+    assert stream.read(5) == "\nc,d\n"
+    assert stream.read() == "e,f\n"
+    assert stream.read(10) == ""
@@ -0,0 +1,68 @@
+"""Response cache backends and the @cached decorator (app.services.cache)."""
+import time
+
+import pytest
+from sqlalchemy import update
+
+from app.models.book import Book
+from app.services.cache import MemoryBackend, RedisBackend
+
+
+def test_memory_backend_expires_entries(monkeypatch):
+    backend = MemoryBackend()
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    backend.set("k", b"v", ttl=10)
+
+    assert backend.get("k") == b"v"
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert backend.get("k") is None
+
+
+def test_memory_backend_invalidates_by_tag_and_evicts_least_recent():
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", b"1", 60, tags=["books:list"])
+    backend.set("b", b"2", 60, tags=["book:1"])
+    backend.get("a")
+    backend.set("c", b"3", 60, tags=["books:list"])
+
+    assert backend.get("b") is None
+    assert backend.invalidate_tags(["books:list"]) == 2
+    assert backend.get("a") is None and backend.get("c") is None
+
+
+def test_redis_tag_sets_only_ever_extend_their_expiry():
+    fakeredis = pytest.importorskip("fakeredis")
+    backend = RedisBackend(client=fakeredis.FakeRedis())
+
+    backend.set("similar", b"1", 300, tags=["books:list"])
+    backend.set("list", b"2", 60, tags=["books:list"])
+    assert backend.client.ttl(backend._tag("books:list")) == 600
+
+    backend.set("long", b"3", 900, tags=["books:list"])
+    assert backend.client.ttl(backend._tag("books:list")) == 1800
+    assert backend.invalidate_tags(["books:list"]) == 3
+
+
+def test_cached_endpoint_is_refreshed_by_invalidation(client, make_user, make_book):
+    _, admin = make_user(is_admin=True)
+    book = make_book("Old title")
+    assert client.get("/books").json()[0]["title"] == "Old title"
+
+    client.patch(f"/books/{book.id}", json={"title": "New title"}, headers=admin)
+
+    assert client.get("/books").json()[0]["title"] == "New title"
+
+
+def test_version_bumps_elsewhere_miss_the_cache(client, db, make_book):
+    book = make_book("Old title")
+    first = client.get(f"/books/{book.id}")
+    # A write by another process: no invalidation reaches this one
+    db.execute(update(Book).where(Book.id == book.id).values(title="New title", version=Book.version + 1))
+    db.commit()
+
+    response = client.get(f"/books/{book.id}")
+
+    assert response.json()["title"] == "New title"
+    assert response.headers["etag"] != first.headers["etag"]
+    assert client.get(f"/books/{book.id}", headers={"If-None-Match": first.headers["etag"]}).status_code == 200
@@ -0,0 +1,91 @@
+"""ETag / Last-Modified handling (app.middleware.conditional_get)."""
+import pytest
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+@pytest.fixture
+def book(make_book):
+    return make_book("Dune")
+
+
+@pytest.fixture
+def catalog(make_book):
+    """Enough books for the list response to be compressed."""
+    return [make_book(f"Book {i}", description="x" * 100) for i in range(20)]
+
+
+def test_versioned_responses_carry_validators(client, book):
+    response = client.get(f"/books/{book.id}")
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert "last-modified" in response.headers
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_matching_etag_gets_304(client, book):
+    etag = client.get(f"/books/{book.id}").headers["etag"]
+
+    response = client.get(f"/books/{book.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.parametrize("if_none_match", ['"stale"', 'W/"stale"'])
+def test_other_etags_get_the_body(client, book, if_none_match):
+    response = client.get(f"/books/{book.id}", headers={"If-None-Match": if_none_match})
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Dune"
+
+
+def test_star_and_if_modified_since(client, book):
+    first = client.get(f"/books/{book.id}")
+
+    star = client.get(f"/books/{book.id}", headers={"If-None-Match": "*"})
+    since = client.get(f"/books/{book.id}", headers={"If-Modified-Since": first.headers["last-modified"]})
+
+    assert (star.status_code, star.headers["etag"]) == (304, first.headers["etag"])
+    assert (since.status_code, since.headers["etag"]) == (304, first.headers["etag"])
+
+
+def test_304_echoes_the_encoded_etag_the_client_holds(client, catalog):
+    first = client.get("/books", headers=GZIP)
+    assert first.headers["content-encoding"] == "gzip"
+    encoded = first.headers["etag"]
+    assert encoded.endswith('-gzip"')
+
+    encoded_match = client.get("/books", headers={**GZIP, "If-None-Match": f'"other", {encoded}'})
+    identity_match = client.get("/books", headers={"If-None-Match": encoded.replace("-gzip", "")})
+
+    assert (encoded_match.status_code, encoded_match.headers["etag"]) == (304, encoded)
+    assert (identity_match.status_code, identity_match.headers["etag"]) == (304, encoded.replace("-gzip", ""))
+
+
+def test_updates_change_the_etag(client, make_user, book):
+    _, admin = make_user(is_admin=True)
+    etag = client.get(f"/books/{book.id}").headers["etag"]
+
+    client.patch(f"/books/{book.id}", json={"title": "Dune Messiah"}, headers=admin)
+    response = client.get(f"/books/{book.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Dune Messiah"
+    assert response.headers["etag"] != etag
+
+
+def test_unknown_resources_fall_through_to_404(client):
+    response = client.get("/books/missing", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("path", ["/books/trending", "/posts/trending"])
+def test_literal_routes_are_not_taken_for_versioned_patterns(client, path):
+    response = client.get(path, headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
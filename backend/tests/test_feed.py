@@ -0,0 +1,148 @@
+"""Home feed: fan-out on write, pull merge for high-follower actors, moderation."""
+import pytest
+
+from app.config import get_settings
+from app.models.feed import Activity, FeedItem
+from app.services import feed
+
+settings = get_settings()
+
+
+@pytest.fixture
+def reader(make_user):
+    return make_user("reader")
+
+
+@pytest.fixture
+def admin(make_user):
+    return make_user("admin", is_admin=True)
+
+
+def follow(client, headers, user):
+    assert client.post(f"/users/{user.id}/follow", headers=headers).status_code == 200
+
+
+def feed_ids(client, headers, limit=20):
+    """Every (verb, object id) in a user's feed, following cursors, newest first."""
+    items, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/feed", params=params, headers=headers).json()
+        items += [(item["verb"], item["object_id"]) for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def create_post(client, headers, title):
+    response = client.post("/posts", json={"title": title, "type": "blog", "content": "Body"}, headers=headers)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_posts_fan_out_to_followers(client, db, reader, admin):
+    _, reader_headers = reader
+    author, author_headers = admin
+    follow(client, reader_headers, author)
+
+    post_id = create_post(client, author_headers, "Hello")
+
+    assert feed_ids(client, reader_headers) == [("post", post_id)]
+    assert db.query(FeedItem).filter(FeedItem.owner_id == reader[0].id).count() == 1
+
+
+def test_pending_posts_reach_feeds_once_approved(client, make_user, reader, admin):
+    _, reader_headers = reader
+    _, admin_headers = admin
+    author, author_headers = make_user("writer")
+    follow(client, reader_headers, author)
+    post_id = create_post(client, author_headers, "Pending")
+    assert feed_ids(client, reader_headers) == []
+
+    client.post(f"/admin/content/post/{post_id}/approve", headers=admin_headers)
+    client.post(f"/admin/content/post/{post_id}/approve", headers=admin_headers)
+    assert feed_ids(client, reader_headers) == [("post", post_id)]
+
+    client.post(f"/admin/content/post/{post_id}/reject", headers=admin_headers)
+    assert feed_ids(client, reader_headers) == []
+
+
+def test_approving_through_update_publishes(client, make_user, reader, admin):
+    _, reader_headers = reader
+    _, admin_headers = admin
+    author, author_headers = make_user("writer")
+    follow(client, reader_headers, author)
+    post_id = create_post(client, author_headers, "Pending")
+
+    client.patch(f"/posts/{post_id}", json={"is_approved": 1}, headers=admin_headers)
+    client.patch(f"/posts/{post_id}", json={"title": "Edited"}, headers=admin_headers)
+    assert feed_ids(client, reader_headers) == [("post", post_id)]
+
+    client.patch(f"/posts/{post_id}", json={"is_approved": 0}, headers=admin_headers)
+    assert feed_ids(client, reader_headers) == []
+
+
+def test_deleted_posts_are_retracted(client, db, reader, admin):
+    _, reader_headers = reader
+    author, author_headers = admin
+    follow(client, reader_headers, author)
+    post_id = create_post(client, author_headers, "Short-lived")
+
+    client.delete(f"/posts/{post_id}", headers=author_headers)
+
+    assert feed_ids(client, reader_headers) == []
+    assert db.query(Activity).filter(Activity.object_id == post_id).count() == 0
+
+
+def test_high_follower_actors_are_merged_in_at_read_time(client, db, monkeypatch, make_user, reader, admin):
+    monkeypatch.setattr(settings, "FEED_CELEBRITY_FOLLOWER_THRESHOLD", 1)
+    reader_user, reader_headers = reader
+    _, other_headers = make_user("other")
+    regular, regular_headers = make_user("regular", is_admin=True)
+    celebrity, celebrity_headers = admin
+    follow(client, reader_headers, regular)
+    follow(client, reader_headers, celebrity)
+    follow(client, other_headers, celebrity)
+
+    posted = [
+        create_post(client, regular_headers, "r1"),
+        create_post(client, celebrity_headers, "c1"),
+        create_post(client, regular_headers, "r2"),
+        create_post(client, celebrity_headers, "c2"),
+        create_post(client, regular_headers, "r3"),
+    ]
+
+    # Only the regular actor's posts were written to the timeline
+    assert db.query(FeedItem).filter(FeedItem.owner_id == reader_user.id).count() == 3
+    expected = [("post", post_id) for post_id in reversed(posted)]
+    assert feed_ids(client, reader_headers) == expected
+    # Pages split across both sources still visit every activity once, in order
+    assert feed_ids(client, reader_headers, limit=2) == expected
+    assert feed_ids(client, reader_headers, limit=1) == expected
+
+
+def test_follow_backfills_and_unfollow_removes(client, reader, admin):
+    _, reader_headers = reader
+    author, author_headers = admin
+    post_id = create_post(client, author_headers, "Earlier")
+
+    follow(client, reader_headers, author)
+    assert feed_ids(client, reader_headers) == [("post", post_id)]
+
+    client.post(f"/users/{author.id}/unfollow", headers=reader_headers)
+    assert feed_ids(client, reader_headers) == []
+
+
+def test_failed_backfill_does_not_fail_the_follow(client, monkeypatch, reader, admin):
+    _, reader_headers = reader
+    author, author_headers = admin
+    create_post(client, author_headers, "Earlier")
+
+    def fail(*args):
+        raise RuntimeError("timeline unavailable")
+    monkeypatch.setattr(feed, "trim_timelines", fail)
+
+    response = client.post(f"/users/{author.id}/follow", headers=reader_headers)
+
+    assert response.status_code == 200
+    assert author.id in response.json()["following"]
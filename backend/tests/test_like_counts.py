@@ -0,0 +1,74 @@
+"""Like-count cache (app.services.like_counts) and the batch likes endpoint."""
+import time
+
+from app.services.like_counts import MAX_FILL_SECONDS, LikeCountCache, like_count_cache
+
+
+def test_counts_are_served_until_they_expire(monkeypatch):
+    cache = LikeCountCache(ttl_seconds=30)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    cache.set_many({"p1": 3, "p2": 0}, cache.begin_fill())
+
+    assert cache.get_many(["p1", "p2", "p3"]) == ({"p1": 3, "p2": 0}, ["p3"])
+    monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+    assert cache.get_many(["p1"]) == ({}, ["p1"])
+
+
+def test_fill_that_started_before_an_invalidation_is_not_stored():
+    cache = LikeCountCache(ttl_seconds=30)
+    token = cache.begin_fill()
+    # A like toggled while the fill was counting in the database
+    cache.invalidate("p1")
+
+    cache.set_many({"p1": 3, "p2": 5}, token)
+
+    assert cache.get_many(["p1", "p2"]) == ({"p2": 5}, ["p1"])
+
+
+def test_fill_that_started_after_an_invalidation_is_stored():
+    cache = LikeCountCache(ttl_seconds=30)
+    cache.invalidate("p1")
+    time.sleep(0.001)
+
+    cache.set_many({"p1": 4}, cache.begin_fill())
+
+    assert cache.get_many(["p1"]) == ({"p1": 4}, [])
+
+
+def test_fills_older_than_the_limit_are_dropped():
+    cache = LikeCountCache(ttl_seconds=30)
+
+    cache.set_many({"p1": 1}, time.monotonic() - MAX_FILL_SECONDS - 1)
+
+    assert cache.get_many(["p1"]) == ({}, ["p1"])
+
+
+def test_batch_likes_reflect_toggles(client, make_user, make_post):
+    author, _ = make_user()
+    _, reader = make_user()
+    liked, other = make_post(author), make_post(author)
+    body = {"post_ids": [liked.id, other.id, liked.id]}
+
+    anonymous = client.post("/posts/batch/likes", json=body).json()
+    assert [(p["post_id"], p["likes_count"], p["is_liked_by_user"]) for p in anonymous] == [
+        (liked.id, 0, False), (other.id, 0, False), (liked.id, 0, False),
+    ]
+
+    assert client.post(f"/posts/{liked.id}/like", headers=reader).status_code == 200
+    counts = client.post("/posts/batch/likes", json=body, headers=reader).json()
+    assert [(p["likes_count"], p["is_liked_by_user"]) for p in counts] == [(1, True), (0, False), (1, True)]
+
+    client.post(f"/posts/{liked.id}/like", headers=reader)
+    assert client.post("/posts/batch/likes", json=body).json()[0]["likes_count"] == 0
+
+
+def test_batch_likes_read_cached_counts(client, make_user, make_post):
+    author, _ = make_user()
+    post = make_post(author)
+    like_count_cache.set_many({post.id: 7}, like_count_cache.begin_fill())
+
+    response = client.post("/posts/batch/likes", json={"post_ids": [post.id]})
+
+    assert response.json()[0]["likes_count"] == 7
@@ -0,0 +1,101 @@
+"""Keyset pagination (app.utils.pagination) and the paginated comments endpoint."""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.interaction import Comment
+from app.utils.pagination import after_cursor, decode_cursor, encode_cursor
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def thread(db, make_user, make_post):
+    """A post with 60 top-level comments (in tied pairs) and two replies on the first."""
+    user, _ = make_user()
+    post = make_post(user)
+    for i in range(60):
+        # Pairs share a timestamp, so pages must break ties on id
+        db.add(Comment(
+            id=f"c-{i:03d}", user_id=user.id, post_id=post.id, content=f"comment {i}",
+            created_at=START + timedelta(minutes=i // 2),
+        ))
+    for j in range(2):
+        db.add(Comment(
+            id=f"r-{j}", user_id=user.id, post_id=post.id, parent_id="c-000", content="reply",
+            created_at=START + timedelta(hours=2, minutes=j),
+        ))
+    db.commit()
+    return post
+
+
+def test_cursor_round_trip():
+    stamp = datetime(2024, 5, 6, 7, 8, 9, 123456)
+
+    assert decode_cursor(encode_cursor(stamp, "c-1")) == (stamp, "c-1")
+    assert decode_cursor(encode_cursor(None, "c|2")) == (None, "c|2")
+
+
+@pytest.mark.parametrize("cursor", [
+    "!!!",  # Not base64
+    "bm9waXBl",  # "nopipe": no separator
+    "bm90LWEtZGF0ZXxjLTE",  # "not-a-date|c-1"
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_after_cursor_breaks_ties_on_id(db, thread, descending):
+    cursor = encode_cursor(START + timedelta(minutes=5), "c-010")
+    order = (Comment.created_at.desc(), Comment.id.desc()) if descending else (Comment.created_at, Comment.id)
+
+    ids = [
+        row.id for row in db.query(Comment.id)
+        .filter(Comment.parent_id.is_(None))
+        .filter(after_cursor(Comment.created_at, Comment.id, cursor, descending=descending))
+        .order_by(*order)
+        .limit(3)
+    ]
+
+    # c-010 and c-011 share minute 5
+    assert ids == (["c-009", "c-008", "c-007"] if descending else ["c-011", "c-012", "c-013"])
+
+
+def test_comments_without_limit_or_cursor_are_all_returned(client, thread):
+    response = client.get(f"/posts/{thread.id}/comments")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 62
+    assert "x-next-cursor" not in response.headers
+
+
+def test_comment_pages_cover_every_comment_once(client, thread):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 25, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"/posts/{thread.id}/comments", params=params)
+        assert response.status_code == 200
+        seen += [c["id"] for c in response.json() if c["parent_id"] is None]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert seen == [f"c-{i:03d}" for i in range(60)]
+
+
+def test_replies_follow_their_page_and_respect_max_replies(client, thread):
+    response = client.get(f"/posts/{thread.id}/comments", params={"limit": 5, "max_replies": 1})
+
+    comments = response.json()
+    assert [c["id"] for c in comments] == ["c-000", "c-001", "c-002", "c-003", "c-004", "r-0"]
+    assert comments[-1]["parent_id"] == "c-000"
+
+
+def test_invalid_cursor_returns_400(client, thread):
+    response = client.get(f"/posts/{thread.id}/comments", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
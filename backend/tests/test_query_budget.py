@@ -0,0 +1,108 @@
+"""Per-request query budgets and statement counting (app.utils.query_log)."""
+import re
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import APIRouter, Depends
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.database import get_db, instrument_engine, tune_sqlite
+from app.main import app
+from app.models.interaction import Comment, Like
+from app.models.post import Post
+from app.utils.query_log import QueryBudgetExceeded, assert_max_queries, query_budget
+
+
+def _queries(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+
+@pytest.fixture
+def n_plus_one_route():
+    """Mount an endpoint that counts likes post by post, within a budget of 3."""
+    router = APIRouter()
+
+    @router.get("/_test/like-counts")
+    @query_budget(3)
+    async def like_counts(db: Session = Depends(get_db)):
+        return {
+            post_id: db.query(Like).filter(Like.post_id == post_id).count()
+            for (post_id,) in db.query(Post.id).all()
+        }
+
+    routes = len(app.router.routes)
+    app.include_router(router)
+    yield "/_test/like-counts"
+    del app.router.routes[routes:]
+
+
+def test_comment_threads_load_in_constant_queries(client, db, make_user, make_post):
+    user, _ = make_user()
+    post = make_post(user)
+    start = datetime(2024, 1, 1)
+    for i in range(40):
+        parent = Comment(
+            id=f"c-{i:03d}", user_id=user.id, post_id=post.id, content="top",
+            created_at=start + timedelta(minutes=i),
+        )
+        db.add(parent)
+        for j in range(2):
+            db.add(Comment(
+                id=f"c-{i:03d}-{j}", user_id=user.id, post_id=post.id, parent_id=parent.id,
+                content="reply", created_at=start + timedelta(minutes=i, seconds=j + 1),
+            ))
+    db.commit()
+
+    # Budgets are enforced: an N+1 here would raise QueryBudgetExceeded
+    response = client.get(f"/posts/{post.id}/comments")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 120
+    # Top-level comments, then one query per reply level
+    assert _queries(response) <= 3
+
+
+def test_over_budget_request_raises_when_enforced(client, make_post, n_plus_one_route):
+    for _ in range(5):
+        make_post()
+
+    with pytest.raises(QueryBudgetExceeded, match="issued 6 queries"):
+        client.get(n_plus_one_route)
+
+
+def test_within_budget_request_passes(client, make_post, n_plus_one_route):
+    make_post()
+
+    response = client.get(n_plus_one_route)
+
+    assert response.status_code == 200
+    assert _queries(response) == 2
+
+
+def test_assert_max_queries(db, make_post):
+    make_post()
+
+    with assert_max_queries(1) as stats:
+        db.query(Post).all()
+    assert stats.queries == 1
+
+    with pytest.raises(QueryBudgetExceeded):
+        with assert_max_queries(1):
+            db.query(Post).all()
+            db.query(Post).all()
+
+
+def test_transaction_control_is_not_counted(tmp_path):
+    # tune_sqlite sends an explicit BEGIN for every transaction
+    engine = create_engine(f"sqlite:///{tmp_path / f'{uuid.uuid4().hex}.db'}")
+    tune_sqlite(engine)
+    instrument_engine(engine, "test")
+
+    with assert_max_queries(1) as stats:
+        with engine.begin() as conn:
+            conn.execute(text("SELECT 1"))
+
+    assert stats.queries == 1
+    engine.dispose()
@@ -0,0 +1,129 @@
+"""Forward-decayed trending scores and compaction (app.services.trending)."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.config import get_settings
+from app.models.resource_version import ResourceVersion
+from app.models.trending import TrendingScore
+from app.services.trending import (
+    BOOK, LANDMARK, LIKE_WEIGHT, POST, bump_trending, compact, growth, landmark, top,
+)
+
+settings = get_settings()
+HALF_LIFE = timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS)
+
+
+def stored(db, kind, item_id):
+    return db.scalar(select(TrendingScore.score).where(
+        TrendingScore.kind == kind, TrendingScore.item_id == item_id
+    ))
+
+
+def move_landmark(db, by: timedelta):
+    """Shift the landmark (and with it every stored score's reference time)."""
+    db.execute(update(ResourceVersion).where(ResourceVersion.name == LANDMARK).values(
+        updated_at=landmark(db) + by
+    ))
+    db.commit()
+
+
+def test_growth_doubles_every_half_life():
+    assert growth(timedelta(0)) == 1
+    assert growth(HALF_LIFE) == pytest.approx(2)
+    assert growth(-2 * HALF_LIFE) == pytest.approx(0.25)
+
+
+def test_first_event_sets_the_landmark_and_scores_its_weight(db):
+    assert landmark(db) is None
+
+    bump_trending(db, POST, "p1", LIKE_WEIGHT)
+
+    assert landmark(db) is not None
+    assert top(db, POST, 10) == [("p1", pytest.approx(LIKE_WEIGHT, rel=1e-3))]
+
+
+def test_older_events_count_less(db):
+    now = datetime.now(timezone.utc)
+    bump_trending(db, POST, "fresh", 1.0, at=now)
+    bump_trending(db, POST, "old", 1.0, at=now - HALF_LIFE)
+    bump_trending(db, POST, "old", 1.0, at=now - 2 * HALF_LIFE)
+
+    scores = dict(top(db, POST, 10))
+
+    assert scores["fresh"] == pytest.approx(1.0, rel=1e-3)
+    assert scores["old"] == pytest.approx(0.75, rel=1e-3)
+
+
+def test_scores_decay_as_time_passes(db):
+    bump_trending(db, POST, "p1", 2.0)
+
+    # The landmark moving back one half-life is the same as time moving forward
+    move_landmark(db, -HALF_LIFE)
+
+    assert top(db, POST, 1)[0][1] == pytest.approx(1.0, rel=1e-3)
+
+
+def test_taking_an_event_back_subtracts_what_it_added(db):
+    liked_at = datetime.now(timezone.utc) - timedelta(hours=3)
+    bump_trending(db, POST, "p1", LIKE_WEIGHT, at=liked_at)
+    bump_trending(db, POST, "p1", LIKE_WEIGHT)
+
+    bump_trending(db, POST, "p1", -LIKE_WEIGHT, at=liked_at)
+
+    assert top(db, POST, 1)[0][1] == pytest.approx(LIKE_WEIGHT, rel=1e-3)
+
+
+def test_taking_back_never_creates_a_score(db):
+    bump_trending(db, POST, "p1", LIKE_WEIGHT)
+
+    bump_trending(db, POST, "missing", -LIKE_WEIGHT)
+
+    assert stored(db, POST, "missing") is None
+
+
+def test_compaction_rebases_and_keeps_current_scores(db, make_book):
+    book = make_book()
+    bump_trending(db, BOOK, book.id, 4.0)
+    move_landmark(db, -HALF_LIFE)
+    before = top(db, BOOK, 1)[0][1]
+    old_landmark = landmark(db)
+
+    compact(db)
+
+    assert landmark(db) > old_landmark
+    assert top(db, BOOK, 1)[0][1] == pytest.approx(before, rel=1e-3)
+    # Stored values are relative to the new landmark, i.e. already decayed
+    assert stored(db, BOOK, book.id) == pytest.approx(2.0, rel=1e-3)
+
+
+def test_compaction_drops_decayed_deleted_and_excess_items(db, monkeypatch, make_book, make_post):
+    monkeypatch.setattr(settings, "TRENDING_MAX_ITEMS", 2)
+    books = [make_book(f"Book {i}") for i in range(4)]
+    live_post, pending_post = make_post(), make_post(is_approved=0)
+    for weight, book in zip((4.0, 3.0, 2.0, settings.TRENDING_MIN_SCORE / 2), books):
+        bump_trending(db, BOOK, book.id, weight)
+    bump_trending(db, BOOK, "deleted-book", 10.0)
+    bump_trending(db, POST, live_post.id, 1.0)
+    bump_trending(db, POST, pending_post.id, 1.0)
+
+    compact(db)
+
+    assert [book_id for book_id, _ in top(db, BOOK, 10)] == [books[0].id, books[1].id]
+    assert [post_id for post_id, _ in top(db, POST, 10)] == [live_post.id]
+
+
+def test_likes_feed_the_trending_posts_endpoint(client, make_user, make_post):
+    author, _ = make_user()
+    _, reader = make_user()
+    liked, unliked = make_post(author, "Liked"), make_post(author, "Unliked")
+
+    client.post(f"/posts/{liked.id}/like", headers=reader)
+    client.post(f"/posts/{unliked.id}/like", headers=reader)
+    client.post(f"/posts/{unliked.id}/like", headers=reader)
+    posts = client.get("/posts/trending").json()
+
+    assert posts[0]["id"] == liked.id
+    assert posts[0]["score"] == pytest.approx(LIKE_WEIGHT, rel=1e-3)
+    assert all(post["score"] == pytest.approx(0, abs=1e-6) for post in posts[1:])
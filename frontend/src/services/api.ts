@@ -563,6 +563,7 @@ export const adminApi = {
 export interface Comment {
   id: string;
   post_id: string;
+  parent_id?: string | null;
   user_id: string;
   content: string;
   created_at: string;